@@ -4,50 +4,132 @@ from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-def get_endpoints_config():
+# Sobreposição da janela incremental (dias antes do watermark) para registros atrasados
+DEFAULT_LOOKBACK_DAYS = 3
+
+
+# Backfill da NASA DONKI: tamanho das sub-janelas e requisições simultâneas
+DEFAULT_BACKFILL_WINDOW_DAYS = 30
+DEFAULT_BACKFILL_MAX_WORKERS = 2
+
+
+def get_lookback() -> timedelta:
+    return timedelta(days=int(os.getenv("INGESTION_LOOKBACK_DAYS", DEFAULT_LOOKBACK_DAYS)))
+
+
+def get_backfill_window():
+    """
+    Janela de backfill [START_DATE, END_DATE] repassada pela DAG (params start_date/end_date).
+    Retorna None quando START_DATE não foi informado (a DAG envia string vazia).
+    END_DATE vazio significa até hoje.
+    """
+    start = (os.getenv("START_DATE") or "").strip()
+    end = (os.getenv("END_DATE") or "").strip()
+    if not start:
+        if end:
+            logger.warning("END_DATE informado sem START_DATE; backfill ignorado.")
+        return None
+    start_date = datetime.strptime(start, '%Y-%m-%d')
+    end_date = datetime.strptime(end, '%Y-%m-%d') if end else datetime.utcnow()
+    if end_date < start_date:
+        raise ValueError(f"Janela de backfill inválida: END_DATE {end} anterior a START_DATE {start}.")
+    return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+
+
+def get_endpoints_config(watermarks=None):
     """
     Protocolo de Sincronia: Alinha a janela da NASA com o teto da base SpaceX.
     Rigor: Evita o anacronismo identificado na auditoria anterior.
+
+    watermarks: {endpoint: datetime} de raw._ingestion_state. Endpoints com watermark
+    pedem à API apenas o que veio depois dele (menos INGESTION_LOOKBACK_DAYS).
+    START_DATE/END_DATE (backfill) têm precedência sobre o watermark.
     """
-    
+    watermarks = watermarks or {}
+    lookback = get_lookback()
+
     # ESTRATÉGIA DE ALINHAMENTO:
-    # Como a base SpaceX enviada termina em Dez/2022, vamos buscar a NASA 
-    # para o mesmo período histórico para garantir que o JOIN na camada Gold funcione.
-    
-    # Se quiser dados atuais, mantenha o datetime.now(). 
-    # Para o SEU caso específico de teste, vamos usar o teto de 2022:
-    target_date = datetime(2022, 12, 31) 
+    # Como a base SpaceX enviada termina em Dez/2022, a primeira carga da NASA
+    # busca o mesmo período histórico para garantir que o JOIN na camada Gold funcione.
+    # Depois disso, a janela parte do watermark até hoje.
+    target_date = datetime(2022, 12, 31)
     start_date = (target_date - timedelta(days=60)).strftime('%Y-%m-%d')
     end_date = target_date.strftime('%Y-%m-%d')
 
+    nasa_watermark = watermarks.get("nasa_solar_events")
+    if nasa_watermark:
+        start_date = (nasa_watermark - lookback).strftime('%Y-%m-%d')
+        end_date = datetime.utcnow().strftime('%Y-%m-%d')
+
+    launches_query = {}
+    launches_watermark = watermarks.get("spacex_launches")
+    if launches_watermark:
+        since = launches_watermark - lookback
+        launches_query = {"date_utc": {"$gte": since.strftime('%Y-%m-%dT%H:%M:%S.000Z')}}
+
+    backfill = get_backfill_window()
+    if backfill:
+        start_date, end_date = backfill
+        launches_query = {"date_utc": {"$gte": f"{start_date}T00:00:00.000Z",
+                                       "$lte": f"{end_date}T23:59:59.999Z"}}
+        logger.info(f"Modo backfill: {start_date} a {end_date}.")
+
     nasa_key = os.getenv("NASA_API_KEY", "DEMO_KEY")
     
     if nasa_key == "DEMO_KEY":
         logger.warning("MODO CRÍTICO: Usando DEMO_KEY. Limites de taxa iminentes.")
 
-    return {
+    # Chaves opcionais por endpoint:
+    #   "json_path": caminho até a lista de registros no JSON de resposta
+    #   "load_options": repassado ao PostgresLoader.load_bronze, ex.:
+    #       {"strategy": "merge", "key_column": "id", "tombstone": True}
+    #       ou {"strategy": "history", "retention_days": 90} (histórico particionado por dia)
+    #       ou {"method": "parallel"} (COPY em shards paralelos, para endpoints grandes)
+    #   "watermark": coluna de data cujo máximo carregado é gravado em raw._ingestion_state
+    #       (carga incremental; combine com load_options strategy "merge")
+    #   "extractor": "query" usa POST /v4/<recurso>/query (PaginatedQueryExtractor),
+    #       com "query", "options", "page_size" e "page_workers"; as páginas chegam
+    #       em lotes e são carregadas em streaming (ex.: /v4/starlink/query)
+    #   "stream": True lê o corpo em blocos e normaliza em lotes de "batch_size" registros
+    #       (APIExtractor.iter_chunks), carregados em streaming como no modo "query"
+    #   "extractor": "windows" divide "backfill" {start_date, end_date, window_days,
+    #       max_workers, dedupe_key} em janelas de data paralelas (DateWindowExtractor)
+    #   "schema": nome do schema bronze em src/models/schemas.BRONZE_SCHEMAS; os registros
+    #       são achatados só nas colunas declaradas, com dtype explícito (CompiledFlattener),
+    #       e a tabela é criada com tipos Postgres e NOT NULL explícitos (PostgresLoader)
+    endpoints = {
         "spacex_rockets": {
             "url": "https://api.spacexdata.com/v4/rockets",
             "layer": "bronze",
-            "params": None
+            "params": None,
+            "schema": "spacex_rockets"
         },
         
         "spacex_launches": {
-            "url": "https://api.spacexdata.com/v4/launches", # v4 é a mais estável
+            "url": "https://api.spacexdata.com/v4/launches/query", # v4 é a mais estável
             "layer": "bronze",
-            "params": None
+            "extractor": "query",
+            "query": launches_query,
+            "options": {"sort": {"date_utc": "asc"}},
+            "schema": "spacex_launches",
+            "watermark": "date_utc",
+            "load_options": {"strategy": "merge", "key_column": "id"}
         },
 
         "spacex_payloads": {
             "url": "https://api.spacexdata.com/v4/payloads",
             "layer": "bronze",
-            "params": None
+            "params": None,
+            "schema": "spacex_payloads",
+            "stream": True
         },
 
         "spacex_cores": {
             "url": "https://api.spacexdata.com/v4/cores",
             "layer": "bronze",
-            "params": None
+            "params": None,
+            "schema": "spacex_cores",
+            "stream": True
         },
 
         "nasa_solar_events": {
@@ -55,8 +137,26 @@ def get_endpoints_config():
             "layer": "bronze",
             "params": {
                 "api_key": nasa_key,
-                "startDate": start_date,  # Agora sincronizado com o fim da base SpaceX
+                "startDate": start_date,  # Janela histórica ou a partir do watermark
                 "endDate": end_date
-            }
+            },
+            "schema": "nasa_solar_events",
+            "watermark": "startTime",
+            "load_options": {"strategy": "merge", "key_column": "activityID"}
         }
-    }
\ No newline at end of file
+    }
+
+    if backfill:
+        # Uma requisição multi-anual à DONKI é lenta e frágil: janelas menores em paralelo
+        nasa = endpoints["nasa_solar_events"]
+        nasa["extractor"] = "windows"
+        nasa["params"] = {"api_key": nasa_key}
+        nasa["backfill"] = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "window_days": int(os.getenv("BACKFILL_WINDOW_DAYS", DEFAULT_BACKFILL_WINDOW_DAYS)),
+            "max_workers": int(os.getenv("BACKFILL_MAX_WORKERS", DEFAULT_BACKFILL_MAX_WORKERS)),
+            "dedupe_key": "activityID",
+        }
+
+    return endpoints
\ No newline at end of file
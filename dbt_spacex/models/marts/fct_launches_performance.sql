@@ -31,8 +31,8 @@ payload_aggregation AS (
         l.launch_id,
         SUM(p.mass_kg) AS total_payload_mass_kg
     FROM stg_launches l
-    CROSS JOIN LATERAL jsonb_array_elements_text(l.payload_ids::jsonb) AS p_id
-    LEFT JOIN stg_payloads p ON p.payload_id = p_id
+    LEFT JOIN {{ source('spacex_raw', 'spacex_launch_payloads') }} lp ON lp.launch_id = l.launch_id
+    LEFT JOIN stg_payloads p ON p.payload_id = lp.payload_id
     GROUP BY 1
 ),
 
@@ -8,19 +8,29 @@
     tags=['incremental', 'daily', 'roi']
 ) }}
 
-WITH expanded_launches AS (
+WITH launches AS (
     SELECT 
         id AS launch_id,
         rocket AS rocket_id,
-        jsonb_array_elements_text(payloads::jsonb) AS payload_id,
-        date_utc::timestamp AS launch_at_utc
+        date_utc AS launch_at_utc
     FROM {{ source('spacex_raw', 'spacex_launches') }}
     
     {% if is_incremental() %}
-    WHERE date_utc::timestamp > (SELECT MAX(launch_at_utc) FROM {{ this }})
+    WHERE date_utc > (SELECT MAX(launch_at_utc) FROM {{ this }})
     {% endif %}
 ),
 
+expanded_launches AS (
+    -- Tabela ponte explodida na ingestão: join por igualdade em launch_id (indexado)
+    SELECT 
+        l.launch_id,
+        l.rocket_id,
+        lp.payload_id,
+        l.launch_at_utc
+    FROM launches l
+    JOIN {{ source('spacex_raw', 'spacex_launch_payloads') }} lp ON lp.launch_id = l.launch_id
+),
+
 launch_metrics AS (
     SELECT 
         el.launch_id,
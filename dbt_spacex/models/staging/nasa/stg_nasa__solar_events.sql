@@ -10,12 +10,12 @@ flattened AS (
     SELECT
         "activityID" AS activityID,
         catalog AS catalog_source,
-        "startTime"::timestamp AS event_at_utc,
+        "startTime" AS event_at_utc,
         
-        ("cmeAnalyses"::jsonb->0->>'speed')::numeric AS speed_km_s,
-        ("cmeAnalyses"::jsonb->0->>'type')::varchar AS cme_type,
-        ("cmeAnalyses"::jsonb->0->>'halfAngle')::numeric AS half_angle,
-        ("cmeAnalyses"::jsonb->0->>'isMostAccurate')::boolean AS is_most_accurate,
+        ("cmeAnalyses"->0->>'speed')::numeric AS speed_km_s,
+        ("cmeAnalyses"->0->>'type')::varchar AS cme_type,
+        ("cmeAnalyses"->0->>'halfAngle')::numeric AS half_angle,
+        ("cmeAnalyses"->0->>'isMostAccurate')::boolean AS is_most_accurate,
         
         "sourceLocation" AS source_location,
         note AS event_description,
@@ -12,9 +12,9 @@ SELECT
     id AS launch_id,
     flight_number,
     name AS launch_name,
-    date_utc::timestamp AS launch_at_utc,
+    date_utc AS launch_at_utc,
     rocket AS rocket_id,
-    success::boolean AS is_success,
+    success AS is_success,
     details,
     -- Mantendo os arrays para o unnest na camada Gold
     payloads AS payload_ids,
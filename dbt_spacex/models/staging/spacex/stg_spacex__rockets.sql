@@ -5,10 +5,10 @@ SELECT
     id AS rocket_id,
     name AS rocket_name,
     type AS rocket_type,
-    active::boolean AS is_active,
-    cost_per_launch::numeric AS cost_per_launch_usd,
-    success_rate_pct::integer AS success_rate_pct,
+    active AS is_active,
+    cost_per_launch AS cost_per_launch_usd,
+    success_rate_pct,
     
-    (payload_weights::jsonb->0->>'kg')::numeric AS max_payload_kg_leo,
+    (payload_weights->0->>'kg')::numeric AS max_payload_kg_leo,
     ingestion_timestamp AS ingested_at
 FROM {{ source('spacex_raw', 'spacex_rockets') }}
\ No newline at end of file
@@ -0,0 +1,7 @@
+-- Teste Singular: Substitui o dbt_utils.recency em ingestion_timestamp por endpoint.
+-- Falha para endpoints sem execução bem-sucedida nas últimas 24h (last_success_at em UTC).
+SELECT
+    endpoint,
+    last_success_at
+FROM {{ source('ingestion_raw', 'ingestion_state') }}
+WHERE last_success_at < (now() AT TIME ZONE 'utc') - INTERVAL '1 day'
@@ -0,0 +1,100 @@
+"""
+Benchmark dos backends de DataFrame da ingestão (DATAFRAME_BACKEND = numpy | pyarrow).
+Para payloads sintéticos da SpaceX (texto em maioria), mede o achatamento pelo
+CompiledFlattener, a memória do lote, a validação de qualidade e a montagem dos
+buffers do COPY (csv da stdlib linha a linha x writer CSV do pyarrow). Não usa banco.
+
+Uso (na raiz do projeto):
+    python -m ingestion_engine.benchmarks.bench_arrow_backend [registros]
+"""
+
+import sys
+import time
+
+from src.loaders.postgres_loader import PostgresLoader, arrow_csv_batches, copy_insert
+from src.models.quality import QUALITY_RULES, QualityEngine
+from src.models.schemas import BRONZE_SCHEMAS
+from src.transformers.flattener import CompiledFlattener
+
+
+def synthetic_payloads(count: int) -> list:
+    return [
+        {
+            "id": f"{i:024x}",
+            "name": f"Starlink-{i // 60} v1.0 satélite {i % 60}",
+            "type": "Satellite",
+            "reused": i % 4 == 0,
+            "launch": f"{i // 60:024x}",
+            "customers": ["SpaceX"],
+            "norad_ids": [44235 + i],
+            "nationalities": ["United States"],
+            "manufacturers": ["SpaceX"],
+            "mass_kg": 260.0 + i % 10,
+            "mass_lbs": 573.2,
+            "orbit": "VLEO",
+            "reference_system": "geocentric",
+            "regime": "very-low-earth",
+        }
+        for i in range(count)
+    ]
+
+
+class _Table:
+    name, schema = "spacex_payloads", "raw"
+
+
+def stdlib_copy_buffer(df):
+    """Buffer do copy_insert (to_sql entrega linhas como tuplas Python)."""
+    captured = {}
+
+    class Cursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def copy_expert(self, sql, buffer):
+            captured["size"] = len(buffer.getvalue())
+
+    class Conn:
+        class connection:
+            @staticmethod
+            def cursor():
+                return Cursor()
+
+    rows = (tuple(None if v != v else v for v in row) for row in df.itertuples(index=False, name=None))
+    copy_insert(_Table, Conn, list(df.columns), rows)
+    return captured["size"]
+
+
+def arrow_copy_buffer(df):
+    return sum(len(buffer.getvalue()) for buffer in arrow_csv_batches(df))
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main(count: int = 200_000):
+    records = synthetic_payloads(count)
+    loader = PostgresLoader.__new__(PostgresLoader)
+    engine = QualityEngine(QUALITY_RULES["spacex_payloads"], sample_rows=0)
+    print(f"{count} payloads")
+    print(f"{'backend':<9} {'achatar':>9} {'memória':>12} {'validar':>9} {'buffer COPY':>12}")
+
+    for backend in ("numpy", "pyarrow"):
+        flattener = CompiledFlattener.from_schema(BRONZE_SCHEMAS["spacex_payloads"], backend=backend)
+        df, flatten_s = timed(flattener, records)
+        memory = df.memory_usage(deep=True).sum() / 2**20
+        _, validate_s = timed(engine.validate, df, "spacex_payloads")
+        serialized = loader._serialize_complex_columns(df)
+        copy = stdlib_copy_buffer if backend == "numpy" else arrow_copy_buffer
+        _, copy_s = timed(copy, serialized)
+        print(f"{backend:<9} {flatten_s:8.3f}s {memory:9.1f} MiB {validate_s:8.3f}s {copy_s:11.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,85 @@
+"""
+Benchmark da serialização de colunas complexas (listas/dicts) antes da carga bronze.
+Compara a implementação anterior (df.copy() + apply(isinstance) em todas as colunas +
+apply(json.dumps)) com PostgresLoader._serialize_complex_columns, num DataFrame
+sintético de lançamentos no formato do json_normalize.
+
+Uso (na raiz do projeto):
+    python -m ingestion_engine.benchmarks.bench_serialize_complex [linhas]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+from src.loaders.postgres_loader import PostgresLoader
+
+
+def synthetic_launches(rows: int) -> pd.DataFrame:
+    records = [
+        {
+            "id": f"{i:024x}",
+            "flight_number": i,
+            "name": f"Launch {i}",
+            "date_utc": "2022-12-01T00:00:00.000Z",
+            "success": i % 7 != 0,
+            "details": None if i % 3 else "Missão de teste com descrição longa " * 3,
+            "rocket": "5e9d0d95eda69973a809d1ec",
+            "payloads": [f"p{i}", f"p{i + 1}"],
+            "cores": [{"core": f"c{i}", "flight": 1, "reused": False, "landing_success": True}],
+            "failures": [] if i % 7 else [{"time": 139, "reason": "engine shutdown"}],
+            "crew": [],
+            "ships": ["s1"] if i % 2 else [],
+            "fairings.reused": None if i % 5 else False,
+            "links.webcast": f"https://youtu.be/{i}",
+            "links.flickr.original": [],
+        }
+        for i in range(rows)
+    ]
+    return pd.json_normalize(records)
+
+
+def legacy_serialize(df: pd.DataFrame) -> pd.DataFrame:
+    """Implementação anterior, mantida aqui só para comparação."""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].apply(lambda x: isinstance(x, (list, dict))).any():
+            df[col] = df[col].apply(lambda x: json.dumps(x) if x is not None else None)
+    return df
+
+
+def measure(label, func, df, repeat=3):
+    """Melhor tempo de `repeat` execuções; o pico de memória é medido numa execução à parte."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    result = func(df)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{label:<28} {min(timings):8.3f}s   pico {peak / 2**20:8.1f} MiB")
+    return min(timings)
+
+
+def main(rows: int = 100_000):
+    df = synthetic_launches(rows)
+    loader = PostgresLoader.__new__(PostgresLoader)
+    print(f"{rows} linhas x {len(df.columns)} colunas")
+
+    before = measure("antes (copy + apply)", legacy_serialize, df)
+    after = measure("depois (inferência)", loader._serialize_complex_columns, df)
+    declared = df.copy()
+    declared.attrs["json_columns"] = ["payloads", "cores", "failures", "crew", "ships", "links.flickr.original"]
+    after_declared = measure("depois (json_columns)", loader._serialize_complex_columns, declared)
+
+    print(f"ganho: {before / after:.1f}x (inferência), {before / after_declared:.1f}x (schema)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -54,6 +54,8 @@ def reset_imports():
         'src.extractors.concrete_extractors',
         'src.loaders.postgres_loader',
         'src.utils.notifications',
+        'src.utils.rate_limiter',
+        'src.utils.http_session',
         'config.endpoints'
     ]
     
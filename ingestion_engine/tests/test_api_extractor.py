@@ -588,4 +588,309 @@ class TestAPIExtractorIntegrationStyle:
         result2 = extractor.extract()
         assert len(result2) == 3
         
-        assert mock_get.call_count == 2
\ No newline at end of file
+        assert mock_get.call_count == 2
+
+# =============================================================================
+# CLASSE: TestAPIExtractorConditionalGet
+# =============================================================================
+
+class TestAPIExtractorConditionalGet:
+    """Testes de GET condicional (ETag / Last-Modified / hash do corpo)."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        from src.utils.http_cache import HttpCache
+        return HttpCache(str(tmp_path / "http_cache.json"))
+
+    @staticmethod
+    def _response(status_code=200, data=None, headers=None, content=b"[]"):
+        mock = Mock()
+        mock.status_code = status_code
+        mock.headers = headers or {}
+        mock.json.return_value = data or []
+        mock.content = content
+        mock.raise_for_status.return_value = None
+        return mock
+
+    @patch('src.extractors.concrete_extractors.requests.Session.get')
+    def test_first_run_sends_plain_request_and_stages_validators(self, mock_get, cache, sample_spacex_launches):
+        mock_get.return_value = self._response(
+            data=sample_spacex_launches, headers={"ETag": 'W/"abc"'}, content=b"body-1"
+        )
+        extractor = APIExtractor(endpoint_name="spacex_launches", url="https://api.test.com", cache=cache)
+
+        result = extractor.extract()
+
+        assert len(result) == 3
+        assert extractor.unchanged is False
+        assert mock_get.call_args.kwargs["headers"] is None
+        # Nada é persistido antes do commit (carga ainda não aconteceu)
+        assert cache.get("spacex_launches", cache.fingerprint("https://api.test.com")) is None
+
+        extractor.commit_cache()
+        assert cache.get("spacex_launches", cache.fingerprint("https://api.test.com"))["etag"] == 'W/"abc"'
+
+    @patch('src.extractors.concrete_extractors.requests.Session.get')
+    def test_not_modified_marks_unchanged(self, mock_get, cache):
+        cache.set("spacex_rockets", {
+            "fingerprint": cache.fingerprint("https://api.test.com"),
+            "etag": 'W/"abc"', "last_modified": "Wed, 01 Jan 2026 00:00:00 GMT", "body_hash": "x",
+        })
+        mock_get.return_value = self._response(status_code=304)
+        extractor = APIExtractor(
+            endpoint_name="spacex_rockets", url="https://api.test.com",
+            headers={"Accept": "application/json"}, cache=cache
+        )
+
+        result = extractor.extract()
+
+        assert result.empty
+        assert extractor.unchanged is True
+        sent = mock_get.call_args.kwargs["headers"]
+        assert sent["If-None-Match"] == 'W/"abc"'
+        assert sent["If-Modified-Since"] == "Wed, 01 Jan 2026 00:00:00 GMT"
+        assert sent["Accept"] == "application/json"
+        assert extractor.headers == {"Accept": "application/json"}
+
+    @patch('src.extractors.concrete_extractors.requests.Session.get')
+    def test_body_hash_fallback_without_validators(self, mock_get, cache):
+        cache.set("nasa_solar_events", {
+            "fingerprint": cache.fingerprint("https://api.nasa.gov", {"startDate": "2022-11-01"}),
+            "etag": None, "last_modified": None, "body_hash": cache.body_hash(b'[{"a": 1}]'),
+        })
+        response = self._response(data=[{"a": 1}], content=b'[{"a": 1}]')
+        mock_get.return_value = response
+        extractor = APIExtractor(
+            endpoint_name="nasa_solar_events", url="https://api.nasa.gov",
+            params={"startDate": "2022-11-01"}, cache=cache
+        )
+
+        result = extractor.extract()
+
+        assert result.empty
+        assert extractor.unchanged is True
+        response.json.assert_not_called()
+
+    @patch('src.extractors.concrete_extractors.requests.Session.get')
+    def test_changed_params_ignore_cached_entry(self, mock_get, cache):
+        cache.set("nasa_solar_events", {
+            "fingerprint": cache.fingerprint("https://api.nasa.gov", {"startDate": "2022-11-01"}),
+            "etag": 'W/"old"', "last_modified": None, "body_hash": cache.body_hash(b'[{"a": 1}]'),
+        })
+        mock_get.return_value = self._response(data=[{"a": 1}], content=b'[{"a": 1}]')
+        extractor = APIExtractor(
+            endpoint_name="nasa_solar_events", url="https://api.nasa.gov",
+            params={"startDate": "2022-12-01"}, cache=cache
+        )
+
+        result = extractor.extract()
+
+        assert len(result) == 1
+        assert extractor.unchanged is False
+        assert mock_get.call_args.kwargs["headers"] is None
+
+
+# =============================================================================
+# CLASSE: TestAPIExtractorStreaming
+# =============================================================================
+
+class TestAPIExtractorStreaming:
+    """Testes do modo streaming (parsing incremental + lotes)."""
+
+    @staticmethod
+    def _streamed_response(body, headers=None, status_code=200):
+        mock = Mock()
+        mock.status_code = status_code
+        mock.headers = headers or {}
+        mock.raise_for_status.return_value = None
+        mock.iter_content.side_effect = lambda chunk_size: (
+            body[i:i + 5] for i in range(0, len(body), 5)
+        )
+        mock.json.side_effect = AssertionError("streaming não deve chamar response.json()")
+        return mock
+
+    @patch('src.extractors.concrete_extractors.requests.Session.get')
+    def test_stream_yields_normalized_batches(self, mock_get, sample_spacex_launches, tmp_path):
+        import json
+        from src.utils.http_cache import HttpCache
+
+        body = json.dumps({"data": sample_spacex_launches}).encode()
+        response = self._streamed_response(body, headers={"ETag": '"v1"'})
+        mock_get.return_value = response
+        cache = HttpCache(str(tmp_path / "cache.json"))
+        extractor = APIExtractor(
+            endpoint_name="spacex_payloads", url="https://api.test.com",
+            json_path="data", cache=cache, stream=True, batch_size=2
+        )
+
+        chunks = list(extractor.iter_chunks())
+
+        assert [len(c) for c in chunks] == [2, 1]
+        assert chunks[0]["id"].tolist() == [r["id"] for r in sample_spacex_launches[:2]]
+        assert mock_get.call_args.kwargs["stream"] is True
+        response.close.assert_called_once()
+        assert extractor._pending_cache_entry["body_hash"] == HttpCache.body_hash(body)
+        assert extractor._pending_cache_entry["etag"] == '"v1"'
+
+    @patch('src.extractors.concrete_extractors.requests.Session.get')
+    def test_stream_not_modified(self, mock_get):
+        mock_get.return_value = self._streamed_response(b"", status_code=304)
+        extractor = APIExtractor(endpoint_name="spacex_cores", url="https://api.test.com", stream=True)
+
+        assert list(extractor.iter_chunks()) == []
+        assert extractor.unchanged is True
+
+    @patch('src.extractors.concrete_extractors.requests.Session.get')
+    def test_stream_batches_use_flattener(self, mock_get):
+        import json
+        from src.transformers.flattener import CompiledFlattener
+
+        records = [{"id": str(i), "block": i, "extra": {"k": i}} for i in range(5)]
+        mock_get.return_value = self._streamed_response(json.dumps(records).encode())
+        extractor = APIExtractor(
+            endpoint_name="spacex_cores", url="https://api.test.com", stream=True, batch_size=2,
+            flattener=CompiledFlattener([("id", "string"), ("block", "int")])
+        )
+
+        chunks = list(extractor.iter_chunks())
+
+        assert [len(c) for c in chunks] == [2, 2, 1]
+        assert all(list(c.columns) == ["id", "block"] for c in chunks)
+        assert str(chunks[0]["block"].dtype) == "Int64"
+
+    @patch('src.extractors.concrete_extractors.requests.Session.get')
+    def test_without_stream_iter_chunks_wraps_extract(self, mock_get, mock_response_success, sample_spacex_launches):
+        mock_response_success.json.return_value = sample_spacex_launches
+        mock_get.return_value = mock_response_success
+        extractor = APIExtractor(endpoint_name="spacex_rockets", url="https://api.test.com")
+
+        chunks = list(extractor.iter_chunks())
+
+        assert len(chunks) == 1 and len(chunks[0]) == 3
+        assert "stream" not in mock_get.call_args.kwargs
+
+
+# =============================================================================
+# CLASSE: TestPaginatedQueryExtractor
+# =============================================================================
+
+class TestPaginatedQueryExtractor:
+    """Testes do extrator paginado POST /v4/<recurso>/query."""
+
+    @staticmethod
+    def _page(page, total_pages, docs):
+        mock = Mock()
+        mock.headers = {}
+        mock.raise_for_status.return_value = None
+        mock.json.return_value = {"docs": docs, "page": page, "totalPages": total_pages, "totalDocs": 5}
+        return mock
+
+    @patch('src.extractors.concrete_extractors.requests.Session.post')
+    def test_iter_chunks_yields_pages_in_order(self, mock_post):
+        from src.extractors.concrete_extractors import PaginatedQueryExtractor
+
+        def post(url, json=None, headers=None, timeout=None):
+            page = json["options"]["page"]
+            docs = [{"id": f"{page}-{i}", "core": {"reused": page > 1}} for i in range(2 if page < 3 else 1)]
+            return self._page(page, 3, docs)
+
+        mock_post.side_effect = post
+        extractor = PaginatedQueryExtractor(
+            endpoint_name="spacex_starlink", url="https://api.test.com/v4/starlink/query",
+            query={"launch": {"$ne": None}}, options={"sort": {"id": 1}}, page_size=2, max_workers=2
+        )
+
+        chunks = list(extractor.iter_chunks())
+
+        assert [len(c) for c in chunks] == [2, 2, 1]
+        assert [c["id"].iloc[0] for c in chunks] == ["1-0", "2-0", "3-0"]
+        assert "core.reused" in chunks[0].columns
+        first_body = mock_post.call_args_list[0].kwargs["json"]
+        assert first_body == {
+            "query": {"launch": {"$ne": None}},
+            "options": {"sort": {"id": 1}, "limit": 2, "page": 1},
+        }
+        assert mock_post.call_count == 3
+
+    @patch('src.extractors.concrete_extractors.requests.Session.post')
+    def test_single_page_and_extract_concat(self, mock_post):
+        from src.extractors.concrete_extractors import PaginatedQueryExtractor
+
+        mock_post.return_value = self._page(1, 1, [{"id": "a"}, {"id": "b"}])
+        extractor = PaginatedQueryExtractor(endpoint_name="spacex_cores", url="https://api.test.com/q")
+
+        result = extractor.extract()
+
+        assert result["id"].tolist() == ["a", "b"]
+        assert mock_post.call_count == 1
+        assert extractor.unchanged is None
+
+    @patch('src.extractors.concrete_extractors.requests.Session.post')
+    def test_page_error_propagates(self, mock_post):
+        from src.extractors.concrete_extractors import PaginatedQueryExtractor
+
+        failing = self._page(2, 2, [])
+        failing.raise_for_status.side_effect = requests.exceptions.HTTPError("502 Bad Gateway")
+        mock_post.side_effect = [self._page(1, 2, [{"id": "a"}]), failing]
+        extractor = PaginatedQueryExtractor(endpoint_name="spacex_payloads", url="https://api.test.com/q")
+
+        chunks = extractor.iter_chunks()
+        assert len(next(chunks)) == 1
+        with pytest.raises(requests.exceptions.HTTPError):
+            next(chunks)
+
+
+# =============================================================================
+# CLASSE: TestDateWindowExtractor
+# =============================================================================
+
+class TestDateWindowExtractor:
+    """Testes do backfill por janelas de data (NASA DONKI)."""
+
+    def test_split_date_windows(self):
+        from datetime import date
+        from src.extractors.concrete_extractors import split_date_windows
+
+        windows = split_date_windows(date(2022, 1, 1), date(2022, 3, 5), 30)
+
+        assert windows == [
+            (date(2022, 1, 1), date(2022, 1, 30)),
+            (date(2022, 1, 31), date(2022, 3, 1)),
+            (date(2022, 3, 2), date(2022, 3, 5)),
+        ]
+        with pytest.raises(ValueError, match="Janela inválida"):
+            split_date_windows(date(2022, 2, 1), date(2022, 1, 1), 30)
+
+    @patch('src.extractors.concrete_extractors.requests.Session.get')
+    def test_windows_fetched_and_deduplicated(self, mock_get):
+        from src.extractors.concrete_extractors import DateWindowExtractor
+
+        def get(url, params=None, headers=None, timeout=None):
+            response = Mock()
+            response.status_code = 200
+            response.headers = {}
+            response.raise_for_status.return_value = None
+            if params["startDate"] == "2022-01-01":
+                response.content = b"[...]"
+                response.json.return_value = [{"activityID": "A"}, {"activityID": "B"}]
+            elif params["startDate"] == "2022-01-11":
+                response.content = b"[...]"
+                response.json.return_value = [{"activityID": "B"}, {"activityID": "C"}]
+            else:
+                response.content = b""  # DONKI: janela sem eventos
+            return response
+
+        mock_get.side_effect = get
+        extractor = DateWindowExtractor(
+            endpoint_name="nasa_solar_events", url="https://api.nasa.gov/DONKI/CME",
+            start_date="2022-01-01", end_date="2022-01-25", params={"api_key": "k"},
+            window_days=10, max_workers=3, dedupe_key="activityID"
+        )
+
+        result = extractor.extract()
+
+        assert sorted(result["activityID"]) == ["A", "B", "C"]
+        sent = sorted((c.kwargs["params"]["startDate"], c.kwargs["params"]["endDate"]) for c in mock_get.call_args_list)
+        assert sent == [("2022-01-01", "2022-01-10"), ("2022-01-11", "2022-01-20"), ("2022-01-21", "2022-01-25")]
+        assert all(c.kwargs["params"]["api_key"] == "k" for c in mock_get.call_args_list)
+
@@ -0,0 +1,74 @@
+"""
+Testes de config/endpoints.py - janelas incrementais a partir do watermark.
+"""
+
+import pytest
+from datetime import datetime, timezone
+
+from config.endpoints import get_endpoints_config
+
+
+class TestIncrementalWindows:
+    """Sem watermark: janela histórica; com watermark: só o que veio depois dele."""
+
+    def test_first_run_uses_historical_window(self):
+        config = get_endpoints_config()
+
+        assert config["spacex_launches"]["query"] == {}
+        assert config["nasa_solar_events"]["params"]["startDate"] == "2022-11-01"
+        assert config["nasa_solar_events"]["params"]["endDate"] == "2022-12-31"
+
+    def test_watermarks_apply_lookback(self, monkeypatch):
+        monkeypatch.setenv("INGESTION_LOOKBACK_DAYS", "2")
+        config = get_endpoints_config({
+            "spacex_launches": datetime(2022, 12, 5, 13, 0, tzinfo=timezone.utc),
+            "nasa_solar_events": datetime(2023, 3, 10, tzinfo=timezone.utc),
+        })
+
+        assert config["spacex_launches"]["query"] == {"date_utc": {"$gte": "2022-12-03T13:00:00.000Z"}}
+        nasa_params = config["nasa_solar_events"]["params"]
+        assert nasa_params["startDate"] == "2023-03-08"
+        assert nasa_params["endDate"] == datetime.utcnow().strftime("%Y-%m-%d")
+
+    def test_incremental_endpoints_merge_on_key(self):
+        config = get_endpoints_config()
+
+        assert config["spacex_launches"]["load_options"]["key_column"] == "id"
+        assert config["nasa_solar_events"]["load_options"] == {"strategy": "merge", "key_column": "activityID"}
+        assert "watermark" not in config["spacex_rockets"]
+
+
+class TestBackfillWindow:
+    """START_DATE/END_DATE da DAG ativam o backfill por janelas da NASA."""
+
+    def test_backfill_overrides_watermark(self, monkeypatch):
+        monkeypatch.setenv("START_DATE", "2006-03-01")
+        monkeypatch.setenv("END_DATE", "2022-12-31")
+        monkeypatch.setenv("BACKFILL_WINDOW_DAYS", "45")
+
+        config = get_endpoints_config({"nasa_solar_events": datetime(2023, 3, 10, tzinfo=timezone.utc)})
+
+        nasa = config["nasa_solar_events"]
+        assert nasa["extractor"] == "windows"
+        assert nasa["params"] == {"api_key": "test_nasa_key_12345"}
+        assert nasa["backfill"] == {
+            "start_date": "2006-03-01", "end_date": "2022-12-31",
+            "window_days": 45, "max_workers": 2, "dedupe_key": "activityID",
+        }
+        assert config["spacex_launches"]["query"] == {
+            "date_utc": {"$gte": "2006-03-01T00:00:00.000Z", "$lte": "2022-12-31T23:59:59.999Z"}
+        }
+
+    def test_empty_params_from_dag_disable_backfill(self, monkeypatch):
+        monkeypatch.setenv("START_DATE", "")
+        monkeypatch.setenv("END_DATE", "")
+
+        assert "extractor" not in get_endpoints_config()["nasa_solar_events"]
+
+    def test_inverted_window_raises(self, monkeypatch):
+        monkeypatch.setenv("START_DATE", "2022-12-31")
+        monkeypatch.setenv("END_DATE", "2022-01-01")
+
+        with pytest.raises(ValueError, match="Janela de backfill inválida"):
+            get_endpoints_config()
+
@@ -0,0 +1,92 @@
+"""
+Testes da explosão de arrays em tabelas ponte (src/transformers/exploder.py).
+Rigor: Uma linha por elemento, com a chave do pai e a posição no array; pais sem
+array (None, lista vazia) não geram linhas e o lote vazio continua tipado.
+"""
+
+import pandas as pd
+import pytest
+
+from src.models.schemas import BRONZE_SCHEMAS, ChildTable, TableSchema
+from src.transformers.exploder import ChildCollector, ChildExploder, explode_array
+
+
+PAYLOADS = ChildTable("launch_payloads", "payloads", "launch_id", value=("payload_id", "string"))
+CORES = ChildTable("launch_cores", "cores", "launch_id", fields=[
+    ("core", "string", "core_id"),
+    ("flight", "int"),
+    ("landing_success", "bool"),
+])
+
+PARENT = pd.DataFrame({
+    "id": ["a", "b", "c", "d"],
+    "payloads": [["p1", "p2"], [], None, ["p3"]],
+    "cores": [[{"core": "c1", "flight": 2, "landing_success": True}], None,
+              [{"core": "c2"}, {"core": "c3", "flight": "4"}], []],
+})
+
+
+class TestExplodeArray:
+
+    def test_rows_positions_and_elements(self):
+        rows, positions, elements = explode_array(PARENT["payloads"])
+
+        assert rows.tolist() == [0, 0, 3]
+        assert positions.tolist() == [0, 1, 0]
+        assert elements == ["p1", "p2", "p3"]
+
+    def test_no_arrays(self):
+        rows, positions, elements = explode_array([None, "texto"])
+
+        assert (rows.tolist(), positions.tolist(), elements) == ([], [], [])
+
+
+class TestChildExploder:
+
+    def test_scalar_array(self):
+        df = ChildExploder(PAYLOADS)(PARENT)
+
+        assert list(df.columns) == ["launch_id", "position", "payload_id"]
+        assert df["payload_id"].tolist() == ["p1", "p2", "p3"]
+        assert df.attrs["not_null"] == ["launch_id", "position"]
+
+    def test_object_array_with_typed_fields(self):
+        df = ChildExploder(CORES)(PARENT)
+
+        assert df["launch_id"].tolist() == ["a", "c", "c"]
+        assert df["position"].tolist() == [0, 0, 1]
+        assert df["core_id"].tolist() == ["c1", "c2", "c3"]
+        assert str(df["flight"].dtype) == "Int64" and df["flight"].tolist()[2] == 4
+        assert df.attrs["column_types"]["landing_success"] == "boolean"
+
+    def test_parent_without_array_column(self):
+        df = ChildExploder(CORES)(PARENT[["id"]])
+
+        assert df.empty
+        assert list(df.columns) == ["launch_id", "position", "core_id", "flight", "landing_success"]
+
+    def test_requires_fields_or_value(self):
+        with pytest.raises(ValueError, match="declare fields"):
+            ChildTable("t", "a", "k")
+
+
+class TestChildCollector:
+
+    def test_collects_across_chunks(self):
+        schema = TableSchema("l", [("id", "string")], children=[PAYLOADS])
+        collector = ChildCollector(schema)
+
+        collector.collect(PARENT.iloc[:2])
+        collector.collect(PARENT.iloc[2:])
+
+        assert collector.frame(PAYLOADS)["payload_id"].tolist() == ["p1", "p2", "p3"]
+        assert collector.frame(PAYLOADS).attrs["column_types"]["payload_id"] == "text"
+        assert collector.parent_keys(PAYLOADS) == ["a", "b", "c", "d"]
+
+    @pytest.mark.parametrize("name", sorted(BRONZE_SCHEMAS))
+    def test_registered_children_reference_parent_columns(self, name):
+        schema = BRONZE_SCHEMAS[name]
+
+        for child in schema.children:
+            assert {child.array, child.parent_key} <= set(schema.column_types)
+            assert ChildCollector(schema).frame(child).empty
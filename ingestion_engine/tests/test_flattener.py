@@ -0,0 +1,133 @@
+"""
+Testes do achatamento compilado (src/transformers/flattener.py).
+Rigor: Nas colunas declaradas, o resultado deve coincidir com o pd.json_normalize;
+fora delas, nada de colunas novas (chaves extras vão para a coluna de overflow).
+"""
+
+import pandas as pd
+import pytest
+
+from src.models.schemas import BRONZE_SCHEMAS
+from src.transformers.flattener import CompiledFlattener, build_flattener
+
+
+RECORDS = [
+    {"id": "a", "flight_number": 1, "success": True, "payloads": ["p1", "p2"],
+     "links": {"webcast": "https://youtu.be/a", "patch": {"small": "a.png"}}, "tbd": False},
+    {"id": "b", "flight_number": None, "success": None, "payloads": [],
+     "links": {"webcast": None, "patch": None}},
+    {"id": "c", "flight_number": "3", "links": None, "mass": 12.5},
+]
+
+FIELDS = [
+    ("id", "string"),
+    ("flight_number", "int"),
+    ("success", "bool"),
+    ("payloads", "json"),
+    ("links.webcast", "string"),
+    ("links.patch.small", "string", "patch_small"),
+    ("mass", "float"),
+]
+
+
+class TestCompiledFlattener:
+
+    def test_declared_columns_only_with_explicit_dtypes(self):
+        df = CompiledFlattener(FIELDS)(RECORDS)
+
+        assert list(df.columns) == ["id", "flight_number", "success", "payloads",
+                                    "links.webcast", "patch_small", "mass"]
+        assert str(df["id"].dtype) == "string"
+        assert str(df["flight_number"].dtype) == "Int64"
+        assert str(df["success"].dtype) == "boolean"
+        assert df["mass"].dtype == "float64"
+        assert df["flight_number"].tolist()[0] == 1 and df["flight_number"].tolist()[2] == 3
+        assert df["flight_number"].isna().tolist() == [False, True, False]
+        assert df["success"].isna().tolist() == [False, True, True]
+
+    def test_nested_paths_tolerate_missing_levels(self):
+        df = CompiledFlattener(FIELDS)(RECORDS)
+
+        assert df["links.webcast"].tolist()[0] == "https://youtu.be/a"
+        assert df["links.webcast"].isna().tolist() == [False, True, True]
+        assert df["patch_small"].isna().tolist() == [False, True, True]
+
+    def test_json_columns_keep_python_objects(self):
+        df = CompiledFlattener(FIELDS)(RECORDS)
+
+        assert df["payloads"].tolist() == [["p1", "p2"], [], None]
+        assert df.attrs["json_columns"] == ["payloads"]
+
+    def test_overflow_collects_undeclared_top_level_keys(self):
+        flattener = CompiledFlattener(FIELDS[:2], overflow_column="_extra")
+
+        df = flattener(RECORDS)
+
+        assert df["_extra"][0] == {"success": True, "payloads": ["p1", "p2"],
+                                   "links": RECORDS[0]["links"], "tbd": False}
+        assert df.attrs["json_columns"] == ["_extra"]
+
+    def test_empty_and_single_record(self):
+        flattener = CompiledFlattener(FIELDS)
+
+        assert flattener([]).empty
+        assert list(flattener([]).columns) == list(flattener(RECORDS).columns)
+        assert len(flattener({"id": "x"})) == 1
+
+    def test_invalid_type_rejected(self):
+        with pytest.raises(ValueError, match="Tipo de campo inválido"):
+            CompiledFlattener([("id", "uuid")])
+
+    def test_matches_json_normalize_on_declared_columns(self, sample_spacex_launches):
+        fields = [("id", "string"), ("name", "string"), ("date_utc", "string"),
+                  ("success", "bool"), ("rocket", "string")]
+        expected = pd.json_normalize(sample_spacex_launches)
+
+        df = CompiledFlattener(fields)(sample_spacex_launches)
+
+        for column, _ in fields:
+            assert df[column].astype(object).where(df[column].notna(), None).tolist() == \
+                expected[column].astype(object).where(expected[column].notna(), None).tolist()
+
+
+class TestBuildFlattener:
+
+    @pytest.mark.parametrize("name", sorted(BRONZE_SCHEMAS))
+    def test_registered_specs_compile(self, name):
+        flattener = build_flattener(name)
+
+        assert flattener([]).columns.tolist()
+
+    def test_unknown_spec(self):
+        with pytest.raises(ValueError, match="não registrado"):
+            build_flattener("spacex_starlink")
+
+
+class TestArrowBackend:
+
+    def test_scalar_columns_are_arrow_backed(self):
+        pytest.importorskip("pyarrow")  # backend opcional
+        df = CompiledFlattener(FIELDS, backend="pyarrow")(RECORDS)
+
+        assert str(df["id"].dtype) == "string[pyarrow]"
+        assert str(df["flight_number"].dtype) == "int64[pyarrow]"
+        assert str(df["success"].dtype) == "bool[pyarrow]"
+        assert df["payloads"].dtype == object
+        # "3" (texto) cai no conversor numpy, com a mesma semântica
+        assert df["flight_number"].isna().tolist() == [False, True, False]
+        assert df["flight_number"][2] == 3
+
+    def test_timestamps_and_typed_schema_pass_without_conversion(self):
+        pytest.importorskip("pyarrow")
+        schema = BRONZE_SCHEMAS["spacex_launches"]
+        df = CompiledFlattener.from_schema(schema, backend="pyarrow")(
+            [{"id": "a", "date_utc": "2020-01-01T03:00:00-03:00"}]
+        )
+
+        assert str(df["date_utc"].dtype) == "timestamp[us][pyarrow]"
+        assert df["date_utc"][0] == pd.Timestamp("2020-01-01 06:00")
+        assert schema.apply(df).dtypes.equals(df.dtypes)
+
+    def test_invalid_backend(self):
+        with pytest.raises(ValueError, match="Backend de DataFrame inválido"):
+            CompiledFlattener(FIELDS, backend="polars")
@@ -0,0 +1,104 @@
+"""
+Testes do cache de validadores HTTP: backend em arquivo (src/utils/http_cache.py) e
+backend Postgres (src/loaders/http_cache_store.py), este com engine simulado.
+"""
+
+import json
+from unittest.mock import MagicMock
+
+from src.loaders.http_cache_store import PostgresHttpCache
+from src.utils.http_cache import HttpCache
+
+
+class TestHttpCache:
+    """Testes do backend em arquivo JSON."""
+
+    def test_fingerprint_ignores_param_order(self):
+        a = HttpCache.fingerprint("https://api.test.com", {"a": 1, "b": 2})
+        b = HttpCache.fingerprint("https://api.test.com", {"b": 2, "a": 1})
+        c = HttpCache.fingerprint("https://api.test.com", {"a": 1, "b": 3})
+
+        assert a == b
+        assert a != c
+        assert HttpCache.fingerprint("https://api.test.com") == HttpCache.fingerprint("https://api.test.com", {})
+
+    def test_fingerprint_changes_with_load_contract(self):
+        base = HttpCache.fingerprint("https://api.test.com")
+
+        assert HttpCache.fingerprint("https://api.test.com", contract="1:abc") != base
+        assert HttpCache.fingerprint("https://api.test.com", contract="1:abc") != \
+            HttpCache.fingerprint("https://api.test.com", contract="1:def")
+
+    def test_set_and_get_round_trip(self, tmp_path):
+        path = tmp_path / "nested" / "cache.json"
+        cache = HttpCache(str(path))
+        fp = HttpCache.fingerprint("https://api.test.com")
+
+        cache.set("spacex_cores", {"fingerprint": fp, "etag": '"v1"', "body_hash": "h"})
+
+        entry = HttpCache(str(path)).get("spacex_cores", fp)
+        assert entry["etag"] == '"v1"'
+        assert "updated_at" in entry
+        assert json.loads(path.read_text())["spacex_cores"]["body_hash"] == "h"
+
+    def test_get_with_other_fingerprint_returns_none(self, tmp_path):
+        cache = HttpCache(str(tmp_path / "cache.json"))
+        cache.set("spacex_cores", {"fingerprint": "old", "etag": '"v1"'})
+
+        assert cache.get("spacex_cores", "new") is None
+        assert cache.get("missing", "old") is None
+
+    def test_corrupted_file_is_ignored(self, tmp_path, caplog):
+        path = tmp_path / "cache.json"
+        path.write_text("{not json")
+        cache = HttpCache(str(path))
+
+        assert cache.get("spacex_cores", "x") is None
+        assert "ilegível" in caplog.text
+
+
+class TestPostgresHttpCache:
+    """Backend na tabela raw._http_cache (engine simulado; o SQL gerado é inspecionado)."""
+
+    @staticmethod
+    def _engine():
+        engine, conn = MagicMock(), MagicMock()
+        engine.begin.return_value.__enter__.return_value = conn
+        engine.connect.return_value.__enter__.return_value = conn
+        return engine, conn
+
+    def test_table_created_once(self):
+        engine, conn = self._engine()
+        conn.execute.return_value.mappings.return_value.first.return_value = None
+        cache = PostgresHttpCache(engine)
+
+        assert cache.get("spacex_cores", "fp") is None
+        cache.get("spacex_cores", "fp")
+
+        statements = [str(c.args[0]) for c in conn.execute.call_args_list]
+        assert sum("CREATE TABLE IF NOT EXISTS raw.\"_http_cache\"" in s for s in statements) == 1
+
+    def test_load_returns_entry_for_the_same_fingerprint(self):
+        engine, conn = self._engine()
+        conn.execute.return_value.mappings.return_value.first.return_value = {
+            "fingerprint": "fp", "etag": '"v1"', "last_modified": None, "body_hash": "h"
+        }
+        cache = PostgresHttpCache(engine)
+
+        assert cache.get("spacex_cores", "fp")["etag"] == '"v1"'
+        assert cache.get("spacex_cores", "outro") is None
+        assert conn.execute.call_args.args[1] == {"endpoint": "spacex_cores"}
+
+    def test_save_upserts_by_endpoint(self):
+        engine, conn = self._engine()
+        cache = PostgresHttpCache(engine)
+
+        cache.set("spacex_cores", {"fingerprint": "fp", "etag": '"v2"', "body_hash": "h"})
+
+        upsert = " ".join(str(conn.execute.call_args.args[0]).split())
+        assert upsert.startswith('INSERT INTO raw."_http_cache"')
+        assert "ON CONFLICT (endpoint) DO UPDATE SET fingerprint = EXCLUDED.fingerprint" in upsert
+        assert conn.execute.call_args.args[1] == {
+            "endpoint": "spacex_cores", "fingerprint": "fp", "etag": '"v2"',
+            "last_modified": None, "body_hash": "h",
+        }
@@ -0,0 +1,72 @@
+"""
+Testes do gerenciador de conexões compartilhado (src/utils/http_session.py).
+Rigor: O reaproveitamento de sockets é medido contra um servidor HTTP/1.1 local.
+"""
+
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.utils.http_session import ConnectionManager, get_connection_manager, parse_pool_sizes
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'[{"id": "a"}]'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestConnectionManager:
+
+    def test_parse_pool_sizes(self):
+        assert parse_pool_sizes("api.nasa.gov=2, API.spacexdata.com=8,invalido") == {
+            "api.nasa.gov": 2, "api.spacexdata.com": 8
+        }
+        assert parse_pool_sizes(None) == {}
+
+    def test_same_retry_policy_for_both_schemes(self):
+        manager = ConnectionManager(pool_maxsize=6, host_pool_sizes={"api.nasa.gov": 2})
+
+        https = manager.session.get_adapter("https://api.spacexdata.com/v4/launches")
+        http = manager.session.get_adapter("http://api.spacexdata.com/v4/launches")
+        nasa = manager.session.get_adapter("https://api.nasa.gov/DONKI/CME")
+
+        assert https is http
+        assert https.max_retries.total == 3
+        assert 503 in https.max_retries.status_forcelist
+        assert https._pool_maxsize == 6
+        assert nasa is not https and nasa._pool_maxsize == 2
+        assert nasa.max_retries is https.max_retries
+
+    def test_endpoints_on_same_host_reuse_socket(self, local_server):
+        from src.extractors.concrete_extractors import APIExtractor
+
+        manager = ConnectionManager()
+        for name in ["rockets", "launches", "payloads", "cores"]:
+            APIExtractor(name, f"{local_server}/v4/{name}", session=manager.session).extract()
+
+        stats = manager.stats()["127.0.0.1"]
+        assert stats == {"requests": 4, "connections": 1, "reused": 3}
+        manager.close()
+
+    def test_process_wide_manager(self):
+        assert get_connection_manager() is get_connection_manager()
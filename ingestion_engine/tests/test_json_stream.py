@@ -0,0 +1,96 @@
+"""
+Testes do parser JSON incremental (src/utils/json_stream.py).
+Rigor: O mesmo documento é fatiado em blocos de vários tamanhos (inclusive 1 byte,
+que corta números, strings e caracteres UTF-8 multibyte) e deve produzir os mesmos registros.
+"""
+
+import json
+import random
+import pytest
+
+from src.utils.json_stream import JsonPathNotFound, batched, iter_json_array
+
+
+def _blocks(document, size):
+    raw = document.encode("utf-8") if isinstance(document, str) else document
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+
+RECORDS = [
+    {"id": "5eb87cd9ffd86e000604b32a", "flight_number": 12345, "name": "Órbita ☄️", "success": None,
+     "cores": [{"core": "c1", "reused": False}], "fairings": {"ships": []}},
+    {"id": "b", "flight_number": -7.25e3, "name": 'esc"aped', "success": True, "cores": [], "fairings": None},
+    123,
+]
+
+
+class TestIterJsonArray:
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 64, 1 << 16])
+    def test_root_array_any_block_size(self, size):
+        document = json.dumps(RECORDS, ensure_ascii=False, indent=1)
+
+        assert list(iter_json_array(_blocks(document, size))) == RECORDS
+
+    @pytest.mark.parametrize("size", [1, 5, 1 << 16])
+    def test_json_path_skips_siblings(self, size):
+        document = json.dumps({
+            "meta": {"count": 3, "items": ["ignorado"]},
+            "data": {"info": "x", "events": RECORDS, "after": [1, 2]},
+        })
+
+        assert list(iter_json_array(_blocks(document, size), "data.events")) == RECORDS
+
+    @pytest.mark.parametrize("document", ["[0.1, 1e5, -2.5e+3, 7E-2, 10]", '{"v": [0.5, -0.25e-1]}'])
+    def test_numbers_split_at_every_offset(self, document):
+        raw = document.encode()
+        path = "v" if document.startswith("{") else None
+        expected = json.loads(document)
+        expected = expected["v"] if path else expected
+
+        for cut in range(1, len(raw)):
+            assert list(iter_json_array([raw[:cut], raw[cut:]], path)) == expected, cut
+
+    def test_random_block_boundaries_match_json_loads(self):
+        rng = random.Random(12)
+        # Números soltos no array: dentro de objetos, o corte já faria o raw_decode falhar e reler
+        items = [rng.choice([rng.uniform(-1e4, 1e4), rng.random() * 1e-7, rng.randint(-10**6, 10**6),
+                             {"id": str(i), "mass": rng.uniform(-1e4, 1e4)}]) for i in range(60)]
+        raw = json.dumps({"meta": {"total": 0.5}, "data": {"items": items}}, indent=2).encode()
+
+        for _ in range(50):
+            blocks, start = [], 0
+            while start < len(raw):
+                size = rng.randint(1, 7)
+                blocks.append(raw[start:start + size])
+                start += size
+            assert list(iter_json_array(blocks, "data.items")) == json.loads(raw)["data"]["items"]
+
+    def test_value_at_path_that_is_not_array_is_single_record(self):
+        document = json.dumps({"data": {"id": "único"}})
+
+        assert list(iter_json_array(_blocks(document, 4), "data")) == [{"id": "único"}]
+
+    def test_missing_path_raises(self):
+        with pytest.raises(JsonPathNotFound):
+            list(iter_json_array(_blocks('{"data": {"x": 1}}', 4), "data.events"))
+        with pytest.raises(JsonPathNotFound):
+            list(iter_json_array(_blocks('[1, 2]', 4), "data"))
+
+    def test_empty_inputs(self):
+        assert list(iter_json_array([b""])) == []
+        assert list(iter_json_array(_blocks(" [ ] ", 1))) == []
+
+    def test_truncated_document_raises(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array(_blocks('[{"id": 1}, {"id": ', 4)))
+
+    def test_records_are_lazy(self):
+        def blocks():
+            yield b'[{"id": 1},'
+            raise AssertionError("leu além do necessário")
+
+        assert next(iter_json_array(blocks())) == {"id": 1}
+
+    def test_batched(self):
+        assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
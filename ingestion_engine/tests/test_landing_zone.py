@@ -0,0 +1,117 @@
+"""
+Testes da landing zone Parquet (src/loaders/landing_zone.py).
+Rigor: O lote relido precisa ser equivalente ao gravado — tipos, nulos e colunas
+JSON — para que a recarga sem HTTP produza a mesma camada bronze.
+"""
+
+import datetime
+
+import pandas as pd
+import pytest
+
+from src.loaders.landing_zone import ParquetLandingZone
+from src.models.schemas import BRONZE_SCHEMAS
+from src.transformers.flattener import CompiledFlattener
+
+# pyarrow é opcional: sem ele, ParquetLandingZone recusa ser criada (ImportError)
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def batch():
+    df = pd.DataFrame({
+        "id": ["a", "b", None],
+        "flight_number": pd.array([1, None, 3], dtype="Int64"),
+        "date_utc": pd.to_datetime(["2020-01-01T10:00:00Z", None, "2021-06-30T00:00:00Z"]),
+        "payloads": [["p1", "p2"], [], None],
+        "fairings": [{"reused": True}, None, {"reused": None}],
+        "ingestion_timestamp": datetime.datetime(2026, 10, 17, 12, 0),
+    })
+    df.attrs["json_columns"] = ["payloads", "fairings"]
+    return df
+
+
+@pytest.fixture
+def zone(tmp_path):
+    return ParquetLandingZone(tmp_path, run_id="20261017T120000")
+
+
+class TestWrite:
+
+    def test_hive_partitioned_layout(self, zone, batch, tmp_path):
+        first = zone.write("spacex_launches", batch, ingest_date="2026-10-17")
+        second = zone.write("spacex_launches", batch, ingest_date="2026-10-17")
+
+        assert first == tmp_path / "endpoint=spacex_launches" / "ingest_date=2026-10-17" / "part-20261017T120000-00000.parquet"
+        assert second.name == "part-20261017T120000-00001.parquet"
+
+    def test_empty_batches_are_not_written(self, zone, tmp_path):
+        assert zone.write("spacex_launches", pd.DataFrame()) is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_mixed_object_columns_are_written_as_text(self, zone):
+        path = zone.write("spacex_misc", pd.DataFrame({"value": [1, "dois", None]}))
+
+        assert ParquetLandingZone.read_file(path)["value"].tolist() == ["1", "dois", pd.NA]
+
+    def test_tee_writes_each_chunk_as_it_is_consumed(self, zone, batch):
+        stream = zone.tee("spacex_launches", iter([batch.iloc[:2], batch.iloc[2:]]))
+
+        assert zone.files("spacex_launches") == []
+        assert sum(len(chunk) for chunk in stream) == 3
+        assert len(zone.files("spacex_launches")) == 2
+
+    def test_tee_survives_write_failures(self, zone, batch, monkeypatch, caplog):
+        monkeypatch.setattr(zone, "write", lambda *a, **k: (_ for _ in ()).throw(OSError("disco cheio")))
+
+        assert zone.tee("spacex_launches", batch) is batch
+        assert "disco cheio" in caplog.text
+
+
+class TestRead:
+
+    def test_round_trip_restores_types_and_json(self, zone, batch):
+        zone.write("spacex_launches", batch)
+
+        df = zone.read("spacex_launches")
+
+        assert df["id"].tolist() == ["a", "b", pd.NA]
+        assert str(df["flight_number"].dtype) == "Int64" and df["flight_number"].isna().tolist() == [False, True, False]
+        assert df["date_utc"].dt.tz is not None and df["date_utc"].isna().sum() == 1
+        assert df["payloads"].tolist() == [["p1", "p2"], [], None]
+        assert df["fairings"].tolist() == [{"reused": True}, None, {"reused": None}]
+        assert df.attrs["json_columns"] == ["payloads", "fairings"]
+
+    def test_latest_run_of_latest_partition_by_default(self, tmp_path, batch):
+        ParquetLandingZone(tmp_path, run_id="20261016T000000").write("e", batch, "2026-10-16")
+        ParquetLandingZone(tmp_path, run_id="20261017T000000").write("e", batch, "2026-10-17")
+        ParquetLandingZone(tmp_path, run_id="20261017T090000").write("e", batch.iloc[:1], "2026-10-17")
+        zone = ParquetLandingZone(tmp_path)
+
+        assert len(zone.read("e")) == 1
+        assert len(zone.read("e", run_id="20261017T000000")) == 3
+        assert [p.parent.name for p in zone.files("e", ingest_date="2026-10-16")] == ["ingest_date=2026-10-16"]
+        assert zone.ingest_dates("e") == ["2026-10-16", "2026-10-17"]
+        assert zone.read("desconhecido").empty
+
+    def test_arrow_backend(self, zone, batch):
+        zone.write("spacex_launches", batch)
+
+        df = zone.read("spacex_launches", backend="pyarrow")
+
+        assert isinstance(df["id"].dtype, pd.ArrowDtype)
+        assert df["payloads"].tolist() == [["p1", "p2"], [], None]
+
+    def test_flattened_batch_reloads_with_bronze_schema(self, zone):
+        flattener = CompiledFlattener.from_schema(BRONZE_SCHEMAS["spacex_launches"])
+        batch = flattener([{"id": "5eb87cd9ffd86e000604b32a", "flight_number": 1, "payloads": ["p"],
+                            "date_utc": "2006-03-24T22:30:00.000Z", "cores": [{"core": "c"}]}])
+        zone.write("spacex_launches", batch)
+
+        schema = BRONZE_SCHEMAS["spacex_launches"]
+        df, batch = schema.apply(zone.read("spacex_launches")), schema.apply(batch)
+
+        assert df.attrs["column_types"] == batch.attrs["column_types"]
+        assert df.dtypes.astype(str).tolist() == batch.dtypes.astype(str).tolist()
+        assert df["cores"].tolist() == batch["cores"].tolist()
+        assert df["date_utc"].tolist() == batch["date_utc"].tolist()
@@ -4,7 +4,7 @@ Testes para main.py - Motor de Ingestão.
 
 import pytest
 import pandas as pd
-from unittest.mock import Mock, patch, MagicMock, call
+from unittest.mock import Mock, patch, MagicMock, call, ANY
 
 # =============================================================================
 # FIXTURE PARA MOCKS GLOBAIS
@@ -21,6 +21,7 @@ def mock_all_dependencies():
     with patch('main.PostgresLoader') as mock_postgres_cls, \
          patch('main.AlertSystem') as mock_alert_cls, \
          patch('main.APIExtractor') as mock_extractor_cls, \
+         patch('main.IngestionStateStore') as mock_state_cls, \
          patch('main.get_endpoints_config') as mock_get_config:
         
         # Configura PostgresLoader mock
@@ -45,6 +46,11 @@ def mock_all_dependencies():
             "name": ["Launch 1", "Launch 2"]
         })
         mock_extractor_cls.return_value = mock_extractor_instance
+
+        # Configura IngestionStateStore mock (sem watermarks gravados)
+        mock_state_instance = MagicMock()
+        mock_state_instance.get_watermarks.return_value = {}
+        mock_state_cls.return_value = mock_state_instance
         
         # Retorna dicionário com todos os mocks
         yield {
@@ -54,6 +60,7 @@ def mock_all_dependencies():
             'alert_instance': mock_alert_instance,
             'extractor_cls': mock_extractor_cls,
             'extractor_instance': mock_extractor_instance,
+            'state_instance': mock_state_instance,
             'get_config': mock_get_config
         }
 
@@ -158,7 +165,13 @@ class TestRunIngestionEngine:
             endpoint_name="spacex_launches",
             url="https://api.spacexdata.com/v4/launches",
             params=None,
-            json_path=None
+            json_path=None,
+            cache=ANY,
+            contract=ANY,
+            session=ANY,
+            stream=False,
+            batch_size=None,
+            flattener=None
         )
         mock_extractor.extract.assert_called_once()
         mocks['postgres_instance'].load_bronze.assert_called_once()
@@ -285,6 +298,548 @@ class TestRunIngestionEngine:
         assert mocks['extractor_cls'].call_count == 2
         assert mocks['postgres_instance'].load_bronze.call_count == 2
 
+    def test_run_ingestion_forwards_load_options(self, mock_all_dependencies, sample_spacex_df):
+        """Testa repasse de load_options do endpoint para o loader."""
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            "spacex_launches": {
+                "url": "https://api.spacexdata.com/v4/launches",
+                "layer": "bronze",
+                "load_options": {"strategy": "merge", "key_column": "id"}
+            }
+        }
+        mocks['extractor_instance'].extract.return_value = sample_spacex_df
+
+        main.run_ingestion_engine(max_workers=1)
+
+        call_kwargs = mocks['postgres_instance'].load_bronze.call_args.kwargs
+        assert call_kwargs["table_name"] == "spacex_launches"
+        assert call_kwargs["strategy"] == "merge"
+        assert call_kwargs["key_column"] == "id"
+
+    def test_run_ingestion_forwards_bronze_schema(self, mock_all_dependencies, sample_spacex_df):
+        """Testa repasse do schema bronze registrado para o loader (DDL tipado)."""
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            "spacex_launches": {
+                "url": "https://api.spacexdata.com/v4/launches",
+                "layer": "bronze",
+                "schema": "spacex_launches",
+                "load_options": {"key_column": "id"}
+            }
+        }
+        mocks['extractor_instance'].extract.return_value = sample_spacex_df
+
+        main.run_ingestion_engine(max_workers=1)
+
+        call_kwargs = mocks['postgres_instance'].load_bronze.call_args.kwargs
+        assert call_kwargs["schema"] == "spacex_launches"
+        assert call_kwargs["key_column"] == "id"
+
+# =============================================================================
+# CLASSE: TestHttpCacheIntegration
+# =============================================================================
+
+class TestHttpCacheIntegration:
+    """Integração do cache HTTP (ETag/hash) com o orquestrador."""
+
+    def test_unchanged_endpoint_skips_load(self, mock_all_dependencies, caplog):
+        """Origem inalterada: sem preflight/carga, sem alerta e sem gravar o cache."""
+        import logging
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            "spacex_rockets": {"url": "https://api.spacexdata.com/v4/rockets", "layer": "bronze"}
+        }
+        mocks['extractor_instance'].extract.return_value = pd.DataFrame()
+        mocks['extractor_instance'].unchanged = True
+
+        with caplog.at_level(logging.INFO):
+            results = main.run_ingestion_engine(max_workers=1)
+
+        assert results == {"spacex_rockets": True}
+        mocks['postgres_instance'].load_bronze.assert_not_called()
+        mocks['alert_instance'].notify_critical_failure.assert_not_called()
+        mocks['extractor_instance'].commit_cache.assert_not_called()
+        assert "sem alterações na origem" in caplog.text
+
+    def test_cache_committed_only_after_successful_load(self, mock_all_dependencies, sample_spacex_df):
+        """O cache só é gravado quando a carga termina com sucesso."""
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            "ok": {"url": "https://api.test.com/ok", "layer": "bronze"},
+            "bad": {"url": "https://api.test.com/bad", "layer": "bronze"},
+        }
+        extractors = {}
+
+        def create_extractor(*args, **kwargs):
+            mock = MagicMock()
+            mock.unchanged = False
+            mock.extract.return_value = sample_spacex_df.copy()
+            extractors[kwargs["endpoint_name"]] = mock
+            return mock
+
+        def load_bronze(df, table_name, **kwargs):
+            if table_name == "bad":
+                raise Exception("falha na carga")
+
+        mocks['extractor_cls'].side_effect = create_extractor
+        mocks['postgres_instance'].load_bronze.side_effect = load_bronze
+
+        main.run_ingestion_engine(max_workers=1)
+
+        extractors["ok"].commit_cache.assert_called_once()
+        extractors["bad"].commit_cache.assert_not_called()
+
+    def test_build_http_cache_backends(self, monkeypatch, tmp_path):
+        """HTTP_CACHE_BACKEND seleciona o backend do cache."""
+        import main
+        from src.utils.http_cache import HttpCache
+
+        loader = MagicMock()
+        monkeypatch.setenv("HTTP_CACHE_BACKEND", "none")
+        assert main.build_http_cache(loader) is None
+
+        monkeypatch.setenv("HTTP_CACHE_BACKEND", "file")
+        monkeypatch.setenv("HTTP_CACHE_PATH", str(tmp_path / "cache.json"))
+        cache = main.build_http_cache(loader)
+        assert type(cache) is HttpCache
+        assert cache.path == str(tmp_path / "cache.json")
+
+        monkeypatch.setenv("HTTP_CACHE_BACKEND", "postgres")
+        assert main.build_http_cache(loader).engine is loader.engine
+
+# =============================================================================
+# CLASSE: TestConcurrentIngestion
+# =============================================================================
+
+class TestConcurrentIngestion:
+    """Testes do modo concorrente (pool de threads) do motor de ingestão."""
+
+    def test_resolve_max_workers_from_env(self, monkeypatch):
+        """Testa leitura de INGESTION_MAX_WORKERS e limite pelo nº de endpoints."""
+        import main
+
+        monkeypatch.setenv("INGESTION_MAX_WORKERS", "8")
+        assert main.resolve_max_workers(endpoint_count=5) == 5
+        assert main.resolve_max_workers(endpoint_count=20) == 8
+        assert main.resolve_max_workers(max_workers=0, endpoint_count=5) == 1
+        assert main.resolve_max_workers(max_workers=2, endpoint_count=5) == 2
+
+    def test_concurrent_failure_isolation(self, mock_all_dependencies, sample_spacex_df):
+        """Falha em um endpoint não impede a carga dos demais no modo concorrente."""
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            f"endpoint_{i}": {"url": f"https://api.test.com/{i}", "layer": "bronze"}
+            for i in range(4)
+        }
+
+        def create_extractor(*args, **kwargs):
+            mock = MagicMock()
+            if kwargs["endpoint_name"] == "endpoint_2":
+                mock.extract.side_effect = Exception("Timeout simulado")
+            else:
+                mock.extract.return_value = sample_spacex_df.copy()
+            return mock
+
+        mocks['extractor_cls'].side_effect = create_extractor
+
+        results = main.run_ingestion_engine(max_workers=4)
+
+        assert results == {
+            "endpoint_0": True,
+            "endpoint_1": True,
+            "endpoint_2": False,
+            "endpoint_3": True,
+        }
+        assert mocks['postgres_instance'].load_bronze.call_count == 3
+        mocks['alert_instance'].notify_critical_failure.assert_called_once_with(
+            "endpoint_2",
+            "Timeout simulado"
+        )
+
+    def test_loader_sized_for_workers_and_closed_on_failure(self, mock_all_dependencies):
+        """O pool do loader acompanha INGESTION_MAX_WORKERS; close() roda mesmo se a execução falhar."""
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].side_effect = RuntimeError("config inválida")
+
+        with pytest.raises(RuntimeError):
+            main.run_ingestion_engine(max_workers=6)
+
+        mocks['postgres_cls'].assert_called_once_with(concurrent_loads=6)
+        mocks['postgres_instance'].close.assert_called_once()
+
+    def test_sequential_mode_preserves_order(self, mock_all_dependencies, sample_spacex_df):
+        """Com max_workers=1 os endpoints são processados na ordem da configuração."""
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            name: {"url": f"https://api.test.com/{name}", "layer": "bronze"}
+            for name in ["c", "a", "b"]
+        }
+        mocks['extractor_instance'].extract.side_effect = lambda: sample_spacex_df.copy()
+
+        main.run_ingestion_engine(max_workers=1)
+
+        loaded = [c.kwargs["table_name"] for c in mocks['postgres_instance'].load_bronze.call_args_list]
+        assert loaded == ["c", "a", "b"]
+
+# =============================================================================
+# CLASSE: TestPipelinedIngestion
+# =============================================================================
+
+class TestPipelinedIngestion:
+    """Testes do modo produtor/consumidor (extract -> fila limitada -> load)."""
+
+    def test_pipeline_mode_loads_all_and_isolates_failures(self, mock_all_dependencies, sample_spacex_df):
+        """Falhas de extração não chegam ao loader; os demais endpoints são carregados."""
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            name: {"url": f"https://api.test.com/{name}", "layer": "bronze"}
+            for name in ["ok_1", "broken", "ok_2"]
+        }
+
+        def create_extractor(*args, **kwargs):
+            mock = MagicMock()
+            if kwargs["endpoint_name"] == "broken":
+                mock.extract.side_effect = Exception("Erro simulado")
+            else:
+                mock.extract.return_value = sample_spacex_df.copy()
+            return mock
+
+        mocks['extractor_cls'].side_effect = create_extractor
+
+        results = main.run_ingestion_engine(max_workers=2, mode="pipeline")
+
+        assert results == {"ok_1": True, "broken": False, "ok_2": True}
+        assert mocks['postgres_instance'].load_bronze.call_count == 2
+
+    def test_pipeline_load_failure_is_reported(self, mock_all_dependencies, sample_spacex_df):
+        """Erro no estágio de carga é notificado e não derruba o consumidor."""
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            name: {"url": f"https://api.test.com/{name}", "layer": "bronze"}
+            for name in ["first", "second"]
+        }
+        mocks['extractor_instance'].extract.side_effect = lambda: sample_spacex_df.copy()
+        mocks['postgres_instance'].load_bronze.side_effect = [Exception("deadlock"), None]
+
+        results = main.run_ingestion_engine(max_workers=1, mode="pipeline")
+
+        assert sorted(results.values()) == [False, True]
+        mocks['alert_instance'].notify_critical_failure.assert_called_once()
+
+    def test_pipeline_queue_applies_backpressure(self, mock_all_dependencies, sample_spacex_df):
+        """Com o loader bloqueado, a extração para quando a fila enche."""
+        import threading
+        import main
+
+        mocks = mock_all_dependencies
+        endpoints = {
+            f"endpoint_{i}": {"url": f"https://api.test.com/{i}", "layer": "bronze"}
+            for i in range(5)
+        }
+        extracted = []
+
+        def extract():
+            extracted.append(1)
+            return sample_spacex_df.copy()
+
+        mocks['extractor_instance'].extract.side_effect = extract
+
+        release = threading.Event()
+        loader = MagicMock()
+        loader.load_bronze.side_effect = lambda *a, **k: release.wait(timeout=5)
+
+        runner = threading.Thread(
+            target=main.run_pipelined,
+            args=(endpoints, loader, MagicMock(), 1),
+            kwargs={"queue_size": 1},
+        )
+        runner.start()
+        try:
+            # 1 em carga + 1 na fila + 1 produtor bloqueado no put()
+            for _ in range(50):
+                if len(extracted) >= 3:
+                    break
+                threading.Event().wait(0.01)
+            threading.Event().wait(0.05)
+            assert len(extracted) == 3
+        finally:
+            release.set()
+            runner.join(timeout=5)
+
+        assert len(extracted) == 5
+        assert loader.load_bronze.call_count == 5
+
+class TestChunkedIngestion:
+    """Endpoints paginados ("extractor": "query"): lotes em streaming até o loader."""
+
+    @pytest.fixture
+    def query_extractor(self, sample_spacex_df):
+        with patch('main.PaginatedQueryExtractor') as cls:
+            instance = MagicMock()
+            instance.iter_chunks.side_effect = lambda: iter([
+                sample_spacex_df.iloc[:2].copy(), sample_spacex_df.iloc[2:].copy()
+            ])
+            cls.return_value = instance
+            yield cls
+
+    @staticmethod
+    def _consume_chunks(collected):
+        def load_bronze(df, table_name, **kwargs):
+            collected.extend(df)
+        return load_bronze
+
+    @pytest.mark.parametrize("mode", ["concurrent", "pipeline"])
+    def test_chunks_streamed_to_loader(self, mock_all_dependencies, query_extractor, sample_spacex_df, mode):
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            "spacex_launches": {
+                "url": "https://api.test.com/v4/launches/query", "extractor": "query",
+                "query": {"upcoming": False}, "page_size": 2
+            }
+        }
+        collected = []
+        mocks['postgres_instance'].load_bronze.side_effect = self._consume_chunks(collected)
+
+        results = main.run_ingestion_engine(max_workers=2, mode=mode)
+
+        assert results == {"spacex_launches": True}
+        assert query_extractor.call_args.kwargs["query"] == {"upcoming": False}
+        assert query_extractor.call_args.kwargs["page_size"] == 2
+        mocks['extractor_cls'].assert_not_called()
+        assert sum(len(c) for c in collected) == len(sample_spacex_df)
+        assert all(c["source_endpoint"].eq("spacex_launches").all() for c in collected)
+
+    def test_build_extractor_selects_by_config(self):
+        import main
+
+        windows = main.build_extractor("nasa_solar_events", {
+            "url": "https://api.nasa.gov/DONKI/CME", "extractor": "windows", "params": {"api_key": "k"},
+            "backfill": {"start_date": "2020-01-01", "end_date": "2020-12-31", "window_days": 30,
+                         "max_workers": 2, "dedupe_key": "activityID"},
+        })
+        query = main.build_extractor("spacex_launches", {"url": "https://api.test.com/q", "extractor": "query"})
+
+        assert isinstance(windows, main.DateWindowExtractor)
+        assert (windows.window_days, windows.dedupe_key) == (30, "activityID")
+        assert isinstance(query, main.PaginatedQueryExtractor)
+        assert query.normalize is pd.json_normalize
+
+    def test_endpoint_contract_follows_schema_and_loader_version(self, monkeypatch):
+        import main
+
+        launches = main.endpoint_contract({"schema": "spacex_launches"})
+        rockets = main.endpoint_contract({"schema": "spacex_rockets"})
+        merged = main.endpoint_contract({"schema": "spacex_launches", "load_options": {"strategy": "merge"}})
+        monkeypatch.setattr(main, "LOADER_VERSION", "2")
+
+        assert len({launches, rockets, merged, main.endpoint_contract({"schema": "spacex_launches"})}) == 4
+        assert main.build_extractor("spacex_rockets", {
+            "url": "https://api.test.com", "schema": "spacex_rockets"
+        }, http_cache=MagicMock()).contract == main.endpoint_contract({"schema": "spacex_rockets"})
+
+    def test_build_extractor_uses_registered_flattener(self):
+        import main
+        from src.transformers.flattener import CompiledFlattener
+
+        query = main.build_extractor("spacex_launches", {
+            "url": "https://api.test.com/q", "extractor": "query", "schema": "spacex_launches"
+        })
+        windows = main.build_extractor("nasa_solar_events", {
+            "url": "https://api.nasa.gov/DONKI/CME", "extractor": "windows", "schema": "nasa_solar_events",
+            "backfill": {"start_date": "2020-01-01", "end_date": "2020-01-31"},
+        })
+
+        assert isinstance(query.normalize, CompiledFlattener)
+        assert isinstance(windows.flattener, CompiledFlattener)
+
+    def test_preflight_runs_on_first_chunk(self, mock_all_dependencies, query_extractor):
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            "spacex_launches": {"url": "https://api.test.com/q", "extractor": "query"}
+        }
+        query_extractor.return_value.iter_chunks.side_effect = lambda: iter([pd.DataFrame({"x": [1]})])
+
+        results = main.run_ingestion_engine(max_workers=1)
+
+        assert results == {"spacex_launches": False}
+        mocks['postgres_instance'].load_bronze.assert_not_called()
+
+    def test_pipeline_page_error_reported_by_loader(self, mock_all_dependencies, query_extractor, sample_spacex_df):
+        import main
+
+        def pages():
+            yield sample_spacex_df.copy()
+            raise RuntimeError("502 na página 2")
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            "spacex_launches": {"url": "https://api.test.com/q", "extractor": "query"}
+        }
+        query_extractor.return_value.iter_chunks.side_effect = pages
+        mocks['postgres_instance'].load_bronze.side_effect = self._consume_chunks([])
+
+        results = main.run_ingestion_engine(max_workers=1, mode="pipeline")
+
+        assert results == {"spacex_launches": False}
+        mocks['alert_instance'].notify_critical_failure.assert_called_once_with(
+            "spacex_launches", "502 na página 2"
+        )
+
+class TestWatermarkState:
+    """Carga incremental: watermark gravado após a carga e repassado à configuração."""
+
+    def test_watermarks_passed_to_config(self, mock_all_dependencies):
+        import main
+        from datetime import datetime, timezone
+
+        mocks = mock_all_dependencies
+        watermark = datetime(2022, 12, 1, tzinfo=timezone.utc)
+        mocks['state_instance'].get_watermarks.return_value = {"spacex_launches": watermark}
+        mocks['get_config'].return_value = {}
+
+        main.run_ingestion_engine(max_workers=1)
+
+        mocks['get_config'].assert_called_once_with({"spacex_launches": watermark})
+
+    def test_state_unavailable_falls_back_to_full_extraction(self, mock_all_dependencies):
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['state_instance'].get_watermarks.side_effect = Exception("connection refused")
+        mocks['get_config'].return_value = {}
+
+        main.run_ingestion_engine(max_workers=1)
+
+        mocks['get_config'].assert_called_once_with({})
+
+    def test_watermark_recorded_after_load_ignoring_future_dates(self, mock_all_dependencies):
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            "spacex_launches": {"url": "https://api.test.com", "watermark": "date_utc"}
+        }
+        mocks['extractor_instance'].extract.return_value = pd.DataFrame({
+            "id": ["1", "2", "3"],
+            "flight_number": [1, 2, 3],
+            "date_utc": ["2022-11-01T00:00:00.000Z", "2022-12-05T13:00:00.000Z", "2099-01-01T00:00:00.000Z"],
+        })
+
+        results = main.run_ingestion_engine(max_workers=1)
+
+        assert results == {"spacex_launches": True}
+        endpoint, column, watermark, rows = mocks['state_instance'].record_success.call_args.args
+        assert (endpoint, column, rows) == ("spacex_launches", "date_utc", 3)
+        assert watermark.isoformat() == "2022-12-05T13:00:00+00:00"
+
+    def test_watermark_not_recorded_when_load_fails(self, mock_all_dependencies, sample_spacex_df):
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            "spacex_launches": {"url": "https://api.test.com", "watermark": "date_utc"}
+        }
+        mocks['extractor_instance'].extract.return_value = sample_spacex_df
+        mocks['postgres_instance'].load_bronze.side_effect = Exception("disk full")
+
+        assert main.run_ingestion_engine(max_workers=1) == {"spacex_launches": False}
+        mocks['state_instance'].record_success.assert_not_called()
+
+    def test_empty_incremental_window_is_success(self, mock_all_dependencies):
+        import main
+
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {
+            "nasa_solar_events": {"url": "https://api.test.com", "watermark": "startTime"}
+        }
+        mocks['extractor_instance'].extract.return_value = pd.DataFrame()
+        mocks['extractor_instance'].unchanged = False
+
+        assert main.run_ingestion_engine(max_workers=1) == {"nasa_solar_events": True}
+        mocks['postgres_instance'].load_bronze.assert_not_called()
+        mocks['alert_instance'].notify_critical_failure.assert_not_called()
+        mocks['state_instance'].record_success.assert_called_once_with("nasa_solar_events", rows_loaded=0)
+
+class TestLandingZone:
+    """Landing zone Parquet: gravação durante a ingestão e recarga sem HTTP."""
+
+    @pytest.mark.parametrize("mode", ["concurrent", "pipeline"])
+    def test_ingestion_lands_batches_and_replay_reloads_them(
+        self, mock_all_dependencies, sample_spacex_df, monkeypatch, tmp_path, mode
+    ):
+        import main
+
+        pytest.importorskip("pyarrow")
+        monkeypatch.setenv("LANDING_ZONE", "true")
+        monkeypatch.setenv("LANDING_ZONE_PATH", str(tmp_path))
+        mocks = mock_all_dependencies
+        mocks['get_config'].return_value = {"spacex_launches": {"url": "https://api.test.com/launches"}}
+        mocks['extractor_instance'].extract.return_value = sample_spacex_df
+
+        assert main.run_ingestion_engine(max_workers=1, mode=mode) == {"spacex_launches": True}
+        assert len(list(tmp_path.glob("endpoint=spacex_launches/ingest_date=*/part-*.parquet"))) == 1
+
+        replayed = []
+        mocks['postgres_instance'].load_bronze.side_effect = lambda df, table_name, **kw: replayed.extend(df)
+        mocks['extractor_cls'].reset_mock()
+
+        assert main.run_landing_replay() == {"spacex_launches": True}
+        mocks['extractor_cls'].assert_not_called()
+        assert replayed[0]["id"].tolist() == sample_spacex_df["id"].tolist()
+        assert replayed[0]["source_endpoint"].eq("spacex_launches").all()
+        mocks['state_instance'].record_success.assert_called_once()
+
+    def test_landing_disabled_by_default(self, monkeypatch):
+        import main
+
+        monkeypatch.delenv("LANDING_ZONE", raising=False)
+
+        assert main.build_landing_zone() is None
+
+    def test_replay_skips_endpoints_without_files(self, mock_all_dependencies, monkeypatch, tmp_path, caplog):
+        import main
+
+        pytest.importorskip("pyarrow")
+        monkeypatch.setenv("LANDING_ZONE_PATH", str(tmp_path))
+        mock_all_dependencies['get_config'].return_value = {"spacex_launches": {"url": "u"}}
+
+        assert main.run_landing_replay() == {}
+        assert "Nenhum arquivo de spacex_launches" in caplog.text
+        mock_all_dependencies['postgres_instance'].load_bronze.assert_not_called()
+
+    def test_cli_arguments(self):
+        import main
+
+        args = main.parse_args(["--load-from-landing", "--ingest-date", "2026-10-17", "--endpoints", "a,b"])
+
+        assert args.load_from_landing is True
+        assert (args.ingest_date, args.endpoints) == ("2026-10-17", "a,b")
+        assert main.parse_args([]).load_from_landing is False
+
+
 # =============================================================================
 # TESTE: Execução como script principal
 # =============================================================================
@@ -0,0 +1,820 @@
+"""
+Testes das funções auxiliares de src/loaders/postgres_loader.py.
+Rigor: Sem banco real; a conexão DBAPI é simulada e o SQL/buffer gerado é inspecionado.
+"""
+
+import pytest
+import pandas as pd
+from unittest.mock import MagicMock
+from types import SimpleNamespace
+
+from src.loaders import postgres_loader
+
+# Classe real, capturada na coleta (o conftest substitui PostgresLoader por um mock)
+PostgresLoader = postgres_loader.PostgresLoader
+
+
+def _fake_sqla_connection():
+    """Simula a Connection do SQLAlchemy expondo o cursor psycopg2 em .connection."""
+    captured = {}
+    cursor = MagicMock()
+
+    def copy_expert(sql, buffer):
+        captured["sql"] = sql
+        captured["payload"] = buffer.read()
+
+    cursor.copy_expert.side_effect = copy_expert
+    cursor.__enter__.return_value = cursor
+    conn = MagicMock()
+    conn.connection.cursor.return_value = cursor
+    return conn, captured
+
+
+# =============================================================================
+# CLASSE: TestCopyInsert
+# =============================================================================
+
+class TestCopyInsert:
+    """Testes do método de inserção via COPY FROM STDIN."""
+
+    def test_copy_sql_targets_schema_and_columns(self):
+        conn, captured = _fake_sqla_connection()
+        table = SimpleNamespace(name="spacex_launches", schema="raw")
+
+        rows = postgres_loader.copy_insert(table, conn, ["id", "name"], iter([("1", "FalconSat")]))
+
+        assert rows == 1
+        assert captured["sql"] == (
+            'COPY "raw"."spacex_launches" ("id", "name") '
+            "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        )
+
+    def test_copy_payload_distinguishes_null_from_empty(self):
+        conn, captured = _fake_sqla_connection()
+        table = SimpleNamespace(name="t", schema=None)
+
+        postgres_loader.copy_insert(
+            table, conn, ["a", "b", "c"],
+            iter([("x", None, ""), ('com "aspas", e vírgula', 1.5, True)])
+        )
+
+        lines = captured["payload"].splitlines()
+        assert lines[0] == "x,\\N,"
+        assert lines[1] == '"com ""aspas"", e vírgula",1.5,True'
+        assert captured["sql"].startswith('COPY "t" ("a", "b", "c")')
+
+    def test_load_methods_registry(self):
+        assert postgres_loader.LOAD_METHODS["copy"] is postgres_loader.copy_insert
+        assert postgres_loader.LOAD_METHODS["insert"] is None
+
+
+# =============================================================================
+# CLASSE: TestLoadBronzeOptions
+# =============================================================================
+
+class TestLoadBronzeOptions:
+    """Validação dos parâmetros de load_bronze antes de qualquer acesso ao banco."""
+
+    @pytest.fixture
+    def loader(self, monkeypatch):
+        monkeypatch.setattr(postgres_loader, "create_engine", MagicMock())
+        return PostgresLoader()
+
+    def test_invalid_method_raises(self, loader):
+        with pytest.raises(ValueError, match="Método de carga inválido"):
+            loader.load_bronze(pd.DataFrame({"id": ["1"]}), "t", method="bulk")
+
+    def test_invalid_strategy_raises(self, loader):
+        with pytest.raises(ValueError, match="Estratégia de carga inválida"):
+            loader.load_bronze(pd.DataFrame({"id": ["1"]}), "t", strategy="drop")
+
+    def test_strategy_from_env(self, loader, monkeypatch):
+        monkeypatch.setenv("BRONZE_LOAD_STRATEGY", "truncate")
+        loader._load_truncate = MagicMock(return_value=("append", 1))
+        loader._load_staging = MagicMock()
+
+        loader.load_bronze(pd.DataFrame({"id": ["1"]}), "t")
+
+        loader._load_truncate.assert_called_once()
+        loader._load_staging.assert_not_called()
+
+
+    def test_chunks_add_late_columns(self, loader):
+        loader._write_frame = MagicMock()
+        loader._add_columns = MagicMock()
+        chunks = [
+            pd.DataFrame({"id": ["1"], "name": ["a"]}),
+            pd.DataFrame({"id": ["2"], "name": ["b"], "core.reused": [True]}),
+        ]
+
+        columns, rows, _ = loader._write_chunks(iter(chunks), "t", "replace", "copy")
+
+        assert columns == {"id": "text", "name": "text", "core.reused": "boolean"}
+        assert rows == 2
+        assert [c.args[2] for c in loader._write_frame.call_args_list] == ["replace", "append"]
+        assert list(loader._add_columns.call_args.args[1].columns) == ["core.reused"]
+
+    def test_load_bronze_accepts_chunk_generator(self, loader):
+        prepared = []
+        loader._load_staging = MagicMock(side_effect=lambda chunks, *args: prepared.extend(chunks))
+        loader._publish_swap = MagicMock(return_value=("swap-create", 3))
+        chunks = (pd.DataFrame({"id": [str(i)]}) for i in range(3))
+
+        loader.load_bronze(chunks, "t", strategy="swap")
+
+        assert len(prepared) == 3
+        assert len({c["loaded_at"].iloc[0] for c in prepared}) == 1
+
+    def test_stream_is_staged_before_the_publish_transaction(self, loader):
+        events = []
+
+        def source():
+            for i in range(2):
+                events.append("chunk")
+                yield pd.DataFrame({"id": [str(i)]})
+
+        def stage(chunks, *args):
+            rows = sum(len(c) for c in chunks)
+            events.append("staged")
+            return postgres_loader.StagedLoad('raw."t__staging"', {"id": "text"}, rows, {})
+
+        loader._load_staging = MagicMock(side_effect=stage)
+        loader._publish_swap = MagicMock(side_effect=lambda *args: events.append("publish") or ("swap-rename", 2))
+        loader._load_truncate = MagicMock(return_value=("append", 2))
+
+        loader.load_bronze(source(), "t", strategy="swap", maintenance=False)
+        loader.load_bronze(source(), "t", strategy="truncate", maintenance=False)
+
+        assert events == ["chunk", "chunk", "staged", "publish", "chunk", "chunk"]
+        assert loader._publish_swap.call_args.args[0].rows == 2
+        # truncate escreve direto na tabela final: os lotes chegam já materializados
+        assert isinstance(loader._load_truncate.call_args.args[0], list)
+
+    def test_swap_with_dependent_views_replaces_rows_without_blocking_readers(self, loader):
+        conn = MagicMock()
+        conn.execute.return_value.all.return_value = [("id", "text")]
+        loader._has_dependent_views = MagicMock(return_value=True)
+        loader._reconcile_staged = MagicMock()
+        loader._migrate_column_types = MagicMock()
+        staged = postgres_loader.StagedLoad('raw."t__staging"', {"id": "text"}, 1, {})
+
+        assert loader._publish_swap(staged, "t", False, conn) == ("swap-copy", 1)
+
+        statements = [str(c.args[0]) for c in conn.execute.call_args_list]
+        assert statements[-3:] == [
+            'DELETE FROM raw."t"',
+            'INSERT INTO raw."t" ("id") SELECT "id" FROM raw."t__staging"',
+            'DROP TABLE raw."t__staging"',
+        ]
+        assert not any(s.startswith(("LOCK", "TRUNCATE")) for s in statements)
+
+    def test_merge_reads_hashes_before_and_alters_target_only_on_publish(self, loader, monkeypatch):
+        staging_conn = loader.engine.connect.return_value.__enter__.return_value
+        staging_conn.execute.return_value.all.return_value = [("id", "text"), ("name", "text")]
+        read_sql = MagicMock(return_value=pd.DataFrame({"key": ["1"], "hash": [None]}))
+        monkeypatch.setattr(pd, "read_sql", read_sql)
+        loader._load_staging = MagicMock(side_effect=lambda chunks, *args: postgres_loader.StagedLoad(
+            'raw."t__staging"', {"id": "text", "name": "text"}, sum(len(c) for c in chunks), {}
+        ))
+        loader._reconcile_staged = MagicMock()
+        loader._migrate_column_types = MagicMock()
+        chunk = pd.DataFrame({"id": ["1", "2"], "name": ["a", "b"]})
+
+        stage = loader._stage_merge(iter([chunk]), "t", "copy", False, "id")
+
+        # Tabela anterior ao merge: só as chaves são lidas, sem DDL fora da publicação
+        assert "NULL::text AS hash" in str(read_sql.call_args.args[0])
+        assert not any("ALTER" in str(c.args[0]) for c in staging_conn.execute.call_args_list)
+        assert stage.stats == {"rows": 2, "inserted": 1, "changed": 2}
+
+        conn = MagicMock()
+        assert loader._publish_merge(stage, "t", False, "id", False, conn) == ("merge", 2)
+        statements = [str(c.args[0]) for c in conn.execute.call_args_list]
+        assert statements[0] == 'ALTER TABLE raw."t" ADD COLUMN IF NOT EXISTS _row_hash bigint'
+        assert any(s.startswith('INSERT INTO raw."t" ("id", "name") SELECT') for s in statements)
+        assert statements[-1] == 'DROP TABLE raw."t__staging"'
+
+    def test_sql_type_for(self):
+        assert postgres_loader.sql_type_for(pd.Series([1, 2])) == "bigint"
+        assert postgres_loader.sql_type_for(pd.Series([1.5])) == "double precision"
+        assert postgres_loader.sql_type_for(pd.Series([True])) == "boolean"
+        assert postgres_loader.sql_type_for(pd.Series(pd.to_datetime(["2022-01-01"]))) == "timestamp"
+        assert postgres_loader.sql_type_for(pd.Series(["x"])) == "text"
+
+
+# =============================================================================
+# CLASSE: TestRowHash
+# =============================================================================
+
+class TestRowHash:
+    """Testes do hash de conteúdo usado pelo modo merge."""
+
+    @pytest.fixture
+    def frame(self):
+        return pd.DataFrame({
+            "id": ["a", "b", "c"],
+            "name": ["FalconSat", "DemoSat", None],
+            "flight_number": [1, 2, 3],
+            "ingestion_timestamp": pd.Timestamp("2026-01-01"),
+        })
+
+    def test_hash_is_deterministic_and_order_independent(self, frame):
+        first = postgres_loader.compute_row_hash(frame)
+        reordered = postgres_loader.compute_row_hash(frame[frame.columns[::-1]])
+
+        assert first.dtype == "int64"
+        assert first.tolist() == reordered.tolist()
+        assert first.is_unique
+
+    def test_hash_ignores_audit_columns(self, frame):
+        later = frame.assign(ingestion_timestamp=pd.Timestamp("2026-06-01"), loaded_at=pd.Timestamp.now())
+        assert postgres_loader.compute_row_hash(frame).tolist() == postgres_loader.compute_row_hash(later).tolist()
+
+    def test_hash_detects_content_change(self, frame):
+        changed = frame.copy()
+        changed.loc[1, "name"] = "DemoSat 2"
+        before = postgres_loader.compute_row_hash(frame)
+        after = postgres_loader.compute_row_hash(changed)
+
+        assert (before != after).tolist() == [False, True, False]
+
+    def test_hash_independent_of_chunk_columns(self, frame):
+        """Coluna ausente num lote = coluna nula; 1.0 (int promovido por NaN) = 1."""
+        with_extra = frame.assign(extra=None)
+        as_float = frame.assign(flight_number=frame["flight_number"].astype(float))
+
+        base = postgres_loader.compute_row_hash(frame).tolist()
+        assert postgres_loader.compute_row_hash(with_extra).tolist() == base
+        assert postgres_loader.compute_row_hash(as_float).tolist() == base
+
+    def test_diff_row_hashes(self, frame):
+        df = frame.assign(_row_hash=postgres_loader.compute_row_hash(frame))
+        existing = pd.DataFrame({
+            "key": ["a", "b", "z"],
+            "hash": [str(df["_row_hash"][0]), "123", str(df["_row_hash"][2])],
+        })
+
+        changed, inserted = postgres_loader.diff_row_hashes(df, "id", existing)
+
+        assert changed.tolist() == [False, True, True]
+        assert inserted == 1
+
+    def test_diff_row_hashes_legacy_rows_without_hash(self, frame):
+        df = frame.assign(_row_hash=postgres_loader.compute_row_hash(frame))
+        existing = pd.DataFrame({"key": ["a", "b", "c"], "hash": [None, None, None]})
+
+        changed, inserted = postgres_loader.diff_row_hashes(df, "id", existing)
+
+        assert changed.all()
+        assert inserted == 0
+
+
+# =============================================================================
+# CLASSE: TestSerializeComplexColumns
+# =============================================================================
+
+class TestSerializeComplexColumns:
+    """Testes da serialização JSON de colunas com listas/dicts."""
+
+    @pytest.fixture
+    def loader(self, monkeypatch):
+        monkeypatch.setattr(postgres_loader, "create_engine", MagicMock())
+        return PostgresLoader()
+
+    @pytest.fixture
+    def frame(self):
+        return pd.DataFrame({
+            "id": ["a", "b", "c"],
+            "payloads": [["p1", "p2"], [], None],
+            "fairings": [{"reused": True}, None, {"reused": None, "ships": ["s1"]}],
+            "name": ["Órbita", None, "DemoSat"],
+            "flight_number": [1, 2, 3],
+        })
+
+    def test_detects_only_complex_object_columns(self, frame):
+        assert postgres_loader.complex_columns(frame) == ["payloads", "fairings"]
+
+    def test_declared_json_columns_skip_inspection(self, frame):
+        frame.attrs["json_columns"] = ["fairings", "ausente"]
+
+        assert postgres_loader.complex_columns(frame) == ["fairings", "payloads"]
+
+    def test_serializes_compact_json_and_keeps_nulls(self, loader, frame):
+        result = loader._serialize_complex_columns(frame)
+
+        assert result["payloads"].tolist() == ['["p1","p2"]', "[]", None]
+        assert result["fairings"].tolist() == ['{"reused":true}', None, '{"reused":null,"ships":["s1"]}']
+        assert result["name"].tolist() == ["Órbita", None, "DemoSat"]
+
+    def test_source_frame_is_not_modified(self, loader, frame):
+        result = loader._serialize_complex_columns(frame)
+
+        assert frame["payloads"][0] == ["p1", "p2"]
+        assert frame["fairings"][0] == {"reused": True}
+        assert result["id"].equals(frame["id"])
+
+    def test_marks_serialized_columns_for_jsonb(self, loader, frame):
+        result = loader._serialize_complex_columns(frame)
+
+        assert result.attrs["json_columns"] == ["payloads", "fairings"]
+        assert "json_columns" not in frame.attrs
+
+    def test_write_frame_maps_json_columns_to_jsonb(self, loader, frame, monkeypatch):
+        to_sql = MagicMock()
+        monkeypatch.setattr(pd.DataFrame, "to_sql", to_sql)
+
+        loader._write_frame(loader._serialize_complex_columns(frame), "t", "replace", "copy")
+        loader._write_frame(frame[["id"]], "t", "append", "copy")
+
+        dtype = to_sql.call_args_list[0].kwargs["dtype"]
+        assert sorted(dtype) == ["fairings", "payloads"]
+        assert all(isinstance(t, postgres_loader.SerializedJSONB) for t in dtype.values())
+        assert dtype["payloads"].bind_processor(None) is None
+        assert to_sql.call_args_list[1].kwargs["dtype"] is None
+
+    def test_late_json_column_added_as_jsonb(self, loader):
+        conn = MagicMock()
+        loader.engine = MagicMock()
+        loader.engine.begin.return_value.__enter__.return_value = conn
+        late = loader._serialize_complex_columns(pd.DataFrame({"ships": [["s1"]], "block": [5]}))
+
+        loader._add_columns("t", late)
+
+        statements = [str(c.args[0]) for c in conn.execute.call_args_list]
+        assert statements[0].endswith('"ships" jsonb')
+        assert statements[1].endswith('"block" bigint')
+
+    def test_write_chunks_migrates_legacy_text_columns_on_append(self, loader):
+        loader._write_frame = MagicMock()
+        loader._migrate_column_types = MagicMock()
+        chunk = loader._serialize_complex_columns(pd.DataFrame({"id": ["1"], "payloads": [["p"]]}))
+
+        loader._write_chunks(iter([chunk, chunk]), "t", "append", "copy")
+        loader._write_chunks(iter([chunk]), "novo", "replace", "copy")
+
+        loader._migrate_column_types.assert_called_once_with("t", {"payloads": "jsonb"}, con=None)
+
+    def test_stdlib_fallback_matches_orjson(self, monkeypatch, frame):
+        fast = [postgres_loader.dumps_json(v) for v in frame["fairings"].dropna()]
+        monkeypatch.setattr(postgres_loader, "orjson", None)
+
+        assert [postgres_loader.dumps_json(v) for v in frame["fairings"].dropna()] == fast
+        assert postgres_loader.dumps_json({1: "x"}) == '{"1":"x"}'
+
+    def test_create_table_uses_declared_types_and_not_null(self, loader):
+        conn = MagicMock()
+        frame = pd.DataFrame({"id": ["a"], "flight_number": [1], "ingested_at": [pd.Timestamp("2024-01-01")]})
+        frame.attrs.update(column_types={"id": "text", "flight_number": "bigint"}, not_null=["id"])
+
+        loader._create_table("t", frame, con=conn)
+
+        drop, create = [str(c.args[0]) for c in conn.execute.call_args_list]
+        assert drop == 'DROP TABLE IF EXISTS raw."t"'
+        assert create == ('CREATE TABLE raw."t" ("id" text NOT NULL, "flight_number" bigint, '
+                          '"ingested_at" timestamp)')
+
+
+class TestSchemaDrift:
+    """Drift de schema: ADD COLUMN, alargamento de tipo e conversão no lote, sem recriar a tabela."""
+
+    @pytest.mark.parametrize("existing, incoming, expected", [
+        ("bigint", "bigint", None),
+        ("text", "bigint", None),
+        ("double precision", "bigint", None),
+        ("timestamp without time zone", "timestamp", None),
+        ("timestamp with time zone", "timestamp", None),
+        ("bigint", "double precision", "double precision"),
+        ("bigint", "text", "text"),
+        ("boolean", "bigint", "text"),
+    ])
+    def test_widened_type(self, existing, incoming, expected):
+        assert postgres_loader.widened_type(existing, incoming) == expected
+
+    def test_coerces_integral_floats_and_all_null_columns(self):
+        table = {"flight": "bigint", "mass": "bigint", "fired_at": "timestamp without time zone",
+                 "cores": "jsonb", "name": "text"}
+        chunk = pd.DataFrame({"flight": [1.0, None], "mass": [1.5, 2.0], "fired_at": [None, None],
+                              "cores": [None, None], "name": [None, None]})
+
+        coerced_chunk, coerced = postgres_loader.coerce_to_table(chunk, table)
+
+        assert coerced == {"flight": "bigint", "fired_at": "timestamp without time zone", "cores": "jsonb"}
+        assert str(coerced_chunk["flight"].dtype) == "Int64"
+        assert str(coerced_chunk["fired_at"].dtype) == "datetime64[ns]"
+        assert coerced_chunk.attrs["json_columns"] == ["cores"]
+        assert chunk["flight"].dtype == "float64"
+
+    def test_declared_columns_are_left_to_migration(self):
+        drift = postgres_loader.diff_table_types("t", {"id": "text", "v": "bigint"},
+                                                 {"id": "bigint", "v": "text", "new": "jsonb"}, declared={"id"})
+
+        assert drift.added == {"new": "jsonb"}
+        assert drift.widened == {"v": "text"}
+
+    def test_append_reconciles_each_chunk(self, monkeypatch, caplog):
+        monkeypatch.setattr(postgres_loader, "create_engine", MagicMock())
+        loader = PostgresLoader()
+        loader._write_frame = MagicMock()
+        loader._add_columns = MagicMock()
+        loader._migrate_column_types = MagicMock()
+        chunk = pd.DataFrame({"id": ["1"], "flight": [2.0], "mass": [2.5], "details": ["x"], "webcast": ["u"]})
+
+        columns, _, _ = loader._write_chunks(
+            iter([chunk]), "t", "append", "copy",
+            known_columns={"id": "text", "flight": "bigint", "mass": "bigint", "details": "boolean"}
+        )
+
+        written = loader._write_frame.call_args.args[0]
+        assert str(written["flight"].dtype) == "Int64"
+        assert list(loader._add_columns.call_args.args[1].columns) == ["webcast"]
+        loader._migrate_column_types.assert_called_once_with(
+            "t", {"mass": "double precision", "details": "text"}, con=None
+        )
+        assert columns["mass"] == "double precision" and columns["webcast"] == "text"
+        assert '"coerced": {"flight": "bigint"}' in caplog.text
+
+
+class TestCatalogCache:
+    """Cache do catálogo: uma consulta por tabela até a DDL (ou falha) invalidá-la."""
+
+    @pytest.fixture
+    def conn(self):
+        conn = MagicMock()
+        conn.execute.return_value.all.return_value = [("id", "text"), ("flight_number", "bigint")]
+        return conn
+
+    def test_schema_created_once(self, conn):
+        catalog = postgres_loader.CatalogCache()
+
+        catalog.ensure_schema(conn)
+        catalog.ensure_schema(conn)
+
+        assert [str(c.args[0]) for c in conn.execute.call_args_list] == ['CREATE SCHEMA IF NOT EXISTS "raw"']
+
+    def test_columns_cached_until_invalidated(self, conn):
+        catalog = postgres_loader.CatalogCache()
+
+        assert catalog.columns(conn, "t") == {"id": "text", "flight_number": "bigint"}
+        catalog.columns(conn, "t")
+        assert conn.execute.call_count == 1
+
+        catalog.invalidate("t")
+        conn.execute.return_value.all.return_value = []
+        assert catalog.columns(conn, "t") is None
+        assert conn.execute.call_count == 2
+
+    def test_staging_tables_are_not_cached(self, conn):
+        catalog = postgres_loader.CatalogCache()
+
+        catalog.columns(conn, "t__staging")
+        catalog.columns(conn, "t__staging")
+
+        assert conn.execute.call_count == 2
+
+    def test_index_ensured_once_per_table_version(self, conn):
+        catalog = postgres_loader.CatalogCache()
+
+        for _ in range(2):
+            catalog.ensure_index(conn, "t", "t__id", "CREATE INDEX ...")
+        catalog.invalidate()
+        catalog.ensure_index(conn, "t", "t__id", "CREATE INDEX ...")
+
+        assert conn.execute.call_count == 2
+
+    def test_migration_skipped_when_cached_types_match(self, conn, monkeypatch):
+        monkeypatch.setattr(postgres_loader, "create_engine", MagicMock())
+        loader = PostgresLoader()
+        loader.catalog.columns(conn, "t")
+
+        loader._migrate_column_types("t", {"id": "text", "flight_number": "bigint", "nova": "jsonb"}, con=conn)
+
+        assert conn.execute.call_count == 1
+
+    def test_publish_runs_in_one_transaction_and_failure_invalidates(self, conn, monkeypatch):
+        def schema_statements(conn):
+            return sum(str(c.args[0]).startswith("CREATE SCHEMA") for c in conn.execute.call_args_list)
+
+        monkeypatch.setattr(postgres_loader, "create_engine", MagicMock())
+        loader = PostgresLoader()
+        loader.engine.begin.return_value.__enter__.return_value = conn
+        loader._load_staging = MagicMock(return_value=postgres_loader.StagedLoad('raw."t__staging"', {}, 1, {}))
+        loader._publish_swap = MagicMock(return_value=("swap-rename", 1))
+
+        loader.load_bronze(pd.DataFrame({"id": ["1"]}), "t", strategy="swap")
+        loader.load_bronze(pd.DataFrame({"id": ["1"]}), "t", strategy="swap")
+
+        # Por carga: schema commitado à parte + uma transação de publicação
+        assert loader.engine.begin.call_count == 4
+        assert all(c.args[-1] is conn for c in loader._publish_swap.call_args_list)
+        assert schema_statements(conn) == 1  # CREATE SCHEMA só na primeira carga
+
+        loader._publish_swap.side_effect = RuntimeError("tabela removida")
+        with pytest.raises(RuntimeError):
+            loader.load_bronze(pd.DataFrame({"id": ["1"]}), "t", strategy="swap")
+        loader._publish_swap.side_effect = None
+        loader.load_bronze(pd.DataFrame({"id": ["1"]}), "t", strategy="swap")
+        assert schema_statements(conn) == 2
+
+
+class TestHistoryStrategy:
+    """Modo history: tabela particionada por dia, view do lote atual e retenção."""
+
+    @pytest.fixture
+    def loader(self, monkeypatch):
+        monkeypatch.setattr(postgres_loader, "create_engine", MagicMock())
+        loader = PostgresLoader()
+        loader._write_frame = MagicMock()
+        return loader
+
+    @pytest.fixture
+    def conn(self):
+        conn = MagicMock()
+        # Tabela histórica ausente; depois do CREATE, o catálogo relê as colunas
+        conn.execute.return_value.all.side_effect = [
+            [], [("id", "text"), ("ingestion_timestamp", "timestamp without time zone"),
+                 ("loaded_at", "timestamp without time zone")],
+        ]
+        conn.execute.return_value.scalars.return_value.all.return_value = []
+        return conn
+
+    @staticmethod
+    def _statements(conn):
+        return [str(c.args[0]) for c in conn.execute.call_args_list]
+
+    def test_first_load_creates_partitioned_table_partitions_and_view(self, loader, conn):
+        loaded_at = pd.Timestamp("2026-10-17 12:00")
+        df = pd.DataFrame({"id": ["1", "2"], "ingestion_timestamp": pd.to_datetime(["2026-10-16 23:00", None]),
+                           "loaded_at": loaded_at})
+
+        mode, rows, latest = loader._load_history(iter([df]), "t", "copy", loaded_at, retention_days=0, con=conn)
+
+        statements = self._statements(conn)
+        assert (mode, rows, latest) == ("history-create", 2, loaded_at)
+        assert any(s.endswith('PARTITION BY RANGE ("ingestion_timestamp")') for s in statements)
+        assert 'CREATE TABLE IF NOT EXISTS raw."t_history_p20261016" PARTITION OF raw."t_history" ' \
+               "FOR VALUES FROM ('2026-10-16') TO ('2026-10-17')" in statements
+        assert any(s.startswith('CREATE TABLE IF NOT EXISTS raw."t_history_p20261017"') for s in statements)
+        assert 'CREATE OR REPLACE VIEW raw."t_current" AS SELECT * FROM raw."t_history" WHERE "ingestion_timestamp" = ' \
+               '(SELECT max("ingestion_timestamp") FROM raw."t_history")' in statements
+        written = loader._write_frame.call_args.args[0]
+        assert written["ingestion_timestamp"].tolist() == [pd.Timestamp("2026-10-16 23:00"), loaded_at]
+
+    def test_repeat_load_appends_without_ddl(self, loader, conn):
+        conn.execute.return_value.all.side_effect = None
+        conn.execute.return_value.all.return_value = [("id", "text"), ("loaded_at", "timestamp without time zone"),
+                                                      ("ingestion_timestamp", "timestamp without time zone")]
+        df = pd.DataFrame({"id": ["1"], "loaded_at": pd.Timestamp("2026-10-17")})
+
+        mode, _, _ = loader._load_history(iter([df]), "t", "copy", pd.Timestamp("2026-10-17 12:00"), 0, con=conn)
+
+        assert mode == "history"
+        assert loader._write_frame.call_args.args[2] == "append"
+        assert not any("VIEW" in s or "DROP" in s for s in self._statements(conn))
+
+    def test_retention_drops_only_expired_partitions(self, loader):
+        conn = MagicMock()
+        conn.execute.return_value.scalars.return_value.all.return_value = [
+            "t_history_p20261013", "t_history_p20261014", "t_history_p20261017", "t_history_manual",
+        ]
+
+        dropped = loader._prune_partitions("t_history", pd.Timestamp("2026-10-17"), 4, conn)
+
+        assert dropped == ["t_history_p20261013"]
+        assert self._statements(conn)[-1] == 'DROP TABLE raw."t_history_p20261013"'
+
+    def test_zero_retention_keeps_everything(self, loader):
+        conn = MagicMock()
+
+        assert loader._prune_partitions("t_history", pd.Timestamp("2026-10-17"), 0, conn) == []
+        conn.execute.assert_not_called()
+
+    def test_load_bronze_threads_retention_to_history(self, loader, monkeypatch):
+        monkeypatch.setenv("BRONZE_LOAD_STRATEGY", "history")
+        loader._load_history = MagicMock(return_value=("history", 1, pd.Timestamp("2026-10-17")))
+        loader._load_staging = MagicMock()
+
+        loader.load_bronze(pd.DataFrame({"id": ["1"]}), "t", retention_days=7)
+
+        assert loader._load_history.call_args.args[4] == 7
+        loader._load_staging.assert_not_called()
+
+    def test_retention_from_environment(self, loader, conn, monkeypatch):
+        monkeypatch.setenv("BRONZE_HISTORY_RETENTION_DAYS", "2")
+        loader._prune_partitions = MagicMock(return_value=[])
+        df = pd.DataFrame({"id": ["1"], "loaded_at": pd.Timestamp("2026-10-17")})
+
+        loader._load_history(iter([df]), "t", "copy", pd.Timestamp("2026-10-17"), con=conn)
+
+        assert loader._prune_partitions.call_args.args[1:3] == (pd.Timestamp("2026-10-17"), 2)
+
+
+class TestPostLoadMaintenance:
+    """Manutenção pós-carga: índices do schema bronze, ANALYZE e VACUUM agendado."""
+
+    @pytest.fixture
+    def loader(self, monkeypatch):
+        monkeypatch.setattr(postgres_loader, "create_engine", MagicMock())
+        return PostgresLoader()
+
+    @pytest.fixture
+    def conn(self):
+        conn = MagicMock()
+        conn.execute.return_value.all.return_value = [("id", "text"), ("date_utc", "timestamp"), ("rocket", "text")]
+        conn.execute.return_value.scalars.return_value.all.return_value = ["id"]
+        return conn
+
+    def test_creates_missing_indexes_and_analyzes(self, loader, conn):
+        report = loader._maintain("t", ["id", "date_utc", "rocket", "startTime"], conn)
+
+        statements = [str(c.args[0]) for c in conn.execute.call_args_list]
+        assert report.created_indexes == ["t__date_utc", "t__rocket"]
+        assert 'CREATE INDEX IF NOT EXISTS "t__date_utc" ON raw."t" ("date_utc")' in statements
+        assert not any('"t__id"' in s for s in statements)
+        assert statements[-1] == 'ANALYZE raw."t"'
+        assert set(report.to_dict()["seconds"]) == {"indexes", "analyze"}
+
+    def test_indexes_verified_once_per_table_version(self, loader, conn):
+        loader._maintain("t", ["id", "date_utc"], conn)
+        conn.reset_mock()
+
+        report = loader._maintain("t", ["id", "date_utc"], conn)
+
+        assert report.created_indexes == []
+        assert [str(c.args[0]) for c in conn.execute.call_args_list] == ['ANALYZE raw."t"']
+
+    def test_load_bronze_maintains_parent_and_children(self, loader, conn):
+        loader.engine.begin.return_value.__enter__.return_value = conn
+        loader._load_history = MagicMock(return_value=("history", 1, pd.Timestamp("2026-10-17")))
+        loader._load_child = MagicMock()
+        loader._maintain = MagicMock(return_value=postgres_loader.MaintenanceReport("t", [], {}))
+        df = pd.DataFrame({"id": ["5eb87cd9ffd86e000604b32a"], "payloads": [["p"]]})
+
+        loader.load_bronze(df, "spacex_launches", strategy="history", schema="spacex_launches")
+
+        calls = [c.args[:2] for c in loader._maintain.call_args_list]
+        assert calls[0] == ("spacex_launches_history", ["id", "date_utc", "rocket"])
+        assert [c[0] for c in calls[1:]] == [
+            "spacex_launch_payloads_history", "spacex_launch_cores_history", "spacex_launch_failures_history"
+        ]
+
+    def test_maintenance_can_be_disabled(self, loader, monkeypatch):
+        monkeypatch.setenv("BRONZE_MAINTENANCE", "false")
+        loader._load_staging = MagicMock()
+        loader._publish_swap = MagicMock(return_value=("swap-rename", 1))
+        loader._maintain = MagicMock()
+
+        loader.load_bronze(pd.DataFrame({"id": ["1"]}), "t", strategy="swap")
+
+        loader._maintain.assert_not_called()
+
+    def test_vacuum_runs_only_when_due_and_outside_the_transaction(self, loader):
+        conn = loader.engine.connect.return_value.__enter__.return_value
+        conn.execute.return_value.scalar.side_effect = [True, False]
+        reports = [postgres_loader.MaintenanceReport(t, [], {}) for t in ("a", "b")]
+
+        loader._vacuum(reports, 24)
+
+        conn.execution_options.assert_called_once_with(isolation_level="AUTOCOMMIT")
+        assert [str(c.args[0]) for c in conn.execute.call_args_list].count('VACUUM raw."a"') == 1
+        assert "vacuum" in reports[0].seconds and "vacuum" not in reports[1].seconds
+
+
+class TestParallelCopy:
+    """Modo parallel: staging carregado em shards, serializados em processos e copiados em paralelo."""
+
+    @pytest.fixture
+    def loader(self, monkeypatch):
+        monkeypatch.setattr(postgres_loader, "create_engine", MagicMock())
+        return PostgresLoader()
+
+    def test_shard_payload_matches_copy_insert(self):
+        df = pd.DataFrame({"a": ["x", None, 'com "aspas", e vírgula'], "b": [None, 1.5, 2.0],
+                           "c": ["", "y", None], "d": pd.array([True, None, False], dtype="boolean")})
+        conn, captured = _fake_sqla_connection()
+        postgres_loader.copy_insert(SimpleNamespace(name="t", schema=None), conn, list(df.columns),
+                                    iter(df.astype(object).where(df.notna(), None).itertuples(index=False)))
+
+        payload, arrow = postgres_loader.serialize_copy_shard(df)
+
+        assert arrow is False
+        assert payload.decode().splitlines() == captured["payload"].splitlines()
+
+    def test_large_batches_are_split_across_shards(self, loader, monkeypatch):
+        from concurrent.futures import ThreadPoolExecutor
+        monkeypatch.setattr(postgres_loader, "COPY_SHARD_ROWS", 4)
+        monkeypatch.setenv("BRONZE_COPY_WORKERS", "3")
+        loader._serializer_pool = lambda: ThreadPoolExecutor(1)
+        loader._copy_shard = MagicMock(side_effect=lambda table, columns, payload: payload.result()[0].count(b"\n"))
+        con = MagicMock()
+
+        with ThreadPoolExecutor(3) as copiers:
+            rows = loader._copy_sharded(pd.DataFrame({"id": [str(i) for i in range(10)]}), "t__staging",
+                                        "append", "parallel", con, copiers=copiers)
+
+        assert rows == 10
+        con.commit.assert_called_once()
+        assert [c.args[0] for c in loader._copy_shard.call_args_list] == ["t__staging"] * 3
+
+    def test_small_batches_use_the_coordinator_connection(self, loader):
+        loader._write_frame = MagicMock()
+        loader._serializer_pool = MagicMock()
+        con = MagicMock()
+
+        loader._copy_sharded(pd.DataFrame({"id": ["1"]}), "t__staging", "append", "parallel", con)
+
+        loader._write_frame.assert_called_once()
+        assert loader._write_frame.call_args.args[4] is con
+        loader._serializer_pool.assert_not_called()
+
+    def test_staging_is_sharded_only_in_parallel_mode(self, loader):
+        admin = loader.engine.connect.return_value.__enter__.return_value
+        admin.execute.return_value.all.return_value = []
+        loader._write_frame = MagicMock()
+        loader._write_chunks = MagicMock(return_value=({"id": "text"}, 1, {}))
+
+        for method in ("parallel", "copy"):
+            staged = loader._load_staging(iter([pd.DataFrame({"id": ["1"]})]), "t", method, False)
+            assert staged == ('raw."t__staging"', {"id": "text"}, 1, {})
+
+        parallel, copy = loader._write_chunks.call_args_list
+        assert parallel.kwargs["write"].func == loader._copy_sharded
+        assert copy.kwargs["write"] is None
+        assert parallel.kwargs["con"] is admin and admin.commit.call_count == 2
+        loader.engine.begin.assert_not_called()
+
+    def test_pool_sized_for_concurrent_loads_and_shards(self, monkeypatch):
+        monkeypatch.setenv("BRONZE_COPY_WORKERS", "4")
+
+        assert postgres_loader.pool_settings() == {"pool_size": 5, "max_overflow": 10}
+        assert postgres_loader.pool_settings(8) == {"pool_size": 8, "max_overflow": 32}
+
+        create_engine = MagicMock()
+        monkeypatch.setattr(postgres_loader, "create_engine", create_engine)
+        PostgresLoader(concurrent_loads=8)
+        assert create_engine.call_args.kwargs == {"pool_size": 8, "max_overflow": 32}
+
+    def test_close_shuts_down_serializers_and_pool(self, loader):
+        serializers = MagicMock()
+        loader._serializers = serializers
+
+        loader.close()
+        loader.close()
+
+        serializers.shutdown.assert_called_once()
+        assert loader._serializers is None
+        assert loader.engine.dispose.call_count == 2
+
+    def test_schema_committed_before_the_load_transaction(self, loader):
+        conn = MagicMock()
+        loader.engine.begin.return_value.__enter__.return_value = conn
+        loader._load_staging = MagicMock()
+        loader._publish_swap = MagicMock(return_value=("swap-rename", 1))
+
+        loader.load_bronze(pd.DataFrame({"id": ["1"]}), "t", method="parallel", strategy="swap", maintenance=False)
+
+        assert loader.engine.begin.call_count == 2
+        assert str(conn.execute.call_args_list[0].args[0]) == 'CREATE SCHEMA IF NOT EXISTS "raw"'
+
+
+class TestArrowCopy:
+    """Testes do COPY de lotes com colunas Arrow (DATAFRAME_BACKEND=pyarrow)."""
+
+    @pytest.fixture
+    def frame(self):
+        pa = pytest.importorskip("pyarrow")
+        return pd.DataFrame({
+            "id": pd.Series(["a", "", None], dtype=pd.ArrowDtype(pa.string())),
+            "flight_number": pd.Series([1, None, 3], dtype=pd.ArrowDtype(pa.int64())),
+            "payloads": ['["p1"]', None, "[]"],
+            "loaded_at": pd.to_datetime(["2024-01-01 00:00:00.123456789"] * 3),
+        })
+
+    def test_detects_arrow_frames(self, frame):
+        assert postgres_loader.uses_arrow(frame)
+        assert not postgres_loader.uses_arrow(pd.DataFrame({"id": ["a"]}))
+
+    def test_csv_keeps_null_distinct_from_empty_string(self, frame):
+        payload = b"".join(b.getvalue() for b in postgres_loader.arrow_csv_batches(frame)).decode()
+
+        assert payload.splitlines() == [
+            '"a",1,"[""p1""]",2024-01-01 00:00:00.123456',
+            '"",,,2024-01-01 00:00:00.123456',
+            ',3,"[]",2024-01-01 00:00:00.123456',
+        ]
+
+    def test_batches_respect_row_limit(self, frame):
+        assert len(list(postgres_loader.arrow_csv_batches(frame, batch_rows=2))) == 2
+
+    def test_write_frame_copies_arrow_frames_without_to_sql(self, frame, monkeypatch):
+        monkeypatch.setattr(postgres_loader, "create_engine", MagicMock())
+        loader = PostgresLoader()
+        conn, captured = _fake_sqla_connection()
+        to_sql = MagicMock()
+        monkeypatch.setattr(pd.DataFrame, "to_sql", to_sql)
+
+        loader._write_frame(frame, "t", "append", "copy", con=conn)
+
+        to_sql.assert_not_called()
+        assert captured["sql"] == ('COPY raw."t" ("id", "flight_number", "payloads", "loaded_at") '
+                                   'FROM STDIN WITH (FORMAT csv)')
+        assert captured["payload"].startswith(b'"a",1')
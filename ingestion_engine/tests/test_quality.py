@@ -0,0 +1,152 @@
+"""
+Testes do motor de qualidade (src/models/quality.py).
+Rigor: Cada tipo de regra é verificado isoladamente; o relatório precisa trazer
+contagens, severidade e tempo por regra para o preflight decidir pela carga.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.quality import (
+    ERROR, QUALITY_RULES, WARNING, NotNull, OneOf, ParsesAsTimestamp, Pattern,
+    QualityEngine, Range, Required, Unique
+)
+from src.models.schemas import BRONZE_SCHEMAS
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({
+        "id": ["5eb87cd9ffd86e000604b32a", "5eb87cd9ffd86e000604b32b", "x", None],
+        "flight_number": [1, 2, -3, "abc"],
+        "date_utc": ["2006-03-24T22:30:00.000Z", "ontem", None, "2008-09-28T23:15:00.000Z"],
+        "status": ["active", "lost", "??", None],
+    })
+
+
+def _result(report, kind):
+    return next(r for r in report.results if r.kind == kind)
+
+
+class TestRules:
+
+    @pytest.mark.parametrize("rule, failed", [
+        (NotNull("id"), 1),
+        (Pattern("id", r"[0-9a-f]{24}"), 1),
+        (Range("flight_number", min=1), 2),
+        (ParsesAsTimestamp("date_utc"), 1),
+        (OneOf("status", ["active", "lost"]), 1),
+    ])
+    def test_counts_violations(self, frame, rule, failed):
+        report = QualityEngine([rule], sample_rows=0).validate(frame, "t")
+
+        assert report.results[0].failed == failed
+        assert report.results[0].checked == 4
+        assert report.passed is False
+
+    def test_unique_counts_every_duplicate_and_ignores_nulls(self):
+        df = pd.DataFrame({"id": ["a", "b", "a", None, None]})
+
+        report = QualityEngine([Unique("id")], sample_rows=0).validate(df)
+
+        assert report.results[0].failed == 2
+
+    def test_rule_is_abstract(self):
+        from src.models.quality import Rule
+
+        with pytest.raises(TypeError):
+            Rule("id")
+
+    def test_unique_is_checked_per_frame(self):
+        # Streaming: cada lote é validado sozinho; repetições entre lotes não aparecem
+        first, second = pd.DataFrame({"id": ["a", "b"]}), pd.DataFrame({"id": ["a"]})
+        engine = QualityEngine([Unique("id")], sample_rows=0)
+
+        assert [engine.validate(df).results[0].failed for df in (first, second)] == [0, 0]
+
+    def test_typed_timestamps_pass_directly(self):
+        df = pd.DataFrame({"date_utc": pd.to_datetime(["2020-01-01", None])})
+
+        report = QualityEngine([ParsesAsTimestamp("date_utc")], sample_rows=0).validate(df)
+
+        assert report.results[0].failed == 0
+
+    def test_max_ratio_tolerates_violations(self, frame):
+        report = QualityEngine([NotNull("id", max_ratio=0.25)], sample_rows=0).validate(frame)
+
+        assert report.results[0].passed is True
+        assert report.results[0].ratio == 0.25
+
+
+class TestQualityEngine:
+
+    def test_warnings_do_not_fail_the_report(self, frame):
+        rules = [NotNull("id", severity=WARNING, description="IDs nulos"), Required(["id", "date_utc"])]
+
+        report = QualityEngine(rules, sample_rows=0).validate(frame, "spacex_launches")
+
+        assert report.passed is True
+        assert [r.rule for r in report.failures] == ["IDs nulos"]
+        assert report.failures[0].message.startswith("IDs nulos: 1 de 4")
+
+    def test_missing_required_columns_fail(self, frame):
+        report = QualityEngine([Required(["id", "rocket"])], sample_rows=0).validate(frame)
+
+        assert report.passed is False
+        assert _result(report, "required").message == "Colunas ausentes: ['rocket']"
+
+    def test_rules_on_absent_columns_are_skipped(self, frame):
+        report = QualityEngine([NotNull("rocket")], sample_rows=0).validate(frame)
+
+        assert report.results == []
+        assert report.passed is True
+
+    def test_empty_frame_fails(self):
+        report = QualityEngine([NotNull("id")], sample_rows=0).validate(pd.DataFrame())
+
+        assert report.passed is False
+        assert _result(report, "not_empty").severity == ERROR
+
+    def test_report_has_per_rule_timings(self, frame):
+        report = QualityEngine([NotNull("id"), Unique("id")], sample_rows=0).validate(frame, "t")
+        data = report.to_dict()
+
+        assert data["endpoint"] == "t" and data["sampled"] is False
+        assert [r["kind"] for r in data["rules"]] == ["not_null", "unique"]
+        assert all(r["seconds"] >= 0 for r in data["rules"])
+
+    def test_sampled_mode_checks_a_fixed_size_sample(self):
+        df = pd.DataFrame({"id": np.arange(10_000), "flight_number": np.where(np.arange(10_000) % 10, 1, -1)})
+
+        report = QualityEngine([Range("flight_number", min=0, max_ratio=0.2)], sample_rows=500).validate(df)
+
+        assert report.sampled is True
+        assert (report.rows, report.checked_rows) == (10_000, 500)
+        assert 0.05 < report.results[0].ratio < 0.15
+
+    def test_arrow_backed_frames(self, frame):
+        from src.transformers.flattener import CompiledFlattener
+        arrow = CompiledFlattener([("id", "string"), ("flight_number", "int"), ("status", "string")],
+                                  backend="pyarrow")(frame.to_dict("records"))
+        rules = [Pattern("id", r"[0-9a-f]{24}"), Range("flight_number", min=1), Unique("id"),
+                 OneOf("status", ["active", "lost"])]
+
+        report = QualityEngine(rules, sample_rows=0).validate(arrow)
+
+        assert [r.failed for r in report.results] == [1, 1, 0, 1]
+
+    def test_sample_rows_from_environment(self, monkeypatch):
+        monkeypatch.setenv("QUALITY_SAMPLE_ROWS", "7")
+
+        assert QualityEngine([]).sample_rows == 7
+
+
+class TestRegistry:
+
+    @pytest.mark.parametrize("name", sorted(QUALITY_RULES))
+    def test_rule_columns_exist_in_bronze_schema(self, name):
+        columns = set(BRONZE_SCHEMAS[name].column_types)
+
+        for rule in QUALITY_RULES[name]:
+            assert set(getattr(rule, "columns", [getattr(rule, "column", None)])) <= columns
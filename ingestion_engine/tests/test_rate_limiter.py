@@ -0,0 +1,140 @@
+"""
+Testes do limitador de taxa por host (src/utils/rate_limiter.py).
+Rigor: Relógio e sleep simulados; nenhum teste espera de verdade.
+"""
+
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+from src.utils.rate_limiter import (
+    RateLimitExceeded, TokenBucket, get_rate_limiter, parse_retry_after, rate_limit_stats
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+def _response(status_code=200, **headers):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers
+    return response
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def bucket(clock):
+    return TokenBucket("api.test.com", rate_per_second=2, burst=2, window_seconds=3600,
+                       max_wait=60, clock=clock, sleep=clock.sleep)
+
+
+class TestTokenBucket:
+
+    def test_burst_then_paced(self, bucket, clock):
+        waits = [bucket.acquire() for _ in range(4)]
+
+        assert waits == [0.0, 0.0, 0.5, 0.5]
+        assert bucket.stats()["throttled"] == 2
+        assert bucket.stats()["waited_seconds"] == 1.0
+
+    def test_learns_quota_from_headers(self, bucket, clock):
+        bucket.acquire()
+        bucket.observe(_response(**{"X-RateLimit-Limit": "3600", "X-RateLimit-Remaining": "0"}))
+
+        # 3600/h = 1 token/s; saldo zerado pela API
+        assert bucket.acquire() == 1.0
+        assert bucket.stats()["rate_per_second"] == 1.0
+
+    def test_remaining_discounts_requests_in_flight(self, bucket, clock):
+        bucket.acquire()
+        bucket.acquire()
+        bucket.observe(_response(**{"X-RateLimit-Limit": "3600", "X-RateLimit-Remaining": "1"}))
+
+        # Uma requisição ainda em voo consome o único token restante
+        assert bucket.acquire() == 1.0
+
+    def test_retry_after_blocks_all_callers(self, bucket, clock):
+        bucket.acquire()
+        bucket.observe(_response(status_code=429, **{"Retry-After": "7"}))
+
+        assert bucket.acquire() == 7.0
+
+    def test_max_wait_raises(self, bucket, clock):
+        bucket.acquire()
+        bucket.observe(_response(status_code=429, **{"Retry-After": "120"}))
+
+        with pytest.raises(RateLimitExceeded, match="esgotada"):
+            bucket.acquire()
+
+    def test_call_retries_after_429(self, bucket, clock):
+        send = Mock(side_effect=[_response(429, **{"Retry-After": "3"}), _response(200)])
+
+        response = bucket.call(send)
+
+        assert response.status_code == 200
+        assert send.call_count == 2
+        assert clock.sleeps == [3.0]
+
+    def test_call_returns_last_429_after_retries(self, bucket):
+        send = Mock(return_value=_response(429, **{"Retry-After": "0"}))
+
+        assert bucket.call(send, retries=2).status_code == 429
+        assert send.call_count == 3
+
+    def test_call_releases_slot_on_error(self, bucket):
+        with pytest.raises(ConnectionError):
+            bucket.call(Mock(side_effect=ConnectionError("reset")))
+
+        assert bucket._in_flight == 0
+
+
+class TestRegistry:
+
+    def test_parse_retry_after(self):
+        now = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+        assert parse_retry_after("5") == 5
+        assert parse_retry_after("Thu, 01 Jan 2026 12:00:30 GMT", now=now) == 30.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+    def test_limiter_shared_per_host(self):
+        a = get_rate_limiter("https://api.nasa.gov/DONKI/CME")
+        b = get_rate_limiter("https://api.nasa.gov/DONKI/FLR")
+        c = get_rate_limiter("https://api.spacexdata.com/v4/launches")
+
+        assert a is b
+        assert a is not c
+        assert set(rate_limit_stats()) >= {"api.nasa.gov", "api.spacexdata.com"}
+
+    @patch('src.extractors.concrete_extractors.requests.Session.get')
+    def test_extractor_waits_and_retries_on_429(self, mock_get, clock):
+        from src.extractors.concrete_extractors import APIExtractor
+
+        ok = _response(200)
+        ok.json.return_value = [{"id": "a"}]
+        ok.content = b'[{"id": "a"}]'
+        ok.raise_for_status.return_value = None
+        mock_get.side_effect = [_response(429, **{"Retry-After": "2"}), ok]
+        limiter = TokenBucket("api.test.com", clock=clock, sleep=clock.sleep)
+
+        result = APIExtractor("test", "https://api.test.com", rate_limiter=limiter).extract()
+
+        assert len(result) == 1
+        assert clock.sleeps == [2.0]
+        assert limiter.stats()["requests"] == 2
@@ -0,0 +1,89 @@
+"""
+Testes do registro de schemas bronze (src/models/schemas.py e SchemaFactory).
+Rigor: Tipos, conversões e NOT NULL precisam chegar ao DataFrame via attrs,
+que é o contrato lido pelo PostgresLoader para gerar o DDL.
+"""
+
+import pandas as pd
+import pytest
+
+from src.models.schemas import BRONZE_SCHEMAS, Field, TableSchema
+from src.models.schema_factory import SchemaFactory
+
+
+SCHEMA = TableSchema("t", [
+    Field("id", "string", nullable=False),
+    Field("flight_number", "int"),
+    Field("success", "bool"),
+    Field("date_utc", "timestamp"),
+    Field("first_flight", "date"),
+    Field("links.webcast", "string", "webcast"),
+], overflow="_extra")
+
+
+class TestTableSchema:
+
+    def test_column_types_and_not_null(self):
+        assert SCHEMA.column_types == {
+            "id": "text", "flight_number": "bigint", "success": "boolean",
+            "date_utc": "timestamp without time zone", "first_flight": "date",
+            "webcast": "text", "_extra": "jsonb",
+        }
+        assert SCHEMA.not_null == ["id"]
+
+    def test_apply_converts_untyped_columns(self):
+        df = pd.DataFrame({
+            "id": ["a", "b"],
+            "flight_number": ["1", None],
+            "success": [True, None],
+            "date_utc": ["2020-01-01T03:00:00-03:00", "2020-01-02T00:00:00.000Z"],
+            "first_flight": ["2010-06-04", None],
+        })
+
+        result = SCHEMA.apply(df)
+
+        assert str(result["flight_number"].dtype) == "Int64"
+        assert str(result["success"].dtype) == "boolean"
+        assert result["date_utc"].tolist() == [pd.Timestamp("2020-01-01 06:00"), pd.Timestamp("2020-01-02")]
+        assert result["date_utc"].dt.tz is None
+        assert result["first_flight"][0] == pd.Timestamp("2010-06-04")
+        assert df["flight_number"].tolist() == ["1", None]
+
+    def test_apply_drops_rows_violating_not_null(self):
+        df = pd.DataFrame({"id": ["a", None, "c"], "flight_number": [1, 2, 3]})
+
+        result = SCHEMA.apply(df)
+
+        assert result["id"].tolist() == ["a", "c"]
+        assert result.attrs["not_null"] == ["id"]
+        assert result.attrs["column_types"]["flight_number"] == "bigint"
+
+    def test_invalid_field_type_rejected(self):
+        with pytest.raises(ValueError, match="Tipo de campo inválido"):
+            TableSchema("t", [Field("id", "uuid")])
+
+    def test_version_changes_with_the_contract(self):
+        base = TableSchema("t", [Field("id", "string")])
+
+        assert base.version == TableSchema("t", [Field("id", "string")]).version
+        assert base.version != TableSchema("t", [Field("id", "string"), Field("n", "int")]).version
+        assert base.version != TableSchema("t", [Field("id", "string")], indexes=["id"]).version
+        assert BRONZE_SCHEMAS["spacex_rockets"].version != BRONZE_SCHEMAS["spacex_cores"].version
+
+    def test_index_on_undeclared_column_rejected(self):
+        with pytest.raises(ValueError, match="Índice em coluna não declarada"):
+            TableSchema("t", [Field("id", "string")], indexes=["startTime"])
+
+
+class TestSchemaFactoryRegistry:
+
+    @pytest.mark.parametrize("name", sorted(BRONZE_SCHEMAS))
+    def test_registered_schemas_have_not_null_key(self, name):
+        schema = SchemaFactory.get_table_schema(name)
+
+        assert schema.name == name
+        assert schema.not_null
+
+    def test_unknown_schema(self):
+        with pytest.raises(ValueError, match="não registrado"):
+            SchemaFactory.get_table_schema("spacex_starlink")
@@ -0,0 +1,87 @@
+"""
+Testes do estado de ingestão (src/loaders/state_store.py).
+Rigor: Sem banco real; o engine é simulado e o SQL gerado é inspecionado. O watermark
+dirige a carga incremental: ele só pode avançar (GREATEST) e só depois de uma carga
+bem-sucedida.
+"""
+
+import datetime
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.loaders.state_store import IngestionStateStore
+
+
+@pytest.fixture
+def engine():
+    engine = MagicMock()
+    conn = MagicMock()
+    engine.begin.return_value.__enter__.return_value = conn
+    engine.connect.return_value.__enter__.return_value = conn
+    engine.conn = conn
+    return engine
+
+
+def _statements(conn):
+    return [" ".join(str(c.args[0]).split()) for c in conn.execute.call_args_list]
+
+
+class TestIngestionStateStore:
+
+    def test_missing_table_is_created_once(self, engine):
+        engine.conn.execute.return_value.all.return_value = []
+        store = IngestionStateStore(engine)
+
+        assert store.get_watermarks() == {}
+        store.get_watermarks()
+
+        statements = _statements(engine.conn)
+        assert statements[0] == "CREATE SCHEMA IF NOT EXISTS raw"
+        assert sum(s.startswith('CREATE TABLE IF NOT EXISTS raw."_ingestion_state"') for s in statements) == 1
+
+    def test_get_watermarks_returns_only_incremental_endpoints(self, engine):
+        watermark = datetime.datetime(2026, 10, 1, tzinfo=datetime.timezone.utc)
+        engine.conn.execute.return_value.all.return_value = [("nasa_solar_events", watermark)]
+
+        assert IngestionStateStore(engine).get_watermarks() == {"nasa_solar_events": watermark}
+        assert _statements(engine.conn)[-1].endswith("WHERE watermark IS NOT NULL")
+
+    def test_record_success_never_regresses_the_watermark(self, engine):
+        watermark = datetime.datetime(2026, 10, 1, tzinfo=datetime.timezone.utc)
+
+        IngestionStateStore(engine).record_success("nasa_solar_events", "startTime", watermark, 10)
+
+        upsert = _statements(engine.conn)[-1]
+        params = engine.conn.execute.call_args.args[1]
+        assert "watermark = GREATEST(s.watermark, EXCLUDED.watermark)" in upsert
+        assert "watermark_column = COALESCE(EXCLUDED.watermark_column, s.watermark_column)" in upsert
+        assert params == {"endpoint": "nasa_solar_events", "column": "startTime",
+                          "watermark": watermark, "rows": 10}
+
+    def test_unchanged_run_keeps_the_previous_watermark(self, engine):
+        IngestionStateStore(engine).record_success("spacex_cores", rows_loaded=0)
+
+        assert engine.conn.execute.call_args.args[1]["watermark"] is None
+
+    def test_failed_write_propagates_and_rolls_back(self, engine):
+        store = IngestionStateStore(engine)
+        store._ensure_table()
+        engine.conn.execute.side_effect = RuntimeError("conexão perdida")
+
+        with pytest.raises(RuntimeError):
+            store.record_success("nasa_solar_events", "startTime", datetime.datetime(2026, 10, 2), 5)
+
+        # A exceção chega ao engine.begin(): a transação do upsert é desfeita
+        exc_type = engine.begin.return_value.__exit__.call_args.args[0]
+        assert exc_type is RuntimeError
+
+    def test_failed_table_creation_is_retried(self, engine):
+        store = IngestionStateStore(engine)
+        engine.conn.execute.side_effect = [RuntimeError("sem permissão"), None, None]
+
+        with pytest.raises(RuntimeError):
+            store._ensure_table()
+        store._ensure_table()
+
+        assert store._ready is True
@@ -1,84 +1,576 @@
 import os
+import argparse
 import datetime
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 from dotenv import load_dotenv
 from config import endpoints
 from config.endpoints import get_endpoints_config
-from src.extractors.concrete_extractors import APIExtractor
-from src.loaders.postgres_loader import PostgresLoader
+from src.extractors.concrete_extractors import APIExtractor, DateWindowExtractor, PaginatedQueryExtractor
+from src.loaders.http_cache_store import PostgresHttpCache
+from src.loaders.landing_zone import ParquetLandingZone, landing_enabled
+from src.loaders.postgres_loader import LOADER_VERSION, PostgresLoader
+from src.loaders.state_store import IngestionStateStore
+from src.models.quality import ERROR, QualityEngine
+from src.models.schema_factory import SchemaFactory
+from src.transformers.flattener import build_flattener
+from src.utils.http_cache import HttpCache
+from src.utils.http_session import get_connection_manager
 from src.utils.logger import get_logger
 from src.utils.notifications import AlertSystem
+from src.utils.rate_limiter import rate_limit_stats
 
 
 load_dotenv()
 logger = get_logger("MainOrchestrator")
 
+# Paralelismo padrão: a ingestão é dominada por espera de rede, não por CPU.
+DEFAULT_MAX_WORKERS = 4
+# Profundidade da fila extract -> load no modo pipeline (limita DataFrames em memória).
+DEFAULT_QUEUE_SIZE = 2
+_PIPELINE_DONE = object()
+# Marcador de "origem inalterada" (304 / mesmo corpo): endpoint ok, sem normalização nem carga.
+UNCHANGED = object()
+
 def preflight_check(df: pd.DataFrame, endpoint_name: str) -> bool:
     """
     Rigor: Valida se o DataFrame atende aos critérios mínimos de qualidade.
+    As regras do endpoint (src/models/quality.QUALITY_RULES) rodam num único passe
+    vetorizado; violações de severidade "error" abortam a carga, "warning" só são registradas.
+    """
+    engine = QualityEngine(SchemaFactory.get_quality_rules(endpoint_name))
+    report = engine.validate(df, endpoint_name)
+
+    for result in report.failures:
+        if result.kind == "not_empty":
+            logger.warning(f"Check Falhou: {endpoint_name} está vazio.")
+        elif result.severity == ERROR:
+            logger.error(f"Contrato violado em {endpoint_name}. {result.message}")
+        else:
+            logger.warning(f"Qualidade em {endpoint_name}: {result.message}. Procedendo com cautela.")
+
+    logger.debug(f"Relatório de qualidade de {endpoint_name}: {report.to_dict()}")
+    logger.info(
+        f"Qualidade de {endpoint_name}: {len(report.results)} regras, {len(report.failures)} violadas, "
+        f"{report.checked_rows}/{report.rows} linhas verificadas em {report.seconds * 1000:.1f} ms."
+    )
+    return report.passed
+
+def build_http_cache(loader):
+    """
+    Cache de validadores HTTP conforme HTTP_CACHE_BACKEND:
+    'postgres' (padrão, tabela raw._http_cache), 'file' (HTTP_CACHE_PATH) ou 'none'.
+    """
+    backend = os.getenv("HTTP_CACHE_BACKEND", "postgres").lower()
+    if backend == "none":
+        return None
+    if backend == "file":
+        return HttpCache(os.getenv("HTTP_CACHE_PATH", "data/http_cache.json"))
+    return PostgresHttpCache(loader.engine)
+
+
+def build_landing_zone():
+    """Landing zone Parquet local (LANDING_ZONE=true, diretório em LANDING_ZONE_PATH); desligada por padrão."""
+    if not landing_enabled():
+        return None
+    try:
+        return ParquetLandingZone()
+    except ImportError as e:
+        logger.warning(f"Landing zone desativada: {e}")
+        return None
+
+
+def endpoint_contract(config) -> str:
+    """
+    Versão do contrato de carga do endpoint (fingerprint do cache HTTP): versão do loader,
+    schema bronze registrado e load_options.
+    Rigor: Sem ela, endpoints estáticos (rockets, payloads, cores) seguiriam em 304 após
+    uma mudança de schema ou do loader, e colunas novas, migrações de tipo e tabelas
+    ponte nunca seriam aplicadas numa instalação existente.
+    """
+    schema = SchemaFactory.get_table_schema(config["schema"]).version if config.get("schema") else None
+    options = sorted((config.get("load_options") or {}).items())
+    return f"{LOADER_VERSION}:{schema}:{options}"
+
+
+def build_extractor(name, config, http_cache=None):
+    """
+    Escolhe o extrator do endpoint: "extractor": "query" usa a API paginada
+    POST /v4/<recurso>/query da SpaceX (lotes em streaming); "windows" divide um
+    backfill em janelas de data paralelas (NASA DONKI); o padrão é o GET simples.
+    Todos recebem a sessão HTTP compartilhada do processo (pool keep-alive por host)
+    e, com "schema", o flattener compilado do schema bronze registrado do endpoint.
+    """
+    session = get_connection_manager().session
+    flattener = build_flattener(config["schema"]) if config.get("schema") else None
+    if config.get("extractor") == "windows":
+        backfill = config["backfill"]
+        return DateWindowExtractor(
+            endpoint_name=name,
+            url=config["url"],
+            start_date=backfill["start_date"],
+            end_date=backfill["end_date"],
+            params=config.get("params"),
+            window_days=backfill.get("window_days"),
+            max_workers=backfill.get("max_workers"),
+            dedupe_key=backfill.get("dedupe_key"),
+            json_path=config.get("json_path"),
+            session=session,
+            flattener=flattener
+        )
+    if config.get("extractor") == "query":
+        return PaginatedQueryExtractor(
+            endpoint_name=name,
+            url=config["url"],
+            query=config.get("query"),
+            options=config.get("options"),
+            page_size=config.get("page_size"),
+            max_workers=config.get("page_workers", DEFAULT_MAX_WORKERS),
+            session=session,
+            flattener=flattener
+        )
+    return APIExtractor(
+        endpoint_name=name,
+        url=config["url"],
+        params=config.get("params"),
+        json_path=config.get("json_path"),
+        cache=http_cache,
+        contract=endpoint_contract(config) if http_cache is not None else None,
+        session=session,
+        stream=config.get("stream", False),
+        batch_size=config.get("batch_size"),
+        flattener=flattener
+    )
+
+
+def add_audit_columns(df, name, config, timestamp):
+    """Colunas de controle da camada bronze."""
+    df["source_endpoint"] = name
+    df["data_layer"] = config.get("layer", "bronze")
+    df["ingestion_timestamp"] = timestamp
+    return df
+
+
+def _stream_chunks(chunks, name, config, timestamp):
+    """Acrescenta as colunas de controle a cada lote conforme ele chega (lotes vazios são ignorados)."""
+    for chunk in chunks:
+        if not chunk.empty:
+            yield add_audit_columns(chunk, name, config, timestamp)
+
+
+class WatermarkTracker:
+    """
+    Acompanha o maior valor da coluna de watermark nos dados carregados.
+    Rigor: Valores futuros (ex.: lançamentos agendados) são ignorados; senão o
+    watermark saltaria para a data agendada e a próxima janela perderia o que
+    aconteceu entre hoje e ela.
+    """
+
+    def __init__(self, column):
+        self.column = column
+        self.value = None
+        self.rows = 0
+
+    def observe(self, df):
+        self.rows += len(df)
+        if self.column and self.column in df.columns:
+            values = pd.to_datetime(df[self.column], utc=True, errors="coerce")
+            latest = values[values <= pd.Timestamp.now(tz="UTC")].max()
+            if pd.notna(latest) and (self.value is None or latest > self.value):
+                self.value = latest
+        return df
+
+    def wrap(self, chunks):
+        for chunk in chunks:
+            yield self.observe(chunk)
+
+
+def track_state(name, config, data, extractor, state_store=None):
+    """
+    Prepara o registro pós-carga do endpoint: cache HTTP, watermark e última execução.
+    Retorna (dados, on_loaded); dados de um fluxo de lotes são embrulhados pelo tracker.
+    """
+    tracker = WatermarkTracker(config.get("watermark"))
+    data = tracker.observe(data) if isinstance(data, pd.DataFrame) else tracker.wrap(data)
+
+    def on_loaded():
+        extractor.commit_cache()
+        if state_store is not None:
+            watermark = tracker.value.to_pydatetime() if tracker.value is not None else None
+            state_store.record_success(name, tracker.column, watermark, tracker.rows)
+
+    return data, on_loaded
+
+
+def record_unchanged(name, state_store=None):
+    """Origem inalterada também é uma execução bem-sucedida (base da freshness no dbt)."""
+    if state_store is None:
+        return
+    try:
+        state_store.record_success(name, rows_loaded=0)
+    except Exception as e:
+        logger.warning(f"Falha ao registrar estado de {name}: {e}")
+
+
+def extract_endpoint(name, config, alert_manager, http_cache=None, landing_zone=None):
+    """
+    Etapa de extração + preflight de um endpoint.
+    Retorna (dados, extractor): dados é o DataFrame pronto para carga (com colunas de
+    controle), UNCHANGED quando a origem não mudou desde a última carga, ou None em caso de falha.
+    Endpoints paginados ("extractor": "query") ou em streaming ("stream": True) retornam
+    um gerador de lotes: o preflight roda sobre o primeiro lote e o restante só é lido
+    durante a carga.
+    Com landing_zone, cada lote aprovado no preflight também é gravado em Parquet local.
+    Rigor: Nenhuma exceção escapa; a falha é notificada e isolada no próprio endpoint.
+    """
+    extractor = None
+    try:
+        logger.info(f"Processando endpoint: {name}")
+
+        extractor = build_extractor(name, config, http_cache)
+
+        incremental = bool(config.get("watermark"))
+
+        if config.get("extractor") == "query" or config.get("stream"):
+            chunks = extractor.iter_chunks()
+            first_chunk = next(chunks, pd.DataFrame())
+            if extractor.unchanged is True:
+                logger.info(f"{name} sem alterações na origem; normalização e carga ignoradas.")
+                return UNCHANGED, extractor
+            if incremental and first_chunk.empty:
+                logger.info(f"{name} sem registros novos desde o watermark; carga ignorada.")
+                return UNCHANGED, extractor
+            if not preflight_check(first_chunk, name):
+                chunks.close()
+                msg = f"Falha na qualidade dos dados para {name}. Verifique os logs para detalhes."
+                alert_manager.notify_critical_failure(name, msg, serverity="WARNING")
+                logger.error(f"Abortando ingestão de {name} por falha na qualidade pré-vôo.")
+                return None, extractor
+            stream = _stream_chunks(
+                itertools.chain([first_chunk], chunks), name, config, datetime.datetime.utcnow()
+            )
+            return land(name, stream, landing_zone), extractor
+
+        raw_data = extractor.extract()
+
+        if extractor.unchanged is True:
+            logger.info(f"{name} sem alterações na origem; normalização e carga ignoradas.")
+            return UNCHANGED, extractor
+
+        if incremental and raw_data.empty:
+            logger.info(f"{name} sem registros novos desde o watermark; carga ignorada.")
+            return UNCHANGED, extractor
+
+        # PRE-FLIGHT CHECK
+        if not preflight_check(raw_data, name):
+            msg = f"Falha na qualidade dos dados para {name}. Verifique os logs para detalhes."
+            alert_manager.notify_critical_failure(name, msg, serverity="WARNING")
+            logger.error(f"Abortando ingestão de {name} por falha na qualidade pré-vôo.")
+            return None, extractor
+
+        df = add_audit_columns(raw_data, name, config, datetime.datetime.utcnow())
+        return land(name, df, landing_zone), extractor
+
+    except Exception as e:
+        alert_manager.notify_critical_failure(name, str(e))
+        logger.error(f"Erro no pipeline {name}: {str(e)}")
+        return None, extractor
+
+
+def land(name, data, landing_zone=None):
+    """Grava os dados extraídos na landing zone (se houver) sem alterar o que segue para a carga."""
+    return data if landing_zone is None else landing_zone.tee(name, data)
+
+
+def load_options_for(config) -> dict:
+    """load_options do endpoint; o schema bronze registrado ("schema") tipa o DDL da carga."""
+    options = dict(config.get("load_options") or {})
+    if config.get("schema"):
+        options.setdefault("schema", config["schema"])
+    return options
+
+
+def load_endpoint(name, df, loader, alert_manager, load_options=None, on_loaded=None) -> bool:
+    """
+    Etapa de carga na camada bronze, com o mesmo isolamento de falhas da extração.
+    load_options (do endpoint) é repassado ao loader: method, strategy, key_column, tombstone...
+    on_loaded é chamado somente após a carga ter sucesso (ex.: gravar o cache HTTP).
     """
-    if df.empty:
-        logger.warning(f"Check Falhou: {endpoint_name} está vazio.")
+    try:
+        loader.load_bronze(df, table_name=name, **(load_options or {}))
+        logger.info(f"{name} carregado na camada bronze")
+    except Exception as e:
+        alert_manager.notify_critical_failure(name, str(e))
+        logger.error(f"Erro no pipeline {name}: {str(e)}")
         return False
-    
-    # Exemplo de Validação de Contrato (Campos Críticos)
-    critical_columns = {
-        "spacex_launches": ["id", "flight_number", "date_utc"],
-        "nasa_solar_events": ["activityID", "startTime"]
-    }
-    
-    if endpoint_name in critical_columns:
-        missing = [col for col in critical_columns[endpoint_name] if col not in df.columns]
-        if missing:
-            logger.error(f"Contrato violado em {endpoint_name}. Colunas ausentes: {missing}")
-            return False
-            
-    # Validação de Nulos em IDs
-    if "id" in df.columns and df["id"].isnull().any():
-        logger.warning(f"Detectados IDs nulos em {endpoint_name}. Procedendo com cautela.")
-        
+
+    if on_loaded is not None:
+        try:
+            on_loaded()
+        except Exception as e:
+            # A carga já foi concluída; falha aqui só custa uma extração completa na próxima execução
+            logger.warning(f"Falha ao registrar pós-carga de {name}: {e}")
     return True
 
-def run_ingestion_engine():
+
+def process_endpoint(name, config, loader, alert_manager, http_cache=None, state_store=None,
+                     landing_zone=None) -> bool:
+    """
+    Executa o ciclo extract -> preflight -> load de um único endpoint.
+    Rigor: Isolamento de falhas por endpoint; nenhuma exceção escapa desta função,
+    o que permite executá-la tanto em laço sequencial quanto em um pool de threads.
+    """
+    raw_data, extractor = extract_endpoint(name, config, alert_manager, http_cache, landing_zone)
+    if raw_data is None:
+        return False
+    if raw_data is UNCHANGED:
+        record_unchanged(name, state_store)
+        return True
+    raw_data, on_loaded = track_state(name, config, raw_data, extractor, state_store)
+    return load_endpoint(name, raw_data, loader, alert_manager, load_options_for(config), on_loaded)
+
+
+def resolve_max_workers(max_workers=None, endpoint_count=None) -> int:
+    """
+    Define o grau de paralelismo da ingestão.
+    Prioridade: argumento explícito > INGESTION_MAX_WORKERS > DEFAULT_MAX_WORKERS.
+    Nunca abre mais threads do que endpoints a processar.
+    """
+    if max_workers is None:
+        max_workers = int(os.getenv("INGESTION_MAX_WORKERS", DEFAULT_MAX_WORKERS))
+    max_workers = max(1, int(max_workers))
+    if endpoint_count:
+        max_workers = min(max_workers, endpoint_count)
+    return max_workers
+
+
+class _ChunkStream:
+    """
+    Ponte entre a thread extratora e a de carga para endpoints paginados (modo pipeline).
+    Rigor: Fila limitada por endpoint; uma exceção do extrator é repassada ao loader.
+    """
+
+    def __init__(self, maxsize):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._finished = False
+
+    def put(self, item):
+        self._queue.put(item)
+
+    def __iter__(self):
+        while not self._finished:
+            item = self._queue.get()
+            if item is _PIPELINE_DONE or isinstance(item, BaseException):
+                self._finished = True
+                if item is not _PIPELINE_DONE:
+                    raise item
+                return
+            yield item
+
+    def discard(self):
+        """Descarta o restante (ex.: carga falhou no meio) para não bloquear o produtor."""
+        try:
+            for _ in self:
+                pass
+        except Exception:
+            pass
+
+
+def run_pipelined(endpoints, loader, alert_manager, max_workers, queue_size=None, http_cache=None,
+                  state_store=None, landing_zone=None) -> dict:
+    """
+    Modo produtor/consumidor: extratores publicam DataFrames numa fila limitada e
+    uma thread de carga drena a fila em paralelo, sobrepondo a carga do endpoint N
+    com a extração do endpoint N+1. Endpoints paginados entram na fila como um fluxo
+    de lotes, carregado à medida que as páginas chegam.
+    Rigor: A fila tem profundidade máxima (INGESTION_QUEUE_SIZE); quando cheia, os
+    produtores bloqueiam, limitando a memória a queue_size + max_workers DataFrames.
+    """
+    if queue_size is None:
+        queue_size = int(os.getenv("INGESTION_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+    work_queue = queue.Queue(maxsize=max(1, int(queue_size)))
+    results = {}
+
+    def consume():
+        while True:
+            item = work_queue.get()
+            try:
+                if item is _PIPELINE_DONE:
+                    return
+                name, df, load_options, on_loaded = item
+                results[name] = load_endpoint(name, df, loader, alert_manager, load_options, on_loaded)
+                if isinstance(df, _ChunkStream):
+                    df.discard()
+            finally:
+                work_queue.task_done()
+
+    def produce(name, config):
+        df, extractor = extract_endpoint(name, config, alert_manager, http_cache, landing_zone)
+        if df is None or df is UNCHANGED:
+            if df is UNCHANGED:
+                record_unchanged(name, state_store)
+            results[name] = df is UNCHANGED
+            return
+        df, on_loaded = track_state(name, config, df, extractor, state_store)
+        if isinstance(df, pd.DataFrame):
+            # Backpressure: bloqueia se o loader estiver atrasado
+            work_queue.put((name, df, load_options_for(config), on_loaded))
+            return
+
+        # Endpoint paginado: o loader consome os lotes enquanto as páginas seguintes chegam
+        stream = _ChunkStream(work_queue.maxsize)
+        work_queue.put((name, stream, load_options_for(config), on_loaded))
+        try:
+            for chunk in df:
+                stream.put(chunk)
+            stream.put(_PIPELINE_DONE)
+        except Exception as e:
+            stream.put(e)
+
+    loader_thread = threading.Thread(target=consume, name="ingestion-loader", daemon=True)
+    loader_thread.start()
+    logger.info(
+        f"Modo pipeline: {len(endpoints)} endpoints, {max_workers} extratores, fila máx. {work_queue.maxsize}."
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingestion") as pool:
+            for future in [pool.submit(produce, name, config) for name, config in endpoints.items()]:
+                future.result()
+    finally:
+        work_queue.put(_PIPELINE_DONE)
+        loader_thread.join()
+    return results
+
+
+def run_ingestion_engine(max_workers=None, mode=None):
+    """
+    Orquestra a ingestão de todos os endpoints configurados.
+    Modos (argumento ou INGESTION_MODE):
+      - concurrent (padrão): cada endpoint roda extract -> load num pool de threads;
+        com max_workers=1 equivale ao laço sequencial original.
+      - pipeline: extração e carga em estágios separados, ligados por fila limitada.
+    """
     logger.info("--- Iniciando Motor de Ingestão Enterprise (ELT) ---")
-    loader = PostgresLoader()
-    alert_maneger = AlertSystem()
+    # Pool de conexões dimensionado para as cargas simultâneas (e os shards do modo parallel)
+    loader = PostgresLoader(concurrent_loads=resolve_max_workers(max_workers))
+    try:
+        alert_maneger = AlertSystem()
+        http_cache = build_http_cache(loader)
+        state_store = IngestionStateStore(loader.engine)
+        landing_zone = build_landing_zone()
 
-    endpoints = get_endpoints_config()
-    for name, config in endpoints.items():
         try:
-            logger.info(f"Processando endpoint: {name}")
-            
-            extractor = APIExtractor(
-                endpoint_name=name,
-                url=config["url"],
-                params=config.get("params"),
-                json_path=config.get("json_path")
+            watermarks = state_store.get_watermarks()
+        except Exception as e:
+            logger.warning(f"Estado de ingestão indisponível ({e}); extração completa nesta execução.")
+            watermarks = {}
+
+        endpoints = get_endpoints_config(watermarks)
+        workers = resolve_max_workers(max_workers, len(endpoints))
+        mode = (mode or os.getenv("INGESTION_MODE", "concurrent")).lower()
+        results = {}
+
+        if mode == "pipeline":
+            results = run_pipelined(
+                endpoints, loader, alert_maneger, workers, http_cache=http_cache, state_store=state_store,
+                landing_zone=landing_zone
             )
+        elif workers == 1:
+            for name, config in endpoints.items():
+                results[name] = process_endpoint(
+                    name, config, loader, alert_maneger, http_cache, state_store, landing_zone
+                )
+        else:
+            logger.info(f"Modo concorrente: {len(endpoints)} endpoints com {workers} workers.")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingestion") as pool:
+                futures = {
+                    pool.submit(
+                        process_endpoint, name, config, loader, alert_maneger, http_cache, state_store,
+                        landing_zone
+                    ): name
+                    for name, config in endpoints.items()
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
 
-            raw_data = extractor.extract()
+        for host, stats in get_connection_manager().stats().items():
+            logger.info(
+                f"Conexões {host}: {stats['requests']} requisições em {stats['connections']} conexões "
+                f"({stats['reused']} reutilizadas)."
+            )
+        for host, stats in rate_limit_stats().items():
+            logger.info(
+                f"Rate limit {host}: {stats['requests']} requisições, {stats['throttled']} com espera "
+                f"(total {stats['waited_seconds']}s, máx. {stats['max_wait_seconds']}s)."
+            )
 
-            # PRE-FLIGHT CHECK
-            if not preflight_check(raw_data, name):
-                msg = f"Falha na qualidade dos dados para {name}. Verifique os logs para detalhes."
-                alert_maneger.notify_critical_failure(name, msg, serverity="WARNING")
-                logger.error(f"Abortando ingestão de {name} por falha na qualidade pré-vôo.")
+        failed = sorted(name for name, ok in results.items() if not ok)
+        if failed:
+            logger.warning(f"Endpoints com falha nesta execução: {failed}")
+
+        logger.info("--- Motor de Ingestão finalizado ---")
+        return results
+    finally:
+        # Processos de serialização do modo parallel e conexões do pool
+        loader.close()
+
+
+def run_landing_replay(ingest_date=None, run_id=None, only=None):
+    """
+    Recarga a partir da landing zone Parquet, sem nenhuma requisição HTTP.
+    Para cada endpoint configurado (ou os de only), relê com memory map os lotes da
+    execução mais recente da partição ingest_date (padrão: a mais recente) e os carrega
+    com as mesmas load_options/schema da ingestão normal.
+    Rigor: O estado de ingestão (watermarks, cache HTTP) não é tocado; reprocessar
+    dados antigos não pode adiantar a próxima janela incremental.
+    """
+    logger.info("--- Recarga a partir da landing zone ---")
+    loader = PostgresLoader()
+    try:
+        alert_maneger = AlertSystem()
+        landing_zone = ParquetLandingZone()
+        endpoints = get_endpoints_config({})
+        results = {}
+
+        for name, config in endpoints.items():
+            if only and name not in only:
+                continue
+            files = landing_zone.files(name, ingest_date, run_id)
+            if not files:
+                logger.warning(f"Nenhum arquivo de {name} na landing zone ({landing_zone.root}); endpoint ignorado.")
                 continue
-            
+            logger.info(f"Recarregando {name}: {len(files)} arquivos de {files[0].parent}.")
+            batches = (landing_zone.read_file(path) for path in files)
+            results[name] = load_endpoint(name, batches, loader, alert_maneger, load_options_for(config))
 
-            raw_data["source_endpoint"] = name
-            raw_data["data_layer"] = config.get("layer", "bronze") 
-            raw_data["ingestion_timestamp"] = datetime.datetime.utcnow()
+        failed = sorted(name for name, ok in results.items() if not ok)
+        if failed:
+            logger.warning(f"Endpoints com falha na recarga: {failed}")
+        logger.info("--- Recarga finalizada ---")
+        return results
+    finally:
+        loader.close()
 
-            loader.load_bronze(raw_data, table_name=name)
-            logger.info(f"{name} carregado na camada bronze")
 
-        except Exception as e:
-            alert_maneger.notify_critical_failure(name, str(e))
-            logger.error(f"Erro no pipeline {name}: {str(e)}")
-            continue
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Motor de ingestão (ELT) SpaceX/NASA.")
+    parser.add_argument(
+        "--load-from-landing", action="store_true",
+        help="Carrega a camada bronze a partir da landing zone Parquet, sem chamar as APIs."
+    )
+    parser.add_argument("--ingest-date", help="Partição ingest_date (AAAA-MM-DD) a recarregar; padrão: a mais recente.")
+    parser.add_argument("--run-id", help="Execução dentro da partição; padrão: a mais recente.")
+    parser.add_argument("--endpoints", help="Lista de endpoints separados por vírgula; padrão: todos.")
+    return parser.parse_args(argv)
 
-    logger.info("--- Motor de Ingestão finalizado ---")
 
 if __name__ == "__main__":
-    run_ingestion_engine()
\ No newline at end of file
+    args = parse_args()
+    if args.load_from_landing:
+        only = [name.strip() for name in args.endpoints.split(",")] if args.endpoints else None
+        run_landing_replay(args.ingest_date, args.run_id, only)
+    else:
+        run_ingestion_engine()
\ No newline at end of file
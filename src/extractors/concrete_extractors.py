@@ -1,41 +1,167 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+import hashlib
 import requests
 import pandas as pd
 from src.interfaces.extractor_interface import DataExtractor
+from src.utils.http_cache import HttpCache
+from src.utils.http_session import ConnectionManager
+from src.utils.json_stream import JsonPathNotFound, batched, iter_json_array
+from src.utils.rate_limiter import get_rate_limiter
 from src.utils.logger import get_logger
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 logger = get_logger(__name__)
 
+# Tamanho de página padrão para os endpoints POST /v4/<recurso>/query da SpaceX
+DEFAULT_PAGE_SIZE = 200
+# Janela padrão (dias) das sub-requisições de backfill por data (NASA DONKI)
+DEFAULT_WINDOW_DAYS = 30
+# Modo streaming do APIExtractor: registros por lote e bytes por leitura do socket
+DEFAULT_STREAM_BATCH_SIZE = 1000
+STREAM_CHUNK_BYTES = 1 << 16
+
+
+def split_date_windows(start: date, end: date, days: int):
+    """Divide [start, end] (inclusivo) em janelas consecutivas de até `days` dias."""
+    if end < start:
+        raise ValueError(f"Janela inválida: fim {end} anterior ao início {start}.")
+    step = timedelta(days=max(1, int(days)))
+    windows = []
+    while start <= end:
+        window_end = min(start + step - timedelta(days=1), end)
+        windows.append((start, window_end))
+        start = window_end + timedelta(days=1)
+    return windows
+
 class APIExtractor(DataExtractor):
-    def __init__(self, endpoint_name, url, params=None, headers=None, json_path=None):
+    def __init__(self, endpoint_name, url, params=None, headers=None, json_path=None, cache=None,
+                 rate_limiter=None, session=None, stream=False, batch_size=None, flattener=None,
+                 contract=None):
         self.endpoint_name = endpoint_name
         self.url = url
         self.params = params
         self.headers = headers
         self.json_path = json_path
-        # Configuração de Retry: Rigor contra instabilidade de rede
-        self.session = requests.Session()
-        retries = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
-        self.session.mount('https://', HTTPAdapter(max_retries=retries))
+        # Achatamento dos registros: CompiledFlattener (schema) ou json_normalize genérico
+        self.normalize = flattener or pd.json_normalize
+        # Modo streaming (iter_chunks): parsing incremental em lotes de batch_size registros
+        self.stream = stream
+        self.batch_size = batch_size or DEFAULT_STREAM_BATCH_SIZE
+        # Token bucket compartilhado por host: todas as threads respeitam a mesma cota
+        self.rate_limiter = rate_limiter or get_rate_limiter(url)
+        # Cache de validadores HTTP (ETag/Last-Modified/hash do corpo); None desativa
+        self.cache = cache
+        # Versão do contrato de carga, parte do fingerprint do cache
+        self.contract = contract
+        # True quando a última extração detectou que a origem não mudou (304 ou mesmo corpo)
+        self.unchanged = False
+        self._pending_cache_entry = None
+        if session is not None:
+            # Sessão compartilhada (ConnectionManager): pool keep-alive e retry já configurados
+            self.session = session
+        else:
+            # Configuração de Retry: Rigor contra instabilidade de rede
+            self.session = requests.Session()
+            retries = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+            self.session.mount('https://', HTTPAdapter(max_retries=retries))
+
+    def _conditional_headers(self, cached):
+        """Acrescenta If-None-Match / If-Modified-Since a partir da entrada em cache."""
+        if not cached or not (cached.get("etag") or cached.get("last_modified")):
+            return self.headers
+        headers = dict(self.headers or {})
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def commit_cache(self):
+        """
+        Persiste os validadores da última resposta.
+        Rigor: Deve ser chamado só depois da carga bem-sucedida; se a carga falhar,
+        a próxima execução não recebe 304 e refaz a ingestão completa.
+        """
+        if self.cache is not None and self._pending_cache_entry:
+            self.cache.set(self.endpoint_name, self._pending_cache_entry)
+            self._pending_cache_entry = None
+
+    def _send(self, stream=False):
+        """
+        GET (condicional, se houver cache) sob o rate limiter.
+        Retorna (response, fingerprint, cached); response é None quando a origem respondeu 304.
+        """
+        cached = fingerprint = None
+        if self.cache is not None:
+            fingerprint = HttpCache.fingerprint(self.url, self.params, self.contract)
+            cached = self.cache.get(self.endpoint_name, fingerprint)
+
+        headers = self._conditional_headers(cached)
+        extra = {"stream": True} if stream else {}
+        response = self.rate_limiter.call(lambda: self.session.get(
+            self.url, 
+            params=self.params, 
+            headers=headers, 
+            timeout=20,
+            **extra
+        ))
+        
+        # Verificação de Rate Limit (NASA usa isso, conforme o texto que você enviou)
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining and int(remaining) < 5:
+            logger.warning(f"Rate Limit crítico para {self.endpoint_name}: {remaining} restantes.")
+
+        if response.status_code == 304:
+            self.unchanged = True
+            logger.info(f"{self.endpoint_name} inalterado na origem (304 Not Modified).")
+            response.close()
+            return None, fingerprint, cached
+
+        response.raise_for_status()
+        return response, fingerprint, cached
+
+    def _stage_cache_entry(self, response, fingerprint, body_hash):
+        """Validadores da resposta, gravados só após a carga (commit_cache)."""
+        self._pending_cache_entry = {
+            "fingerprint": fingerprint,
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+            "body_hash": body_hash,
+        }
+
+    def _log_failure(self, e):
+        if isinstance(e, requests.exceptions.SSLError):
+            logger.error(f"Erro de SSL em {self.endpoint_name}. Verifique certificados ou proxy.")
+        elif isinstance(e, requests.exceptions.HTTPError):
+            # Se for 403 (NASA), o log precisa ser específico
+            if e.response.status_code == 403:
+                logger.error(f"Acesso Negado (403) em {self.endpoint_name}. Verifique a API Key.")
+        else:
+            logger.critical(f"Falha catastrófica em {self.endpoint_name}: {e}")
 
     def extract(self) -> pd.DataFrame:
         logger.info(f"Iniciando extração do endpoint: {self.endpoint_name}")
+        self.unchanged = False
+        self._pending_cache_entry = None
         try:
-            response = self.session.get(
-                self.url, 
-                params=self.params, 
-                headers=self.headers, 
-                timeout=20
-            )
-            
-            # Verificação de Rate Limit (NASA usa isso, conforme o texto que você enviou)
-            remaining = response.headers.get('X-RateLimit-Remaining')
-            if remaining and int(remaining) < 5:
-                logger.warning(f"Rate Limit crítico para {self.endpoint_name}: {remaining} restantes.")
+            response, fingerprint, cached = self._send()
+            if response is None:
+                return pd.DataFrame()
+
+            if self.cache is not None:
+                body_hash = HttpCache.body_hash(response.content)
+                self._stage_cache_entry(response, fingerprint, body_hash)
+                # Fallback para APIs sem validadores: mesmo corpo = nada a normalizar/carregar
+                if cached and cached.get("body_hash") == body_hash:
+                    self.unchanged = True
+                    logger.info(f"{self.endpoint_name} inalterado na origem (hash do corpo idêntico).")
+                    return pd.DataFrame()
 
-            response.raise_for_status()
-            data = response.json()
+            # DONKI responde 200 com corpo vazio quando a janela não tem eventos
+            data = response.json() if response.content != b"" else []
 
             # Lógica robusta para json_path
             if self.json_path:
@@ -46,7 +172,7 @@ class APIExtractor(DataExtractor):
                         logger.error(f"Erro de estrutura no JSON: Chave '{key}' não encontrada.")
                         return pd.DataFrame() # Retorna vazio em vez de crashar o loop
 
-            df = pd.json_normalize(data)
+            df = self.normalize(data)
 
             if df.empty:
                 logger.warning(f"Nenhum dado encontrado no endpoint {self.endpoint_name}.")
@@ -55,14 +181,202 @@ class APIExtractor(DataExtractor):
             
             return df
             
-        except requests.exceptions.SSLError:
-            logger.error(f"Erro de SSL em {self.endpoint_name}. Verifique certificados ou proxy.")
-            raise
-        except requests.exceptions.HTTPError as e:
-            # Se for 403 (NASA), o log precisa ser específico
-            if e.response.status_code == 403:
-                logger.error(f"Acesso Negado (403) em {self.endpoint_name}. Verifique a API Key.")
+        except Exception as e:
+            self._log_failure(e)
             raise
+
+    def iter_chunks(self):
+        """
+        Com stream=True, o corpo é lido em blocos (iter_content) e analisado de forma
+        incremental no json_path; os registros seguem para o achatamento em lotes de
+        batch_size. Rigor: Não existem ao mesmo tempo o corpo inteiro, a árvore Python e
+        o DataFrame completo — o pico de memória acompanha o lote, não o payload.
+        O fallback por hash do corpo não se aplica (o hash só existe ao fim da leitura);
+        ETag/Last-Modified continuam valendo.
+        """
+        if not self.stream:
+            yield from super().iter_chunks()
+            return
+
+        logger.info(f"Iniciando extração em streaming do endpoint: {self.endpoint_name}")
+        self.unchanged = False
+        self._pending_cache_entry = None
+        try:
+            response, fingerprint, _ = self._send(stream=True)
+            if response is None:
+                return
+
+            digest = hashlib.sha256()
+
+            def body():
+                for block in response.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+                    digest.update(block)
+                    yield block
+
+            total = 0
+            try:
+                for batch in batched(iter_json_array(body(), self.json_path), self.batch_size):
+                    total += len(batch)
+                    yield self.normalize(batch)
+            except JsonPathNotFound as e:
+                logger.error(f"Erro de estrutura no JSON: Chave '{e}' não encontrada.")
+                return
+            finally:
+                response.close()
+
+            if self.cache is not None:
+                self._stage_cache_entry(response, fingerprint, digest.hexdigest())
+            logger.info(f"Extração concluída: {total} registros para {self.endpoint_name} (streaming).")
+
         except Exception as e:
-            logger.critical(f"Falha catastrófica em {self.endpoint_name}: {e}")
-            raise
\ No newline at end of file
+            self._log_failure(e)
+            raise
+
+
+class PaginatedQueryExtractor(DataExtractor):
+    """
+    Extrator para a API de consulta da SpaceX (POST /v4/<recurso>/query).
+    Rigor: Entrega um DataFrame por página (iter_chunks) assim que ela chega; depois da
+    primeira página (que informa totalPages) as demais são buscadas em paralelo, com no
+    máximo max_workers páginas em voo, e entregues na ordem. O pico de memória fica
+    limitado a algumas páginas, não à coleção inteira (ex.: /starlink).
+    """
+
+    def __init__(self, endpoint_name, url, query=None, options=None, page_size=DEFAULT_PAGE_SIZE,
+                 max_workers=4, headers=None, rate_limiter=None, session=None, flattener=None):
+        self.endpoint_name = endpoint_name
+        self.url = url
+        self.normalize = flattener or pd.json_normalize
+        self.rate_limiter = rate_limiter or get_rate_limiter(url)
+        self.query = query or {}
+        self.options = options or {}
+        self.page_size = page_size or DEFAULT_PAGE_SIZE
+        self.max_workers = max(1, max_workers or 1)
+        self.headers = headers
+        # POST /query não participa do cache HTTP condicional (ver APIExtractor)
+        self.unchanged = None
+        if session is not None:
+            self.session = session
+        else:
+            self.session = requests.Session()
+            # POST /query é somente leitura: seguro repetir em falhas transitórias
+            retries = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504],
+                            allowed_methods=None)
+            self.session.mount('https://', HTTPAdapter(max_retries=retries, pool_maxsize=self.max_workers))
+
+    def commit_cache(self):
+        """Sem validadores HTTP a persistir; mantém a interface usada pelo orquestrador."""
+        return None
+
+    def _fetch_page(self, page: int) -> dict:
+        body = {
+            "query": self.query,
+            "options": {**self.options, "limit": self.page_size, "page": page},
+        }
+        response = self.rate_limiter.call(
+            lambda: self.session.post(self.url, json=body, headers=self.headers, timeout=20)
+        )
+
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining and int(remaining) < 5:
+            logger.warning(f"Rate Limit crítico para {self.endpoint_name}: {remaining} restantes.")
+
+        response.raise_for_status()
+        return response.json()
+
+    def iter_chunks(self):
+        logger.info(f"Iniciando extração paginada do endpoint: {self.endpoint_name}")
+        first = self._fetch_page(1)
+        total_pages = int(first.get("totalPages") or 1)
+        total_docs = first.get("totalDocs")
+        logger.info(f"{self.endpoint_name}: {total_docs} registros em {total_pages} páginas.")
+        yield self.normalize(first.get("docs") or [])
+
+        if total_pages <= 1:
+            return
+
+        pages = iter(range(2, total_pages + 1))
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="page") as pool:
+            in_flight = deque()
+            for page in pages:
+                in_flight.append(pool.submit(self._fetch_page, page))
+                if len(in_flight) >= self.max_workers:
+                    break
+            while in_flight:
+                payload = in_flight.popleft().result()
+                next_page = next(pages, None)
+                if next_page is not None:
+                    in_flight.append(pool.submit(self._fetch_page, next_page))
+                yield self.normalize(payload.get("docs") or [])
+
+    def extract(self) -> pd.DataFrame:
+        chunks = [chunk for chunk in self.iter_chunks() if not chunk.empty]
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+        logger.info(f"Extração concluída: {len(df)} registros para {self.endpoint_name}.")
+        return df
+
+
+class DateWindowExtractor(DataExtractor):
+    """
+    Backfill por janelas de data para APIs com startDate/endDate (NASA DONKI).
+    Rigor: [start_date, end_date] é dividido em sub-janelas de window_days, buscadas
+    em paralelo (max_workers pequeno: a DEMO_KEY tem cota baixa) e unidas num único
+    DataFrame, sem duplicatas em dedupe_key (eventos na borda de duas janelas).
+    """
+
+    def __init__(self, endpoint_name, url, start_date, end_date, params=None,
+                 window_days=DEFAULT_WINDOW_DAYS, max_workers=2, dedupe_key=None,
+                 start_param="startDate", end_param="endDate", json_path=None, session=None,
+                 flattener=None):
+        self.endpoint_name = endpoint_name
+        self.url = url
+        self.start_date = date.fromisoformat(str(start_date))
+        self.end_date = date.fromisoformat(str(end_date))
+        self.params = params or {}
+        self.window_days = window_days or DEFAULT_WINDOW_DAYS
+        self.max_workers = max(1, max_workers or 1)
+        self.dedupe_key = dedupe_key
+        self.start_param = start_param
+        self.end_param = end_param
+        self.json_path = json_path
+        self.flattener = flattener
+        # Todas as janelas compartilham a mesma sessão (e o pool keep-alive)
+        self.session = session or ConnectionManager(pool_maxsize=self.max_workers).session
+        # Cada janela é uma requisição distinta: o cache HTTP condicional não se aplica
+        self.unchanged = None
+
+    def commit_cache(self):
+        """Sem validadores HTTP a persistir; mantém a interface usada pelo orquestrador."""
+        return None
+
+    def _extract_window(self, window) -> pd.DataFrame:
+        start, end = window
+        params = {**self.params, self.start_param: start.isoformat(), self.end_param: end.isoformat()}
+        extractor = APIExtractor(
+            endpoint_name=f"{self.endpoint_name}[{start}..{end}]",
+            url=self.url,
+            params=params,
+            json_path=self.json_path,
+            session=self.session,
+            flattener=self.flattener
+        )
+        return extractor.extract()
+
+    def extract(self) -> pd.DataFrame:
+        windows = split_date_windows(self.start_date, self.end_date, self.window_days)
+        logger.info(
+            f"Backfill de {self.endpoint_name}: {self.start_date}..{self.end_date} "
+            f"em {len(windows)} janelas de {self.window_days} dias ({self.max_workers} em paralelo)."
+        )
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="window") as pool:
+            frames = [df for df in pool.map(self._extract_window, windows) if not df.empty]
+
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if self.dedupe_key and self.dedupe_key in df.columns:
+            before = len(df)
+            df = df.drop_duplicates(subset=[self.dedupe_key], keep="last").reset_index(drop=True)
+            if len(df) < before:
+                logger.info(f"{self.endpoint_name}: {before - len(df)} duplicatas removidas por {self.dedupe_key}.")
+        logger.info(f"Extração concluída: {len(df)} registros para {self.endpoint_name}.")
+        return df
+
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
 import pandas as pd
 
 class DataExtractor(ABC):
@@ -17,4 +18,14 @@ class DataExtractor(ABC):
     @abstractmethod
     def extract(self) -> pd.DataFrame:
 
-        pass
\ No newline at end of file
+        pass
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Extrai os dados como uma sequência de DataFrames (lotes).
+
+        Implementação padrão: um único lote com o resultado de extract().
+        Extratores paginados sobrescrevem este método para entregar cada página
+        assim que ela chega, sem materializar a coleção inteira em memória.
+        """
+        yield self.extract()
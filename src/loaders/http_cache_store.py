@@ -0,0 +1,70 @@
+from sqlalchemy import text
+from src.utils.http_cache import HttpCache
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PostgresHttpCache(HttpCache):
+    """
+    Backend do cache HTTP na tabela raw._http_cache.
+    Rigor: O container de ingestão é efêmero (auto_remove); o banco é o único lugar
+    que sobrevive entre execuções da DAG.
+    """
+
+    TABLE = 'raw."_http_cache"'
+
+    def __init__(self, engine):
+        super().__init__(path=None)
+        self.engine = engine
+        self._ready = False
+
+    def _ensure_table(self):
+        if self._ready:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE SCHEMA IF NOT EXISTS raw"))
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                    endpoint text PRIMARY KEY,
+                    fingerprint text NOT NULL,
+                    etag text,
+                    last_modified text,
+                    body_hash text,
+                    updated_at timestamp NOT NULL DEFAULT now()
+                )
+            """))
+        self._ready = True
+
+    def _load_entry(self, endpoint_name):
+        self._ensure_table()
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text(f"SELECT fingerprint, etag, last_modified, body_hash FROM {self.TABLE} "
+                     "WHERE endpoint = :endpoint"),
+                {"endpoint": endpoint_name}
+            ).mappings().first()
+        return dict(row) if row else None
+
+    def _save_entry(self, endpoint_name, entry):
+        self._ensure_table()
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(f"""
+                    INSERT INTO {self.TABLE} (endpoint, fingerprint, etag, last_modified, body_hash, updated_at)
+                    VALUES (:endpoint, :fingerprint, :etag, :last_modified, :body_hash, now())
+                    ON CONFLICT (endpoint) DO UPDATE SET
+                        fingerprint = EXCLUDED.fingerprint,
+                        etag = EXCLUDED.etag,
+                        last_modified = EXCLUDED.last_modified,
+                        body_hash = EXCLUDED.body_hash,
+                        updated_at = EXCLUDED.updated_at
+                """),
+                {
+                    "endpoint": endpoint_name,
+                    "fingerprint": entry.get("fingerprint"),
+                    "etag": entry.get("etag"),
+                    "last_modified": entry.get("last_modified"),
+                    "body_hash": entry.get("body_hash"),
+                }
+            )
@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+import pandas as pd
+from src.loaders.postgres_loader import complex_columns, serialize_json_column
+from src.models.schemas import dataframe_backend
+from src.utils.logger import get_logger
+
+try:
+    import orjson
+except ImportError:  # Decoder opcional, como no encoder do PostgresLoader
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Landing zone exige pyarrow; sem ele o estágio fica desligado
+    pa = pq = None
+
+logger = get_logger(__name__)
+
+DEFAULT_LANDING_PATH = "data/landing"
+# Chave dos metadados do schema Parquet com as colunas JSON (gravadas como texto)
+_METADATA_KEY = b"ingestion.json_columns"
+# Tipos Arrow -> dtypes nullable do pandas na releitura (ints com nulo não viram float)
+_NULLABLE_TYPES = {} if pa is None else {
+    pa.int64(): pd.Int64Dtype(),
+    pa.bool_(): pd.BooleanDtype(),
+    pa.string(): pd.StringDtype(),
+    pa.large_string(): pd.StringDtype(),
+}
+
+
+def _loads(text):
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+def landing_enabled() -> bool:
+    return os.getenv("LANDING_ZONE", "false").lower() in ("1", "true", "yes")
+
+
+class ParquetLandingZone:
+    """
+    Zona de pouso local: cada lote extraído vira um arquivo Parquet num dataset
+    particionado no estilo Hive, <root>/endpoint=<nome>/ingest_date=<AAAA-MM-DD>/.
+    Rigor: Extração e carga ficam desacopladas — uma carga que falhou (ou um
+    reprocessamento) relê os arquivos com memory map, sem nenhuma requisição HTTP.
+    Colunas JSON (listas/objetos) são gravadas como texto JSON e decodificadas na
+    releitura; o nome delas fica nos metadados do schema Parquet.
+    Cada execução do processo grava arquivos part-<run_id>-<seq>.parquet próprios.
+    """
+
+    def __init__(self, root=None, run_id=None):
+        if pa is None:
+            raise ImportError("A landing zone Parquet exige o pacote pyarrow.")
+        self.root = Path(root or os.getenv("LANDING_ZONE_PATH", DEFAULT_LANDING_PATH))
+        self.run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        self._sequences = {}
+        self._lock = threading.Lock()
+
+    def partition(self, name, ingest_date) -> Path:
+        return self.root / f"endpoint={name}" / f"ingest_date={ingest_date}"
+
+    def _next_path(self, name, ingest_date) -> Path:
+        with self._lock:
+            sequence = self._sequences.get(name, 0)
+            self._sequences[name] = sequence + 1
+        return self.partition(name, ingest_date) / f"part-{self.run_id}-{sequence:05d}.parquet"
+
+    @staticmethod
+    def _to_arrow(df: pd.DataFrame):
+        json_columns = complex_columns(df)
+        if json_columns:
+            df = df.copy(deep=False)
+            for col in json_columns:
+                df[col] = serialize_json_column(df[col])
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Colunas de objetos com tipos mistos (endpoints sem schema) vão como texto
+            df = df.copy(deep=False)
+            for col in df.columns:
+                if df[col].dtype == object and col not in json_columns:
+                    df[col] = df[col].astype("string")
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_METADATA_KEY] = json.dumps(json_columns).encode()
+        return table.replace_schema_metadata(metadata)
+
+    def write(self, name, df: pd.DataFrame, ingest_date=None) -> Path:
+        """Grava um lote; retorna o caminho do arquivo (lotes vazios não geram arquivo)."""
+        if df is None or df.empty:
+            return None
+        ingest_date = ingest_date or datetime.now(timezone.utc).date().isoformat()
+        path = self._next_path(name, ingest_date)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            self._to_arrow(df), path, coerce_timestamps="us", allow_truncated_timestamps=True
+        )
+        return path
+
+    def tee(self, name, data):
+        """
+        Grava os dados na landing zone e os devolve para a carga: um DataFrame é gravado
+        na hora; um fluxo de lotes é gravado lote a lote, conforme a carga os consome.
+        Rigor: Falha na landing zone não derruba a carga — ela é a rede de segurança.
+        """
+        if isinstance(data, pd.DataFrame):
+            self._safe_write(name, data)
+            return data
+        return self._tee_chunks(name, data)
+
+    def _tee_chunks(self, name, chunks):
+        for chunk in chunks:
+            self._safe_write(name, chunk)
+            yield chunk
+
+    def _safe_write(self, name, df):
+        try:
+            path = self.write(name, df)
+            if path is not None:
+                logger.info(f"Landing zone: {len(df)} linhas de {name} em {path}.")
+        except Exception as e:
+            logger.warning(f"Falha ao gravar {name} na landing zone: {e}")
+
+    def ingest_dates(self, name) -> list:
+        base = self.root / f"endpoint={name}"
+        if not base.is_dir():
+            return []
+        return sorted(p.name.split("=", 1)[1] for p in base.glob("ingest_date=*") if p.is_dir())
+
+    def files(self, name, ingest_date=None, run_id=None) -> list:
+        """
+        Arquivos a recarregar: por padrão, a execução mais recente da partição mais recente
+        (cada execução é um retrato completo do endpoint; somar execuções duplicaria linhas).
+        """
+        dates = [ingest_date] if ingest_date else self.ingest_dates(name)[-1:]
+        if not dates:
+            return []
+        files = sorted(self.partition(name, dates[0]).glob("part-*.parquet"))
+        runs = sorted({p.name.split("-")[1] for p in files})
+        if not runs:
+            return []
+        run_id = run_id or runs[-1]
+        return [p for p in files if p.name.split("-")[1] == run_id]
+
+    @staticmethod
+    def read_file(path, backend=None) -> pd.DataFrame:
+        """Lê um arquivo com memory map, restaurando as colunas JSON e df.attrs["json_columns"]."""
+        table = pq.read_table(path, memory_map=True)
+        metadata = table.schema.metadata or {}
+        json_columns = json.loads(metadata.get(_METADATA_KEY, b"[]"))
+        if dataframe_backend(backend) == "pyarrow":
+            df = table.to_pandas(types_mapper=pd.ArrowDtype)
+        else:
+            # Mesmo dtype do flattener (datetime64[ns]); o Parquet guarda microssegundos
+            df = table.to_pandas(types_mapper=_NULLABLE_TYPES.get, coerce_temporal_nanoseconds=True)
+        for col in json_columns:
+            values = table.column(col).to_pylist()
+            df[col] = pd.array([None if v is None else _loads(v) for v in values], dtype=object)
+        df.attrs["json_columns"] = json_columns
+        return df
+
+    def read_batches(self, name, ingest_date=None, run_id=None, backend=None):
+        """Lotes gravados de um endpoint (na ordem original), como DataFrames."""
+        for path in self.files(name, ingest_date, run_id):
+            yield self.read_file(path, backend)
+
+    def read(self, name, ingest_date=None, run_id=None, backend=None) -> pd.DataFrame:
+        """Endpoint inteiro num DataFrame (leitura local rápida para análises/notebook)."""
+        frames = list(self.read_batches(name, ingest_date, run_id, backend))
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        df.attrs["json_columns"] = frames[0].attrs.get("json_columns", [])
+        return df
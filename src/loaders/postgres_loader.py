@@ -1,70 +1,1483 @@
+import csv
+import io
+import itertools
 import json
+import multiprocessing
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text, inspect
+from pandas.api.types import (
+    infer_dtype, is_bool_dtype, is_datetime64_any_dtype, is_float_dtype, is_integer_dtype
+)
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
 import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
+from functools import partial
+from typing import NamedTuple
+from src.models.schema_factory import SchemaFactory
+from src.transformers.exploder import ChildCollector
 from src.utils.logger import get_logger
 
+try:
+    import orjson
+except ImportError:  # Encoder opcional: sem ele, usa o json da stdlib com a mesma saída
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # Backend Arrow opcional: sem ele, o COPY usa sempre o csv da stdlib
+    pa = None
+
 logger = get_logger(__name__)
 
-class PostgresLoader:
+# Linhas por lote do COPY: cada lote vira um buffer CSV em memória (memória limitada).
+COPY_CHUNK_SIZE = 10_000
+# Marcador de NULL no CSV do COPY (distingue NULL de string vazia).
+COPY_NULL = r"\N"
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def copy_insert(table, conn, keys, data_iter):
+    """
+    Método de inserção para DataFrame.to_sql usando COPY FROM STDIN (psycopg2 copy_expert).
+    Rigor: Um único round trip por lote em vez de um INSERT por linha; o pandas
+    chama este método uma vez por chunk (chunksize), mantendo o buffer limitado.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    rows = 0
+    for row in data_iter:
+        writer.writerow([COPY_NULL if value is None else value for value in row])
+        rows += 1
+    buffer.seek(0)
+
+    target = _quote_ident(table.name)
+    if table.schema:
+        target = f"{_quote_ident(table.schema)}.{target}"
+    columns = ", ".join(_quote_ident(k) for k in keys)
+    sql = f"COPY {target} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+
+    dbapi_conn = conn.connection
+    with dbapi_conn.cursor() as cur:
+        cur.copy_expert(sql, buffer)
+    return rows
+
+
+def uses_arrow(df: pd.DataFrame) -> bool:
+    """True se alguma coluna é pd.ArrowDtype (backend "pyarrow" do CompiledFlattener)."""
+    return pa is not None and any(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+
+
+def arrow_csv_batches(df: pd.DataFrame, batch_rows: int = COPY_CHUNK_SIZE):
+    """
+    Buffers CSV (bytes) do DataFrame para COPY ... WITH (FORMAT csv), escritos pelo
+    writer C++ do pyarrow em lotes de batch_rows linhas.
+    Rigor: Colunas Arrow são repassadas sem cópia e nenhuma linha vira tupla Python.
+    Texto sai sempre entre aspas e NULL como campo vazio sem aspas (o NULL padrão do
+    COPY csv), então NULL e string vazia continuam distintos. Timestamps em ns são
+    reduzidos a µs, a resolução do Postgres.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type) and field.type.unit == "ns":
+            table = table.set_column(i, field.name, table.column(i).cast(pa.timestamp("us", field.type.tz), safe=False))
+    options = pa_csv.WriteOptions(include_header=False)
+    for batch in table.to_batches(max_chunksize=batch_rows):
+        buffer = io.BytesIO()
+        pa_csv.write_csv(batch, buffer, options)
+        buffer.seek(0)
+        yield buffer
+
+
+def copy_arrow(df: pd.DataFrame, table_name: str, conn) -> int:
+    """COPY FROM STDIN de um DataFrame com colunas Arrow (conn: Connection do SQLAlchemy)."""
+    columns = ", ".join(_quote_ident(c) for c in df.columns)
+    sql = f"COPY raw.{_quote_ident(table_name)} ({columns}) FROM STDIN WITH (FORMAT csv)"
+    with conn.connection.cursor() as cur:
+        for buffer in arrow_csv_batches(df):
+            cur.copy_expert(sql, buffer)
+    return len(df)
+
+
+# Modo "parallel": linhas máximas por shard (cada shard é serializado num processo e
+# copiado numa conexão própria) e número padrão de shards simultâneos
+COPY_SHARD_ROWS = 50_000
+DEFAULT_COPY_WORKERS = 4
+
+
+def serialize_copy_shard(df: pd.DataFrame):
+    """
+    CSV (bytes) de um shard para COPY FROM STDIN, gerado num processo worker do modo
+    "parallel". Retorna (payload, arrow): lotes Arrow usam o writer do pyarrow (NULL = campo
+    vazio sem aspas); os demais, o writer C do pandas com NULL = \\N, como o copy_insert.
+    """
+    if uses_arrow(df):
+        return b"".join(buffer.getvalue() for buffer in arrow_csv_batches(df)), True
+    return df.to_csv(index=False, header=False, na_rep=COPY_NULL).encode(), False
+
+
+def copy_workers() -> int:
+    return max(1, int(os.getenv("BRONZE_COPY_WORKERS", DEFAULT_COPY_WORKERS)))
+
+
+# Pool padrão do SQLAlchemy (create_engine): piso do pool do loader
+POOL_SIZE = 5
+POOL_MAX_OVERFLOW = 10
+
+
+def pool_settings(concurrent_loads: int = 1) -> dict:
+    """
+    Tamanho do pool de conexões do loader para concurrent_loads cargas simultâneas.
+    Rigor: Cada carga usa uma conexão por vez (schema, staging, publicação) e, no método
+    parallel, mais até BRONZE_COPY_WORKERS conexões de shard; com o pool padrão (5 + 10),
+    INGESTION_MAX_WORKERS endpoints em parallel esgotariam o pool e os shards esperariam
+    conexões presas pelas próprias cargas até o pool_timeout. As conexões fixas cobrem
+    uma por carga; o overflow (fechado ao ser devolvido) cobre os shards.
+    """
+    concurrent_loads = max(1, int(concurrent_loads))
+    return {
+        "pool_size": max(POOL_SIZE, concurrent_loads),
+        "max_overflow": max(POOL_MAX_OVERFLOW, concurrent_loads * copy_workers()),
+    }
+
+
+# Versão do contrato de carga (DDL, tabelas ponte, tipos): incremente ao mudar o que a
+# carga grava; entra no fingerprint do cache HTTP, forçando a recarga dos endpoints estáticos
+LOADER_VERSION = "1"
+
+# Estratégias de idempotência da carga bronze
+LOAD_STRATEGIES = ("swap", "truncate", "merge", "history")
+# Sufixo das tabelas de staging (swap/merge): recriadas a cada carga, fora do cache de catálogo
+STAGING_SUFFIX = "__staging"
+# Tempo máximo de espera por lock na transação de troca (falha rápido em vez de enfileirar leitores
+# atrás do ACCESS EXCLUSIVE do rename ou de um ALTER de drift)
+SWAP_LOCK_TIMEOUT = "10s"
+
+# Colunas de controle do modo merge e colunas de auditoria fora do hash de conteúdo
+ROW_HASH_COLUMN = "_row_hash"
+DELETED_AT_COLUMN = "_deleted_at"
+HASH_EXCLUDED_COLUMNS = frozenset({
+    "loaded_at", "ingestion_timestamp", ROW_HASH_COLUMN, DELETED_AT_COLUMN
+})
+
+# Modo history: tabela particionada por dia nesta coluna (lote de cada execução) e view do lote atual
+HISTORY_PARTITION_COLUMN = "ingestion_timestamp"
+HISTORY_SUFFIX = "_history"
+CURRENT_SUFFIX = "_current"
+# Dias de partições mantidos por padrão (0 = sem retenção)
+DEFAULT_HISTORY_RETENTION_DAYS = 30
+
+
+def compute_row_hash(df: pd.DataFrame, exclude=HASH_EXCLUDED_COLUMNS) -> pd.Series:
+    """
+    Hash de conteúdo estável por linha (int64), vetorizado coluna a coluna.
+    Rigor: Cada célula não nula contribui com hash(valor) * peso(nome da coluna) e as
+    contribuições são somadas (mod 2^64). Assim o hash não depende da ordem das colunas,
+    e uma coluna ausente equivale a uma coluna nula — lotes/páginas com conjuntos de
+    colunas diferentes geram o mesmo hash para o mesmo registro. Floats inteiros (1.0)
+    são normalizados para inteiros, pois NaN numa página promove int -> float.
+    Colunas de auditoria (timestamps de carga) ficam fora do hash.
+    """
+    total = np.zeros(len(df), dtype=np.uint64)
+    for col in df.columns:
+        if col in exclude:
+            continue
+        series = df[col]
+        if is_float_dtype(series.dtype) and (series.dropna() % 1 == 0).all():
+            series = series.astype("Int64")
+        values = series.astype("string")
+        cell = pd.util.hash_pandas_object(values, index=False).to_numpy(dtype=np.uint64)
+        cell[values.isna().to_numpy()] = 0
+        weight = pd.util.hash_array(np.array([str(col)], dtype=object))[0] | np.uint64(1)
+        total += cell * weight
+    return pd.Series(total.view(np.int64), index=df.index)
+
+
+def sql_type_for(series: pd.Series) -> str:
+    """Tipo Postgres para uma coluna nova, a partir do dtype pandas (fallback: text)."""
+    dtype = series.dtype
+    if is_bool_dtype(dtype):
+        return "boolean"
+    if is_integer_dtype(dtype):
+        return "bigint"
+    if is_float_dtype(dtype):
+        return "double precision"
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return "timestamp with time zone"
+    if is_datetime64_any_dtype(dtype):
+        return "timestamp"
+    return "text"
+
+
+def diff_row_hashes(df: pd.DataFrame, key_column: str, existing: pd.DataFrame):
+    """
+    Compara o lote com os pares (key, hash) já gravados (ambos como texto).
+    Retorna (máscara booleana das linhas novas/alteradas, quantidade de linhas novas).
+    Linhas gravadas antes do modo merge (hash nulo) contam como alteradas.
+    """
+    keys = df[key_column].astype(str)
+    known = pd.Series(existing["hash"].values, index=existing["key"].values)
+    previous = keys.map(known)
+    is_new = ~keys.isin(known.index)
+    changed = is_new | previous.isna() | (previous != df[ROW_HASH_COLUMN].astype(str))
+    return changed, int(is_new.sum())
+
+
+# Resultados do infer_dtype que garantem uma coluna sem listas/dicts
+_SCALAR_INFERRED_TYPES = frozenset({
+    "empty", "string", "bytes", "boolean", "integer", "floating", "mixed-integer-float",
+    "decimal", "complex", "datetime", "datetime64", "date", "timedelta", "timedelta64",
+    "time", "period", "interval", "categorical",
+})
+# Saída compacta e UTF-8, igual à do orjson (o hash de conteúdo não muda com o encoder)
+_STDLIB_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps_json(value) -> str:
+    """Serializa um valor em JSON compacto (orjson quando disponível)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass  # Ex.: chaves não-string; a stdlib converte como antes
+    return _STDLIB_JSON_ENCODER.encode(value)
+
+
+def complex_columns(df: pd.DataFrame) -> list:
+    """
+    Colunas com listas/dicts a serializar.
+    Rigor: As colunas declaradas pelo flattener (df.attrs["json_columns"]) dispensam
+    inspeção. Das demais, só as de dtype object são examinadas, e pelo infer_dtype (C):
+    colunas só de strings/números/nulos são descartadas sem percorrer células em Python.
+    """
+    declared = [col for col in df.attrs.get("json_columns", ()) if col in df.columns]
+    found = list(declared)
+    for col in df.columns:
+        if col in declared or df[col].dtype != object:
+            continue
+        values = df[col].to_numpy()
+        if infer_dtype(values, skipna=True) in _SCALAR_INFERRED_TYPES:
+            continue
+        if any(isinstance(value, (list, dict)) for value in values):
+            found.append(col)
+    return found
+
+
+def serialize_json_column(series: pd.Series) -> np.ndarray:
+    """Uma passada pela coluna: nulos viram None, os demais valores viram texto JSON."""
+    nulls = series.isna().to_numpy()
+    return np.array(
+        [None if null else dumps_json(value) for value, null in zip(series.to_numpy(), nulls)],
+        dtype=object
+    )
+
+
+class SerializedJSONB(TypeDecorator):
+    """
+    Coluna jsonb cujo valor já chega serializado (texto JSON do _serialize_complex_columns).
+    Rigor: Sem bind_processor — o texto vai direto ao Postgres, que o converte para jsonb
+    uma única vez na carga (COPY ou INSERT), sem ser serializado de novo.
+    """
+
+    impl = JSONB
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        return None
+
+
+def json_columns_of(df: pd.DataFrame) -> list:
+    """Colunas JSON (já serializadas) marcadas no lote por _serialize_complex_columns."""
+    return [col for col in df.attrs.get("json_columns", ()) if col in df.columns]
+
+
+def declared_types_of(df: pd.DataFrame) -> dict:
+    """
+    {coluna: tipo Postgres} declarados no lote: schema bronze registrado
+    (attrs["column_types"], ver TableSchema.apply) e colunas JSON (jsonb).
+    """
+    types = {col: t for col, t in df.attrs.get("column_types", {}).items() if col in df.columns}
+    types.update({col: "jsonb" for col in json_columns_of(df)})
+    return types
+
+
+# Tipos de entrada que o COPY/INSERT já converte para o tipo da coluna existente (sem DDL)
+COMPATIBLE_TYPES = {
+    ("double precision", "bigint"),
+    ("timestamp without time zone", "timestamp with time zone"),
+    ("timestamp with time zone", "timestamp without time zone"),
+    ("date", "timestamp without time zone"),
+}
+# Colunas inteiramente nulas no lote assumem o tipo da coluna existente
+_NULL_DTYPES = {
+    "bigint": "Int64",
+    "double precision": "Float64",
+    "boolean": "boolean",
+    "timestamp without time zone": "datetime64[ns]",
+    "timestamp with time zone": "datetime64[ns, UTC]",
+    "date": "datetime64[ns]",
+}
+
+
+def canonical_type(pg_type: str) -> str:
+    """Nome do tipo como o format_type do Postgres o devolve (ex.: timestamp -> timestamp without time zone)."""
+    return {"timestamp": "timestamp without time zone", "timestamptz": "timestamp with time zone"}.get(pg_type, pg_type)
+
+
+def widened_type(existing: str, incoming: str):
+    """
+    Tipo para o qual a coluna existente precisa ser alargada para aceitar o tipo de entrada,
+    ou None se ela já o aceita. bigint recebendo double precision vira double precision;
+    demais incompatibilidades viram text (toda representação cabe em text).
+    """
+    existing, incoming = canonical_type(existing), canonical_type(incoming)
+    if existing == incoming or existing == "text" or (existing, incoming) in COMPATIBLE_TYPES:
+        return None
+    if (existing, incoming) == ("bigint", "double precision"):
+        return "double precision"
+    return "text"
+
+
+def incoming_types(df: pd.DataFrame) -> dict:
+    """{coluna: tipo Postgres} do lote: declarado (schema bronze/jsonb) ou inferido do dtype."""
+    declared = declared_types_of(df)
+    return {col: declared.get(col) or canonical_type(sql_type_for(df[col])) for col in df.columns}
+
+
+class SchemaDrift(NamedTuple):
+    """Diferenças entre um lote e a tabela de destino, e o que foi feito com cada uma."""
+    table: str
+    added: dict
+    widened: dict
+    coerced: dict
+
+    def __bool__(self):
+        return bool(self.added or self.widened or self.coerced)
+
+    def to_dict(self) -> dict:
+        return {"table": f"raw.{self.table}", "added": self.added,
+                "widened": self.widened, "coerced": self.coerced}
+
+
+class StagedLoad(NamedTuple):
+    """raw.<tabela>__staging já carregado e commitado, à espera da publicação."""
+    sql: str
+    columns: dict
+    rows: int
+    declared: dict
+
+
+class MergeStage(NamedTuple):
+    """Resultado do staging do modo merge: delta no staging (None sem mudanças) e contagens."""
+    staged: StagedLoad
+    table_exists: bool
+    stats: dict
+    keys: set
+
+
+class MaintenanceReport(NamedTuple):
+    """Manutenção pós-carga de uma tabela: índices criados e tempo (s) de cada etapa."""
+    table: str
+    created_indexes: list
+    seconds: dict
+
+    def to_dict(self) -> dict:
+        return {"table": f"raw.{self.table}", "created_indexes": self.created_indexes,
+                "seconds": {step: round(value, 6) for step, value in self.seconds.items()}}
+
+
+def coerce_to_table(df: pd.DataFrame, table_types: dict, declared=()):
+    """
+    Converte no lote, sem DDL, colunas cujo tipo difere do da tabela mas cujos valores
+    cabem nela: floats inteiros numa coluna bigint (ints com nulo no backend numpy) e
+    colunas inteiramente nulas (que o pandas infere como texto).
+    Retorna (lote, {coluna: tipo da tabela}); colunas declaradas no schema não são tocadas.
+    """
+    coerced = {}
+    json_columns = []
+    for col in df.columns:
+        existing = table_types.get(col)
+        if existing is None or col in declared:
+            continue
+        series = df[col]
+        incoming = canonical_type(sql_type_for(series))
+        if existing == incoming or col in json_columns_of(df):
+            continue
+        if series.isna().all():
+            if existing == "jsonb":
+                json_columns.append(col)
+                coerced[col] = existing
+            elif existing in _NULL_DTYPES:
+                coerced[col] = existing
+        elif (existing, incoming) == ("bigint", "double precision"):
+            values = series.dropna().astype("float64")
+            if (values == np.floor(values)).all():
+                coerced[col] = existing
+    if not coerced:
+        return df, coerced
+    df = df.copy(deep=False)
+    for col, existing in coerced.items():
+        if existing == "jsonb":
+            continue
+        if df[col].isna().all():
+            df[col] = pd.Series(None, index=df.index, dtype=_NULL_DTYPES[existing])
+        else:
+            df[col] = df[col].astype(_NULL_DTYPES[existing])
+    if json_columns:
+        df.attrs["json_columns"] = json_columns_of(df) + json_columns
+    return df, coerced
+
+
+def diff_table_types(table_name: str, existing: dict, incoming: dict, declared=(), coerced=None) -> SchemaDrift:
+    """
+    Compara os tipos de entrada com os da tabela: colunas novas (ADD COLUMN com o tipo de
+    entrada) e tipos a alargar. Colunas declaradas no schema bronze ficam de fora — o tipo
+    delas é garantido por _migrate_column_types.
+    """
+    added = {col: pg_type for col, pg_type in incoming.items() if col not in existing}
+    widened = {}
+    for col, pg_type in incoming.items():
+        if col in existing and col not in declared:
+            new_type = widened_type(existing[col], pg_type)
+            if new_type is not None:
+                widened[col] = new_type
+    return SchemaDrift(table_name, added, widened, dict(coerced or {}))
+
+
+class CatalogCache:
+    """
+    Cache do catálogo do Postgres por processo: schemas garantidos, colunas (com tipo)
+    e índices conhecidos das tabelas raw.
+    Rigor: Evita as idas ao catálogo (CREATE SCHEMA, has_table, get_columns, tipos atuais,
+    CREATE INDEX IF NOT EXISTS) a cada carga. Toda DDL emitida pelo loader invalida a
+    tabela afetada; uma carga que falha (ex.: drift feito por fora, tabela removida)
+    invalida tudo, pois o rollback desfaz também a DDL já registrada.
+    Tabelas de staging (STAGING_SUFFIX) não são cacheadas: são recriadas a cada carga e
+    renomeadas na troca, então uma entrada delas ficaria obsoleta na carga seguinte.
+    """
+
     def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas = set()
+        self._columns = {}
+        self._indexes = {}
+        self._indexed = {}
+
+    def ensure_schema(self, conn, schema: str = "raw"):
+        if schema in self._schemas:
+            return
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {_quote_ident(schema)}"))
+        with self._lock:
+            self._schemas.add(schema)
+
+    def columns(self, conn, table_name: str):
+        """{coluna: tipo Postgres} de raw.<table_name>, na ordem da tabela; None se ela não existe."""
+        with self._lock:
+            if table_name in self._columns:
+                return self._columns[table_name]
+        rows = conn.execute(
+            text("SELECT a.attname, format_type(a.atttypid, a.atttypmod) "
+                 "FROM pg_attribute a "
+                 "WHERE a.attrelid = to_regclass(:qualified) AND a.attnum > 0 AND NOT a.attisdropped "
+                 "ORDER BY a.attnum"),
+            {"qualified": f"raw.{_quote_ident(table_name)}"}
+        ).all()
+        columns = dict(rows) if rows else None
+        if not table_name.endswith(STAGING_SUFFIX):
+            with self._lock:
+                self._columns[table_name] = columns
+        return columns
+
+    def ensure_index(self, conn, table_name: str, index_name: str, ddl: str):
+        """Executa o CREATE INDEX IF NOT EXISTS só na primeira vez por tabela (até a invalidação)."""
+        with self._lock:
+            if index_name in self._indexes.get(table_name, ()):
+                return
+        conn.execute(text(ddl))
+        with self._lock:
+            self._indexes.setdefault(table_name, set()).add(index_name)
+
+    def indexed_columns(self, conn, table_name: str) -> set:
+        """Colunas que já lideram algum índice de raw.<table_name> (ex.: chave única do merge)."""
+        with self._lock:
+            if table_name in self._indexed:
+                return self._indexed[table_name]
+        columns = set(conn.execute(
+            text("SELECT a.attname FROM pg_index i "
+                 "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0] "
+                 "WHERE i.indrelid = to_regclass(:qualified)"),
+            {"qualified": f"raw.{_quote_ident(table_name)}"}
+        ).scalars().all())
+        with self._lock:
+            self._indexed[table_name] = columns
+        return columns
+
+    def invalidate(self, table_name: str = None):
+        """Esquece uma tabela (após DDL nela) ou, sem argumento, todo o catálogo."""
+        with self._lock:
+            if table_name is None:
+                self._schemas.clear()
+                self._columns.clear()
+                self._indexes.clear()
+                self._indexed.clear()
+            else:
+                self._columns.pop(table_name, None)
+                self._indexes.pop(table_name, None)
+                self._indexed.pop(table_name, None)
+
+
+# Métodos de escrita aceitos por load_bronze -> argumento `method` do DataFrame.to_sql
+# "parallel": COPY em shards no staging (swap/merge); nas demais escritas, COPY simples
+LOAD_METHODS = {
+    "copy": copy_insert,
+    "parallel": copy_insert,
+    "multi": "multi",
+    "insert": None,
+}
+
+class PostgresLoader:
+    def __init__(self, concurrent_loads: int = 1):
+        """concurrent_loads: cargas simultâneas no processo (ex.: INGESTION_MAX_WORKERS); dimensiona o pool."""
         self.db_url = os.getenv("DATABASE_URL")
-        self.engine = create_engine(self.db_url)
+        self.engine = create_engine(self.db_url, **pool_settings(concurrent_loads))
+        self.catalog = CatalogCache()
+        self._serializers = None
+        self._serializers_lock = threading.Lock()
+
+    @contextmanager
+    def _transaction(self, con=None):
+        """Reusa a conexão (e a transação) em andamento — publicação ou staging; sem ela, abre uma própria."""
+        if con is not None:
+            yield con
+            return
+        with self.engine.begin() as conn:
+            yield conn
 
     def _serialize_complex_columns(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Serializa listas e dicts para JSON para evitar erro de tipo no Postgres."""
-        df = df.copy()
-        for col in df.columns:
-            if df[col].apply(lambda x: isinstance(x, (list, dict))).any():
-                logger.info(f"Serializando coluna complexa: {col}")
-                df[col] = df[col].apply(lambda x: json.dumps(x) if x is not None else None)
+        """
+        Serializa listas e dicts para JSON para evitar erro de tipo no Postgres.
+        Rigor: Cópia rasa — só as colunas serializadas são novas; as demais continuam
+        compartilhando memória com o DataFrame de origem, que não é alterado.
+        """
+        columns = complex_columns(df)
+        if not columns:
+            return df
+        df = df.copy(deep=False)
+        for col in columns:
+            logger.info(f"Serializando coluna complexa: {col}")
+            df[col] = serialize_json_column(df[col])
+        # Daqui em diante o contrato é "texto JSON": as colunas viram jsonb na carga
+        df.attrs["json_columns"] = columns
         return df
 
-    def load_bronze(self, df: pd.DataFrame, table_name: str):
+    def _prepare_chunks(self, chunks, loaded_at, table_schema=None, children=None):
         """
-        Carga na camada Bronze.
-        Rigor: Garante existência do schema, colunas de auditoria e preserva Views do dbt.
+        Acrescenta loaded_at, aplica o schema bronze (tipos/NOT NULL) e serializa colunas
+        complexas lote a lote (lotes vazios são ignorados).
+        children (ChildCollector): explode os arrays das tabelas ponte antes da serialização.
         """
-        try:
-            # 1. RIGOR: Garantir que o schema 'raw' existe (Auto-preparação do ambiente)
-            with self.engine.connect() as conn:
-                conn.execute(text("CREATE SCHEMA IF NOT EXISTS raw"))
-                conn.commit()
-                logger.info(f"Schema 'raw' verificado/criado para {table_name}.")
+        for chunk in chunks:
+            if chunk is None or chunk.empty:
+                continue
+            chunk['loaded_at'] = loaded_at
+            if table_schema is not None:
+                chunk = table_schema.apply(chunk)
+            if children is not None:
+                children.collect(chunk)
+            yield self._serialize_complex_columns(chunk)
 
-            # 2. Metadado de Observabilidade (Certidão de nascimento do dado)
-            df['loaded_at'] = datetime.now() 
-            
-            # 3. Preparação dos dados
-            df_prepared = self._serialize_complex_columns(df)
+    def _write_frame(self, df: pd.DataFrame, table_name: str, if_exists: str, method: str, con=None):
+        """
+        Escreve o DataFrame em raw.<table_name> com o método de carga escolhido.
+        Colunas JSON são criadas como jsonb (mapeamento explícito; o resto é inferido).
+        Com schema bronze registrado, a tabela é criada pelo DDL explícito (_create_table).
+        Lotes com colunas Arrow no método copy vão direto ao COPY (copy_arrow), sem o
+        to_sql converter cada linha em tupla Python.
+        """
+        if if_exists == 'replace' and df.attrs.get("column_types"):
+            self._create_table(table_name, df, con)
+            if_exists = 'append'
+        elif if_exists != 'append':
+            self.catalog.invalidate(table_name)
+        arrow_copy = method in ("copy", "parallel") and uses_arrow(df)
+        if if_exists != 'append' or not arrow_copy:
+            (df.head(0) if arrow_copy else df).to_sql(
+                name=table_name,
+                con=con if con is not None else self.engine,
+                schema='raw',
+                if_exists=if_exists,
+                index=False,
+                method=LOAD_METHODS[method],
+                chunksize=COPY_CHUNK_SIZE,
+                dtype={col: SerializedJSONB() for col in json_columns_of(df)} or None
+            )
+        if arrow_copy:
+            with self._transaction(con) as conn:
+                copy_arrow(df, table_name, conn)
 
-            # 4. Lógica de Idempotência (Truncate vs Replace)
-            inspector = inspect(self.engine)
-            table_exists = inspector.has_table(table_name, schema='raw')
+    def _create_table(self, table_name: str, frame: pd.DataFrame, con=None, partition_by=None):
+        """
+        (Re)cria raw.<table_name> com DDL explícito: tipos e NOT NULL do schema bronze;
+        colunas fora do schema (auditoria, controle) recebem o tipo do dtype pandas.
+        partition_by: coluna de um PARTITION BY RANGE (tabela particionada, sem partições).
+        """
+        declared = declared_types_of(frame)
+        not_null = set(frame.attrs.get("not_null", ()))
+        definitions = ", ".join(
+            f"{_quote_ident(col)} {declared.get(col) or sql_type_for(frame[col])}"
+            f"{' NOT NULL' if col in not_null else ''}"
+            for col in frame.columns
+        )
+        target_sql = f"raw.{_quote_ident(table_name)}"
+        partitioning = f" PARTITION BY RANGE ({_quote_ident(partition_by)})" if partition_by else ""
+        statements = [f"DROP TABLE IF EXISTS {target_sql}", f"CREATE TABLE {target_sql} ({definitions}){partitioning}"]
+        with self._transaction(con) as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+        self.catalog.invalidate(table_name)
+
+    def _add_columns(self, table_name: str, frame: pd.DataFrame, con=None):
+        """Adiciona à tabela as colunas do frame (tipo declarado ou inferido do dtype pandas)."""
+        declared = declared_types_of(frame)
+        with self._transaction(con) as conn:
+            for col in frame.columns:
+                sql_type = declared.get(col) or sql_type_for(frame[col])
+                conn.execute(text(
+                    f"ALTER TABLE raw.{_quote_ident(table_name)} "
+                    f"ADD COLUMN IF NOT EXISTS {_quote_ident(col)} {sql_type}"
+                ))
+        self.catalog.invalidate(table_name)
+        logger.info(f"Colunas adicionadas em raw.{table_name}: {list(frame.columns)}")
+
+    def _write_chunks(self, chunks, table_name: str, first_if_exists: str, method: str,
+                      known_columns=None, con=None, coerce_to=None, write=None):
+        """
+        Escreve uma sequência de lotes em raw.<table_name>: o primeiro com first_if_exists,
+        os demais em append. Colunas declaradas que a tabela existente ainda guarda com outro
+        tipo (ex.: text de antes do schema) são convertidas antes do append.
+        known_columns: {coluna: tipo} de uma tabela já existente (append direto nela).
+        Cada lote em append é reconciliado com a tabela (_reconcile_chunk): colunas novas
+        viram ADD COLUMN, tipos incompatíveis são alargados e valores compatíveis são
+        convertidos no próprio lote — drift de schema custa só metadado, nunca recriar a tabela.
+        coerce_to: {coluna: tipo} da tabela final quando o destino é o staging; os lotes
+        são convertidos para ela antes de criar o staging.
+        write: escritor de cada lote (padrão _write_frame; o modo parallel usa _copy_sharded).
+        Retorna ({coluna: tipo} gravados, total de linhas, tipos declarados).
+        """
+        write = write or self._write_frame
+        table_types, rows = dict(known_columns or {}), 0
+        declared, coerced = {}, {}
+        for chunk in chunks:
+            new_types = {c: t for c, t in declared_types_of(chunk).items() if c not in declared}
+            if new_types and (table_types or first_if_exists == 'append'):
+                self._migrate_column_types(table_name, new_types, con=con)
+            declared.update(new_types)
+            if coerce_to:
+                chunk, chunk_coerced = coerce_to_table(chunk, coerce_to, declared)
+                coerced.update(chunk_coerced)
+            if not table_types:
+                write(chunk, table_name, first_if_exists, method, con)
+                table_types = incoming_types(chunk)
+            else:
+                chunk = self._reconcile_chunk(table_name, chunk, table_types, declared, con)
+                write(chunk, table_name, 'append', method, con)
+            rows += len(chunk)
+        self._log_drift(SchemaDrift(table_name, {}, {}, coerced))
+        return table_types, rows, declared
 
-            if table_exists:
+    def _reconcile_chunk(self, table_name: str, chunk: pd.DataFrame, table_types: dict, declared, con=None):
+        """
+        Alinha um lote à tabela existente (table_types é atualizado): converte valores
+        compatíveis, adiciona colunas novas e alarga tipos incompatíveis.
+        """
+        chunk, coerced = coerce_to_table(chunk, table_types, declared)
+        drift = diff_table_types(table_name, table_types, incoming_types(chunk), declared, coerced)
+        if drift.added:
+            self._add_columns(table_name, chunk[list(drift.added)], con)
+        if drift.widened:
+            self._migrate_column_types(table_name, drift.widened, con=con)
+        table_types.update(drift.added)
+        table_types.update(drift.widened)
+        self._log_drift(drift)
+        return chunk
+
+    @staticmethod
+    def _log_drift(drift: SchemaDrift):
+        """Relatório estruturado (JSON) do drift; lotes alinhados à tabela não geram log."""
+        if drift:
+            logger.warning(f"Drift de schema em raw.{drift.table}: {json.dumps(drift.to_dict(), ensure_ascii=False)}")
+
+    def _has_dependent_views(self, conn, table_name: str) -> bool:
+        """Verifica se alguma view (ex.: staging do dbt) depende de raw.<table_name>."""
+        return bool(conn.execute(
+            text("""
+                SELECT EXISTS (
+                    SELECT 1
+                    FROM pg_depend d
+                    JOIN pg_rewrite r ON r.oid = d.objid
+                    WHERE d.classid = 'pg_rewrite'::regclass
+                      AND d.refobjid = to_regclass(:qualified)
+                      AND r.ev_class <> d.refobjid
+                )
+            """),
+            {"qualified": f'raw.{_quote_ident(table_name)}'}
+        ).scalar())
+
+    def _dependent_views(self, conn, table_name: str) -> list:
+        """
+        Views que dependem de raw.<table_name>, direta ou indiretamente, na ordem de
+        criação: [(nome qualificado, definição)].
+        """
+        return conn.execute(
+            text("""
+                WITH RECURSIVE deps(oid, depth) AS (
+                    SELECT r.ev_class, 1
+                    FROM pg_depend d
+                    JOIN pg_rewrite r ON r.oid = d.objid
+                    WHERE d.classid = 'pg_rewrite'::regclass
+                      AND d.refobjid = to_regclass(:qualified)
+                      AND r.ev_class <> d.refobjid
+                    UNION
+                    SELECT r.ev_class, deps.depth + 1
+                    FROM deps
+                    JOIN pg_depend d ON d.refobjid = deps.oid
+                    JOIN pg_rewrite r ON r.oid = d.objid
+                    WHERE d.classid = 'pg_rewrite'::regclass
+                      AND r.ev_class <> d.refobjid
+                )
+                SELECT c.oid::regclass::text, pg_get_viewdef(c.oid)
+                FROM deps
+                JOIN pg_class c ON c.oid = deps.oid
+                WHERE c.relkind = 'v'
+                GROUP BY c.oid
+                ORDER BY max(deps.depth)
+            """),
+            {"qualified": f'raw.{_quote_ident(table_name)}'}
+        ).all()
+
+    def _reconcile_staged(self, table_name: str, staged_types: dict, declared=(), con=None):
+        """
+        Alinha raw.<table_name> ao staging antes do INSERT ... SELECT: colunas que ela ainda
+        não tem (ex.: campo novo da API, coluna de overflow) são adicionadas com o tipo do
+        staging e tipos incompatíveis são alargados. Com a tabela no cache do catálogo e
+        nenhuma diferença, nada vai ao banco.
+        """
+        with self._transaction(con) as conn:
+            existing = self.catalog.columns(conn, table_name) or {}
+            drift = diff_table_types(table_name, existing, staged_types, declared)
+            for col, pg_type in drift.added.items():
+                conn.execute(text(
+                    f"ALTER TABLE raw.{_quote_ident(table_name)} "
+                    f"ADD COLUMN IF NOT EXISTS {_quote_ident(col)} {pg_type}"
+                ))
+        if drift.added:
+            self.catalog.invalidate(table_name)
+            logger.info(f"Colunas adicionadas em raw.{table_name}: {list(drift.added)}")
+        if drift.widened:
+            self._migrate_column_types(table_name, drift.widened, con=con)
+        self._log_drift(drift)
+
+    def _migrate_column_types(self, table_name: str, declared: dict, con=None):
+        """
+        Converte colunas de uma tabela existente para o tipo declarado (jsonb, timestamp,
+        bigint...) quando ela ainda as guarda com outro tipo (ex.: text de cargas antigas).
+        Os tipos atuais vêm do cache do catálogo; sem divergência, nada é consultado.
+        Rigor: ALTER COLUMN TYPE é barrado por views dependentes (staging do dbt); as
+        views são recriadas com a mesma definição na mesma transação, então leitores
+        nunca as veem ausentes. Se a conversão falhar, os tipos antigos ficam e a carga
+        segue (o INSERT aplica o cast de atribuição para o tipo antigo); dentro de uma
+        transação em andamento (publicação ou staging), a conversão roda num SAVEPOINT
+        para a falha não abortá-la.
+        """
+        target_sql = f'raw.{_quote_ident(table_name)}'
+        with self._transaction(con) as conn:
+            current = self.catalog.columns(conn, table_name) or {}
+        changes = {col: pg_type for col, pg_type in declared.items() if current.get(col, pg_type) != pg_type}
+        if not changes:
+            return
+        try:
+            with self._transaction(con) as conn, (conn.begin_nested() if con is not None else nullcontext()):
+                conn.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+                views = self._dependent_views(conn, table_name)
+                for name, _ in reversed(views):
+                    conn.execute(text(f"DROP VIEW {name}"))
+                for col, pg_type in changes.items():
+                    col_sql = _quote_ident(col)
+                    conn.execute(text(
+                        f"ALTER TABLE {target_sql} ALTER COLUMN {col_sql} TYPE {pg_type} "
+                        f"USING {col_sql}::{pg_type}"
+                    ))
+                for name, definition in views:
+                    conn.execute(text(f"CREATE VIEW {name} AS {definition}"))
+            logger.info(f"Tipos convertidos em raw.{table_name}: {changes} ({len(views)} views recriadas).")
+        except Exception as e:
+            logger.warning(f"Tipos de raw.{table_name} mantidos: {e}")
+        finally:
+            self.catalog.invalidate(table_name)
+
+    def _load_truncate(self, chunks, table_name: str, method: str, con=None):
+        """
+        Estratégia clássica: TRUNCATE + append (ou criação na primeira carga).
+        Na transação de publicação (com os lotes já materializados), leitores esperam o
+        COMMIT em vez de ver a tabela vazia, e uma falha desfaz também o TRUNCATE.
+        """
+        with self._transaction(con) as conn:
+            known_columns = self.catalog.columns(conn, table_name)
+
+            if known_columns is not None:
                 # Se a tabela existe, limpa os dados mas mantém a estrutura para o dbt
-                with self.engine.connect() as conn:
-                    conn.execute(text(f'TRUNCATE TABLE raw."{table_name}"'))
-                    conn.commit()
+                conn.execute(text(f'TRUNCATE TABLE raw."{table_name}"'))
                 mode = 'append'
+                known_columns = dict(known_columns)
                 logger.info(f"Tabela raw.{table_name} truncada.")
             else:
                 # Se não existe, cria a tabela do zero
                 mode = 'replace'
                 logger.info(f"Criando tabela raw.{table_name} pela primeira vez.")
 
-            # 5. Carga Final
-            df_prepared.to_sql(
-                name=table_name,
-                con=self.engine,
-                schema='raw',
-                if_exists=mode,
-                index=False
+            _, rows, _ = self._write_chunks(chunks, table_name, mode, method, known_columns, conn)
+        return mode, rows
+
+    def _load_staging(self, chunks, table_name: str, method: str, unlogged: bool) -> StagedLoad:
+        """
+        (Re)cria raw.<tabela>__staging a partir do primeiro lote e carrega todos os lotes nela.
+        Rigor: Roda antes da transação de publicação, numa conexão própria com COMMIT ao
+        fim: o consumo do stream (rede, paginação, retries) e o drift do staging não seguram
+        lock nenhum da tabela final — troca, TRUNCATE, ALTERs e índices ficam na transação
+        curta de publicação, que só lê o staging pronto. Uma falha deixa só o staging para
+        trás (recriado na próxima carga). Os lotes são convertidos para os tipos da tabela
+        final (quando ela existe) antes de o staging ser criado.
+        No modo parallel, cada lote é dividido em shards de até COPY_SHARD_ROWS linhas,
+        serializados em CSV em processos worker e copiados em paralelo por
+        BRONZE_COPY_WORKERS conexões do pool (_copy_sharded); como essas conexões só
+        enxergam o que já foi commitado, o staging (e cada ALTER de drift) é commitado antes
+        dos COPYs.
+        """
+        chunks = iter(chunks)
+        first = next(chunks, None)
+        if first is None:
+            raise ValueError(f"Nenhum dado para carregar em raw.{table_name}.")
+        staging = table_name + STAGING_SUFFIX
+        staging_sql = f'raw.{_quote_ident(staging)}'
+        parallel = method == "parallel"
+
+        with self.engine.connect() as admin:
+            coerce_to = self.catalog.columns(admin, table_name)
+            # Estrutura do staging já com os tipos convertidos (o lote é convertido em _write_chunks)
+            template = coerce_to_table(first, coerce_to, declared_types_of(first))[0] if coerce_to else first
+            admin.execute(text(f"DROP TABLE IF EXISTS {staging_sql}"))
+            self._write_frame(template.head(0), staging, 'replace', "copy" if parallel else method, admin)
+            if unlogged:
+                admin.execute(text(f"ALTER TABLE {staging_sql} SET UNLOGGED"))
+            copiers = ThreadPoolExecutor(copy_workers(), thread_name_prefix="copy-shard") if parallel else nullcontext()
+            with copiers:
+                columns, rows, declared = self._write_chunks(
+                    itertools.chain([first], chunks), staging, 'append', method, con=admin, coerce_to=coerce_to,
+                    write=partial(self._copy_sharded, copiers=copiers) if parallel else None
+                )
+            admin.commit()
+        return StagedLoad(staging_sql, columns, rows, declared)
+
+    def _serializer_pool(self) -> ProcessPoolExecutor:
+        """
+        Processos de serialização do modo parallel, criados na primeira carga e reusados.
+        Rigor: forkserver (spawn fora do POSIX) — a carga roda em threads, e fork de um
+        processo com threads pode herdar locks presos.
+        """
+        with self._serializers_lock:
+            if self._serializers is None:
+                start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._serializers = ProcessPoolExecutor(
+                    copy_workers(), mp_context=multiprocessing.get_context(start_method)
+                )
+            return self._serializers
+
+    def close(self):
+        """
+        Encerra os processos de serialização do modo parallel e fecha as conexões do pool.
+        Rigor: Os workers do ProcessPoolExecutor vivem até o shutdown; sem ele, ficam
+        órfãos (ou seguram a saída do processo) quando o motor termina.
+        """
+        with self._serializers_lock:
+            if self._serializers is not None:
+                self._serializers.shutdown()
+                self._serializers = None
+        self.engine.dispose()
+
+    def _copy_sharded(self, df: pd.DataFrame, table_name: str, if_exists: str, method: str, con=None,
+                      copiers=None) -> int:
+        """
+        Escreve um lote em raw.<table_name> em shards paralelos (escritor do _write_chunks no
+        modo parallel). Lotes que cabem num shard vão por COPY na própria conexão de
+        coordenação, sem processo nem conexão extra.
+        """
+        if len(df) <= COPY_SHARD_ROWS:
+            self._write_frame(df, table_name, 'append', "copy", con)
+            return len(df)
+        # DDL do coordenador (staging, colunas novas) e lotes anteriores visíveis aos shards
+        con.commit()
+        shard_rows = min(COPY_SHARD_ROWS, -(-len(df) // copy_workers()))
+        serializers = self._serializer_pool()
+        payloads = [serializers.submit(serialize_copy_shard, df.iloc[start:start + shard_rows])
+                    for start in range(0, len(df), shard_rows)]
+        copies = [copiers.submit(self._copy_shard, table_name, list(df.columns), payload)
+                  for payload in payloads]
+        return sum(copy.result() for copy in copies)
+
+    def _copy_shard(self, table_name: str, columns, payload) -> int:
+        """COPY de um shard serializado numa conexão própria do pool (commit por shard)."""
+        data, arrow = payload.result()
+        columns_sql = ", ".join(_quote_ident(c) for c in columns)
+        options = "FORMAT csv" if arrow else f"FORMAT csv, NULL '{COPY_NULL}'"
+        with self.engine.begin() as conn:
+            with conn.connection.cursor() as cur:
+                cur.copy_expert(
+                    f"COPY raw.{_quote_ident(table_name)} ({columns_sql}) FROM STDIN WITH ({options})",
+                    io.BytesIO(data)
+                )
+                return cur.rowcount
+
+    def _publish_swap(self, staged: StagedLoad, table_name: str, unlogged: bool, con=None):
+        """
+        Estratégia de troca atômica: publica o raw.<tabela>__staging já carregado (_load_staging).
+        Sem views dependentes, o staging é renomeado para o lugar da tabela: só metadado, sob
+        um ACCESS EXCLUSIVE de instantes (limitado por SWAP_LOCK_TIMEOUT na fila de leitores).
+        Com views do dbt (o caso de produção), a tabela é mantida e o conteúdo é trocado com
+        DELETE + INSERT ... SELECT na mesma transação.
+        Rigor: DELETE toma só ROW EXCLUSIVE, que não conflita com SELECT: leitores (dbt,
+        Metabase) seguem no snapshot antigo (MVCC) durante a cópia e veem o lote novo no
+        COMMIT, nunca uma tabela vazia nem uma espera. As tuplas antigas ficam para o
+        (auto)VACUUM. Só drift de colunas/tipos leva ALTER (ACCESS EXCLUSIVE) à tabela.
+        Uma falha durante a carga deixa a tabela final intacta.
+        """
+        target_sql = f'raw.{_quote_ident(table_name)}'
+        staging_sql, staged_columns, rows, declared = staged
+
+        with self._transaction(con) as conn:
+            target_types = self.catalog.columns(conn, table_name)
+            table_exists = target_types is not None
+            has_views = table_exists and self._has_dependent_views(conn, table_name)
+            # Renomear mantém o OID antigo nas views; só vale sem dependentes
+            if unlogged and not has_views:
+                conn.execute(text(f"ALTER TABLE {staging_sql} SET LOGGED"))
+            if has_views:
+                # A tabela é mantida: alinha colunas e tipos (ex.: text antigo) antes da cópia
+                self._reconcile_staged(table_name, staged_columns, declared, conn)
+                self._migrate_column_types(table_name, declared, con=conn)
+
+            # Troca; lock_timeout evita fila atrás de leituras longas
+            conn.execute(text(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'"))
+            if not table_exists:
+                conn.execute(text(f"ALTER TABLE {staging_sql} RENAME TO {_quote_ident(table_name)}"))
+                self.catalog.invalidate(table_name)
+                return 'swap-create', rows
+
+            if has_views:
+                # Views do dbt apontam para o OID da tabela: troca o conteúdo, não a tabela.
+                # DELETE (e não TRUNCATE) para não bloquear leitores durante a cópia
+                columns = ", ".join(_quote_ident(c) for c in staged_columns)
+                conn.execute(text(f"DELETE FROM {target_sql}"))
+                conn.execute(text(
+                    f"INSERT INTO {target_sql} ({columns}) SELECT {columns} FROM {staging_sql}"
+                ))
+                conn.execute(text(f"DROP TABLE {staging_sql}"))
+                return 'swap-copy', rows
+
+            old = _quote_ident(f"{table_name}__old")
+            conn.execute(text(f"ALTER TABLE {target_sql} RENAME TO {old}"))
+            conn.execute(text(f"ALTER TABLE {staging_sql} RENAME TO {_quote_ident(table_name)}"))
+            conn.execute(text(f"DROP TABLE raw.{old}"))
+            self.catalog.invalidate(table_name)
+            return 'swap-rename', rows
+
+    def _stage_merge(self, chunks, table_name: str, method: str, unlogged: bool, key_column: str) -> MergeStage:
+        """
+        Estratégia incremental, etapa de staging: só linhas novas ou alteradas vão para
+        raw.<tabela>__staging (_load_staging).
+        Rigor: O hash de conteúdo (_row_hash) de cada linha é comparado com o já gravado;
+        só o delta passa pelo staging e pelo INSERT ... ON CONFLICT (key) DO UPDATE,
+        reduzindo escrita, WAL e churn de índice a O(mudanças) em vez de O(histórico).
+        Os pares (chave, hash) são lidos numa conexão própria, sem lock que bloqueie
+        escritas; o ON CONFLICT da publicação (_publish_merge) decide o resultado final.
+        """
+        target_sql = f'raw.{_quote_ident(table_name)}'
+        key_sql = _quote_ident(key_column)
+
+        existing = pd.DataFrame({"key": [], "hash": []})
+        with self.engine.connect() as conn:
+            known_columns = self.catalog.columns(conn, table_name)
+            if known_columns is not None:
+                # Detecção de mudanças no cliente: só (chave, hash) trafegam do banco
+                if {ROW_HASH_COLUMN, DELETED_AT_COLUMN} <= set(known_columns):
+                    query = (f"SELECT {key_sql}::text AS key, {ROW_HASH_COLUMN}::text AS hash "
+                             f"FROM {target_sql} WHERE {DELETED_AT_COLUMN} IS NULL")
+                else:
+                    # Tabela anterior ao modo merge: sem hash gravado, toda linha conta como alterada
+                    query = f"SELECT {key_sql}::text AS key, NULL::text AS hash FROM {target_sql}"
+                existing = pd.read_sql(text(query), conn)
+        table_exists = known_columns is not None
+
+        seen_keys = set()
+        stats = {"rows": 0, "inserted": 0, "changed": 0}
+
+        def delta():
+            for chunk in chunks:
+                if key_column not in chunk.columns:
+                    raise ValueError(f"Modo merge exige a coluna chave '{key_column}' em {table_name}.")
+                chunk = chunk[chunk[key_column].notna()].drop_duplicates(subset=[key_column], keep="last")
+                # Chaves repetidas entre lotes fariam o ON CONFLICT afetar a mesma linha duas vezes
+                chunk = chunk[~chunk[key_column].astype(str).isin(seen_keys)]
+                seen_keys.update(chunk[key_column].astype(str))
+                chunk = chunk.assign(**{ROW_HASH_COLUMN: compute_row_hash(chunk)})
+                stats["rows"] += len(chunk)
+
+                if table_exists:
+                    changed_mask, inserted = diff_row_hashes(chunk, key_column, existing)
+                    chunk = chunk[changed_mask]
+                else:
+                    chunk = chunk.assign(**{DELETED_AT_COLUMN: pd.Series(pd.NaT, index=chunk.index,
+                                                                         dtype="datetime64[ns]")})
+                    inserted = len(chunk)
+                stats["inserted"] += inserted
+                stats["changed"] += len(chunk)
+                if not chunk.empty:
+                    yield chunk
+
+        if not table_exists:
+            return MergeStage(self._load_staging(delta(), table_name, method, unlogged), False, stats, seen_keys)
+
+        changes = delta()
+        first_change = next(changes, None)
+        staged = None
+        if first_change is not None:
+            staged = self._load_staging(itertools.chain([first_change], changes), table_name, method, unlogged)
+        return MergeStage(staged, True, stats, seen_keys)
+
+    def _publish_merge(self, stage: MergeStage, table_name: str, unlogged: bool, key_column: str,
+                       tombstone: bool, con=None):
+        """
+        Estratégia incremental, etapa de publicação: upsert do delta do staging
+        (_stage_merge) com INSERT ... ON CONFLICT (key) DO UPDATE.
+        Com tombstone=True, chaves ausentes do lote recebem _deleted_at (soft delete);
+        só faz sentido quando o lote contém o universo completo do endpoint.
+        """
+        staged, table_exists, stats, seen_keys = stage
+        target_sql = f'raw.{_quote_ident(table_name)}'
+        key_sql = _quote_ident(key_column)
+        index_name = table_name + "__key"
+        index_ddl = f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote_ident(index_name)} ON {target_sql} ({key_sql})"
+
+        with self._transaction(con) as conn:
+            if not table_exists:
+                self._publish_swap(staged, table_name, unlogged, conn)
+                self.catalog.ensure_index(conn, table_name, index_name, index_ddl)
+                logger.info(f"Merge raw.{table_name}: tabela criada com {stats['rows']} linhas.")
+                return 'merge-create', stats["rows"]
+
+            # 1. Garante colunas de controle e índice único exigido pelo ON CONFLICT
+            known_columns = self.catalog.columns(conn, table_name) or {}
+            if not {ROW_HASH_COLUMN, DELETED_AT_COLUMN} <= set(known_columns):
+                conn.execute(text(f"ALTER TABLE {target_sql} ADD COLUMN IF NOT EXISTS {ROW_HASH_COLUMN} bigint"))
+                conn.execute(text(f"ALTER TABLE {target_sql} ADD COLUMN IF NOT EXISTS {DELETED_AT_COLUMN} timestamp"))
+                self.catalog.invalidate(table_name)
+            self.catalog.ensure_index(conn, table_name, index_name, index_ddl)
+
+            # 2. Upsert do delta via staging
+            if staged is not None:
+                staging_sql, staged_columns, _, declared = staged
+                self._reconcile_staged(table_name, staged_columns, declared, conn)
+                self._migrate_column_types(table_name, declared, con=conn)
+                columns = [_quote_ident(c) for c in staged_columns]
+                updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in columns if c != key_sql)
+                conn.execute(text(
+                    f"INSERT INTO {target_sql} ({', '.join(columns)}) "
+                    f"SELECT {', '.join(columns)} FROM {staging_sql} "
+                    f"ON CONFLICT ({key_sql}) DO UPDATE SET {updates}, {DELETED_AT_COLUMN} = NULL"
+                ))
+                conn.execute(text(f"DROP TABLE {staging_sql}"))
+
+            # 3. Tombstone opcional das chaves que sumiram da origem
+            tombstoned = 0
+            if tombstone:
+                tombstoned = conn.execute(
+                    text(f"UPDATE {target_sql} SET {DELETED_AT_COLUMN} = now() "
+                         f"WHERE {DELETED_AT_COLUMN} IS NULL AND NOT ({key_sql}::text = ANY(:keys))"),
+                    {"keys": list(seen_keys)}
+                ).rowcount
+
+        updated = stats["changed"] - stats["inserted"]
+        logger.info(
+            f"Merge raw.{table_name}: {stats['inserted']} novas, {updated} alteradas, "
+            f"{stats['rows'] - stats['changed']} inalteradas, {tombstoned} tombstones."
+        )
+        return 'merge', stats["rows"]
+
+    def _ensure_partitions(self, history: str, days, conn) -> list:
+        """Cria (se faltarem) as partições diárias raw.<history>_p<AAAAMMDD> dos dias do lote."""
+        created = []
+        for day in days:
+            partition = f"{history}_p{day:%Y%m%d}"
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS raw.{_quote_ident(partition)} PARTITION OF raw.{_quote_ident(history)} "
+                f"FOR VALUES FROM ('{day:%Y-%m-%d}') TO ('{day + pd.Timedelta(days=1):%Y-%m-%d}')"
+            ))
+            created.append(partition)
+        return created
+
+    def _prune_partitions(self, history: str, newest_day, retention_days: int, conn) -> list:
+        """
+        Remove as partições com mais de retention_days dias em relação ao lote mais novo.
+        Rigor: A idade vem do nome da partição (criada por _ensure_partitions); partições
+        com outro nome (ex.: criadas à mão) nunca são removidas.
+        """
+        if not retention_days:
+            return []
+        oldest_kept = (newest_day - pd.Timedelta(days=retention_days - 1)).strftime("%Y%m%d")
+        partitions = conn.execute(
+            text("SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                 "WHERE i.inhparent = to_regclass(:parent)"),
+            {"parent": f"raw.{_quote_ident(history)}"}
+        ).scalars().all()
+        prefix = f"{history}_p"
+        dropped = sorted(
+            name for name in partitions
+            if name.startswith(prefix) and name[len(prefix):].isdigit() and name[len(prefix):] < oldest_kept
+        )
+        for name in dropped:
+            conn.execute(text(f"DROP TABLE raw.{_quote_ident(name)}"))
+        return dropped
+
+    def _load_history(self, chunks, table_name: str, method: str, loaded_at, retention_days=None,
+                      current_of=None, con=None):
+        """
+        Estratégia append-only com histórico: cada execução acrescenta o lote a
+        raw.<tabela>_history, particionada por dia (PARTITION BY RANGE na coluna
+        ingestion_timestamp; lotes sem ela recebem loaded_at), e raw.<tabela>_current
+        expõe só o lote mais recente. Partições além de retention_days
+        (BRONZE_HISTORY_RETENTION_DAYS) são removidas na mesma transação.
+        Rigor: A view filtra pelo max(ingestion_timestamp), resolvido antes da leitura
+        (initplan); com isso o Postgres poda as partições em tempo de execução e as
+        leituras diárias do dbt tocam uma única partição, qualquer que seja o histórico.
+        current_of: tabela histórica do pai (tabelas ponte), cujo lote define o atual.
+        Retorna (modo, linhas, timestamp do lote).
+        """
+        if retention_days is None:
+            retention_days = int(os.getenv("BRONZE_HISTORY_RETENTION_DAYS", DEFAULT_HISTORY_RETENTION_DAYS))
+        history = table_name + HISTORY_SUFFIX
+        column = HISTORY_PARTITION_COLUMN
+        history_sql, column_sql = f"raw.{_quote_ident(history)}", _quote_ident(column)
+        batch = {"days": set(), "latest": None}
+
+        def stamped(chunks):
+            for chunk in chunks:
+                if column not in chunk.columns or chunk[column].isna().any():
+                    chunk = chunk.assign(**{column: chunk[column].fillna(loaded_at) if column in chunk.columns
+                                            else loaded_at})
+                yield chunk
+
+        def partitioned(chunks, conn):
+            # Partições dos dias do lote criadas antes do COPY de cada lote
+            for chunk in chunks:
+                stamps = pd.to_datetime(chunk[column])
+                days = set(stamps.dt.floor("D").unique()) - batch["days"]
+                if days:
+                    self._ensure_partitions(history, sorted(days), conn)
+                    batch["days"].update(days)
+                if not stamps.empty:
+                    latest = stamps.max()
+                    batch["latest"] = latest if batch["latest"] is None else max(batch["latest"], latest)
+                yield chunk
+
+        with self._transaction(con) as conn:
+            known_columns = self.catalog.columns(conn, history)
+            chunks = stamped(chunks)
+            first = next(chunks, None)
+            if first is None:
+                raise ValueError(f"Nenhum dado para carregar em raw.{history}.")
+            mode = 'history'
+            if known_columns is None:
+                self._create_table(history, first.head(0), conn, partition_by=column)
+                known_columns, mode = self.catalog.columns(conn, history), 'history-create'
+            self.catalog.ensure_index(
+                conn, history, f"{history}__{column}",
+                f"CREATE INDEX IF NOT EXISTS {_quote_ident(history + '__' + column)} ON {history_sql} ({column_sql})"
+            )
+            columns, rows, _ = self._write_chunks(
+                partitioned(itertools.chain([first], chunks), conn), history, 'append', method, dict(known_columns), conn
+            )
+
+            # View do lote atual: recriada só quando a tabela ganhou colunas (ou não existia)
+            current = table_name + CURRENT_SUFFIX
+            if mode == 'history-create' or set(columns) != set(known_columns):
+                source_sql = f"raw.{_quote_ident(current_of or history)}"
+                conn.execute(text(
+                    f"CREATE OR REPLACE VIEW raw.{_quote_ident(current)} AS "
+                    f"SELECT * FROM {history_sql} WHERE {column_sql} = (SELECT max({column_sql}) FROM {source_sql})"
+                ))
+
+            dropped = self._prune_partitions(history, max(batch["days"]), retention_days, conn) if batch["days"] else []
+        if dropped:
+            logger.info(f"Retenção de raw.{history} ({retention_days} dias): partições removidas {dropped}.")
+        return mode, rows, batch["latest"]
+
+    def _stage_child(self, child, children, method: str, unlogged: bool, loaded_at):
+        """
+        Staging da tabela ponte nos modos swap/merge (_load_staging), antes da transação de
+        publicação. Retorna None quando nenhum pai do lote tinha elementos no array.
+        """
+        chunks = list(self._prepare_chunks([children.frame(child)], loaded_at))
+        return self._load_staging(chunks, child.name, method, unlogged) if chunks else None
+
+    def _load_child(self, child, children, strategy: str, method: str, unlogged: bool, loaded_at, con=None,
+                    history=None, staged=None):
+        """
+        Carrega a tabela ponte raw.<child.name> com a estratégia do pai.
+        swap/truncate: a tabela passa a refletir o lote inteiro. merge: as linhas dos pais
+        presentes no lote são substituídas (DELETE + INSERT na mesma transação), o que
+        cobre elementos removidos do array na origem. history: as linhas entram no
+        histórico com o ingestion_timestamp do lote do pai (history = (tabela do pai,
+        timestamp do lote, retenção)); a view _current segue o lote atual do pai.
+        staged: staging da tabela ponte (_stage_child) nos modos swap/merge.
+        Rigor: Índice na chave do pai, para o dbt fazer joins por igualdade em vez de
+        jsonb_array_elements a cada build.
+        """
+        target_sql = f'raw.{_quote_ident(child.name)}'
+        key_sql = _quote_ident(child.key_column)
+        frame = children.frame(child)
+        if history is not None:
+            frame = frame.assign(**{HISTORY_PARTITION_COLUMN: history[1]})
+        # swap/merge já chegam com o staging carregado
+        chunks = list(self._prepare_chunks([frame], loaded_at)) if strategy in ("truncate", "history") else []
+        rows = staged.rows if staged is not None else len(frame)
+
+        with self._transaction(con) as conn:
+            table_exists = self.catalog.columns(conn, child.name) is not None
+            if history is not None:
+                parent, _, retention_days = history
+                batch = chunks or [frame.assign(loaded_at=pd.Series(dtype="datetime64[ns]"))]
+                mode, rows, _ = self._load_history(
+                    batch, child.name, method, loaded_at, retention_days, parent + HISTORY_SUFFIX, conn
+                )
+                target_sql, index_table = f'raw.{_quote_ident(child.name + HISTORY_SUFFIX)}', child.name + HISTORY_SUFFIX
+            elif not table_exists and not chunks and staged is None:
+                empty = frame.assign(loaded_at=pd.Series(dtype="datetime64[ns]"))
+                self._write_frame(empty, child.name, 'replace', method, conn)
+                mode = 'create'
+            elif strategy == "merge" and table_exists:
+                if staged is not None:
+                    self._reconcile_staged(child.name, staged.columns, staged.declared, conn)
+                    self._migrate_column_types(child.name, staged.declared, con=conn)
+                conn.execute(
+                    text(f"DELETE FROM {target_sql} WHERE {key_sql}::text = ANY(:keys)"),
+                    {"keys": children.parent_keys(child)}
+                )
+                if staged is not None:
+                    columns = ", ".join(_quote_ident(c) for c in staged.columns)
+                    conn.execute(text(f"INSERT INTO {target_sql} ({columns}) SELECT {columns} FROM {staged.sql}"))
+                    conn.execute(text(f"DROP TABLE {staged.sql}"))
+                mode = 'merge-replace'
+            elif not chunks and staged is None:
+                conn.execute(text(f"TRUNCATE TABLE {target_sql}"))
+                mode = 'truncate'
+            elif strategy == "truncate":
+                mode, rows = self._load_truncate(chunks, child.name, method, conn)
+            else:
+                mode, rows = self._publish_swap(staged, child.name, unlogged, conn)
+
+            index_table = index_table if history is not None else child.name
+            index_name = index_table + '__' + child.key_column
+            self.catalog.ensure_index(
+                conn, index_table, index_name,
+                f"CREATE INDEX IF NOT EXISTS {_quote_ident(index_name)} ON {target_sql} ({key_sql})"
             )
-            logger.info(f"Sucesso: raw.{table_name} carregada ({len(df)} linhas) via {mode}.")
+        logger.info(f"Tabela ponte raw.{child.name} carregada ({rows} linhas) via {mode}/{method}.")
+
+    def _maintain(self, table_name: str, index_columns=(), con=None) -> MaintenanceReport:
+        """
+        Manutenção pós-carga de raw.<table_name>, dentro da transação de publicação: cria os
+        índices das colunas de join/filtro declaradas no schema bronze (TableSchema.indexes)
+        que ainda não lideram nenhum índice e roda ANALYZE.
+        Rigor: Uma troca (swap) publica uma tabela nova, sem índices nem estatísticas; sem
+        elas o planner do dbt escolhe seq scans e nested loops nos joins por id e nos
+        filtros por data. O ANALYZE entra no mesmo COMMIT, então ninguém lê a tabela nova
+        com as estatísticas da antiga.
+        """
+        target_sql = f"raw.{_quote_ident(table_name)}"
+        seconds, created = {}, []
+        with self._transaction(con) as conn:
+            started = time.perf_counter()
+            columns = self.catalog.columns(conn, table_name) or {}
+            indexed = self.catalog.indexed_columns(conn, table_name)
+            for col in index_columns:
+                if col not in columns or col in indexed:
+                    continue
+                index_name = f"{table_name}__{col}"
+                self.catalog.ensure_index(
+                    conn, table_name, index_name,
+                    f"CREATE INDEX IF NOT EXISTS {_quote_ident(index_name)} ON {target_sql} ({_quote_ident(col)})"
+                )
+                indexed.add(col)
+                created.append(index_name)
+            seconds["indexes"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            conn.execute(text(f"ANALYZE {target_sql}"))
+            seconds["analyze"] = time.perf_counter() - started
+        return MaintenanceReport(table_name, created, seconds)
+
+    def _vacuum(self, reports, interval_hours: float):
+        """
+        VACUUM agendado: roda nas tabelas cujo último VACUUM (manual ou autovacuum) tem mais
+        de interval_hours horas — nas tabelas particionadas, o da partição mais atrasada.
+        Rigor: VACUUM não roda dentro de transação; usa uma conexão em autocommit depois do
+        COMMIT da carga. Falhas só geram aviso (a carga já está publicada).
+        """
+        try:
+            with self.engine.connect() as conn:
+                conn.execution_options(isolation_level="AUTOCOMMIT")
+                for report in reports:
+                    target_sql = f"raw.{_quote_ident(report.table)}"
+                    due = conn.execute(
+                        text("""
+                            SELECT min(coalesce(greatest(s.last_vacuum, s.last_autovacuum), '-infinity'))
+                                   < now() - make_interval(secs => :seconds)
+                            FROM pg_stat_user_tables s
+                            JOIN pg_class c ON c.oid = s.relid AND c.relkind <> 'p'
+                            WHERE s.relid = to_regclass(:qualified)
+                               OR s.relid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:qualified))
+                        """),
+                        {"qualified": target_sql, "seconds": interval_hours * 3600}
+                    ).scalar()
+                    if due:
+                        started = time.perf_counter()
+                        conn.execute(text(f"VACUUM {target_sql}"))
+                        report.seconds["vacuum"] = time.perf_counter() - started
+        except Exception as e:
+            logger.warning(f"VACUUM pós-carga não executado: {e}")
+
+    def load_bronze(self, df, table_name: str, method: str = None,
+                    strategy: str = None, unlogged: bool = None,
+                    key_column: str = "id", tombstone: bool = False, schema=None,
+                    retention_days: int = None, maintenance: bool = None):
+        """
+        Carga na camada Bronze.
+        Rigor: Garante existência do schema, colunas de auditoria e preserva Views do dbt.
+
+        df: um DataFrame ou um iterável/gerador de DataFrames (lotes), consumido em
+        streaming — ex.: PaginatedQueryExtractor.iter_chunks().
+        method: 'copy' (padrão, COPY FROM STDIN em lotes), 'parallel' (COPY em shards
+        paralelos no staging dos modos swap/merge, com BRONZE_COPY_WORKERS processos e
+        conexões; truncate/history seguem com um COPY só), 'multi' (INSERT multi-valores)
+        ou 'insert' (INSERT linha a linha do pandas). Padrão global via BRONZE_LOAD_METHOD.
+        strategy: 'swap' (padrão, carga em raw.<tabela>__staging + troca atômica) ou
+        'truncate' (TRUNCATE + append) ou 'merge' (upsert incremental por key_column,
+        com detecção de mudanças por hash e tombstone opcional) ou 'history' (append-only em
+        raw.<tabela>_history, particionada por dia de ingestion_timestamp, com o lote atual
+        em raw.<tabela>_current). Padrão via BRONZE_LOAD_STRATEGY.
+        retention_days: dias de partições mantidos no modo history (padrão via
+        BRONZE_HISTORY_RETENTION_DAYS; 0 mantém tudo).
+        maintenance: manutenção pós-carga (_maintain) do pai e das tabelas ponte — índices
+        de TableSchema.indexes e ANALYZE (padrão via BRONZE_MAINTENANCE) —, mais VACUUM
+        quando o último tem mais de BRONZE_VACUUM_INTERVAL_HOURS horas (padrão 0 = nunca).
+        unlogged: staging UNLOGGED nos modos swap/merge (padrão via BRONZE_STAGING_UNLOGGED).
+        Listas/dicts são gravados em colunas jsonb (tabelas antigas com text são convertidas).
+        schema: nome do schema bronze registrado (SchemaFactory.get_table_schema) ou um
+        TableSchema; define tipos Postgres e NOT NULL no DDL e tipa os lotes na ingestão.
+        Arrays declarados em schema.children são explodidos em tabelas ponte
+        (ex.: raw.spacex_launch_payloads), carregadas depois do pai com a mesma estratégia.
+        Nos modos swap/merge, o stream é consumido antes da publicação, num staging carregado
+        e commitado em conexão própria (_load_staging); truncate/history materializam os
+        lotes. A publicação (pai e tabelas ponte) roda numa única transação curta, numa
+        conexão do pool; schemas, tabelas e colunas vêm do cache de catálogo do processo
+        (CatalogCache).
+        """
+        method = (method or os.getenv("BRONZE_LOAD_METHOD", "copy")).lower()
+        if method not in LOAD_METHODS:
+            raise ValueError(f"Método de carga inválido: {method}. Use um de {sorted(LOAD_METHODS)}.")
+        strategy = (strategy or os.getenv("BRONZE_LOAD_STRATEGY", "swap")).lower()
+        if strategy not in LOAD_STRATEGIES:
+            raise ValueError(f"Estratégia de carga inválida: {strategy}. Use uma de {list(LOAD_STRATEGIES)}.")
+        if unlogged is None:
+            unlogged = os.getenv("BRONZE_STAGING_UNLOGGED", "false").lower() in ("1", "true", "yes")
+        if maintenance is None:
+            maintenance = os.getenv("BRONZE_MAINTENANCE", "true").lower() in ("1", "true", "yes")
+        table_schema = SchemaFactory.get_table_schema(schema) if isinstance(schema, str) else schema
+
+        try:
+            # 1. RIGOR: Garantir que o schema 'raw' existe (uma vez por processo, via cache);
+            # commitado à parte, pois o staging é criado em outras conexões
+            with self.engine.begin() as conn:
+                self.catalog.ensure_schema(conn)
+
+            # 2. Metadado de Observabilidade (Certidão de nascimento do dado)
+            # 3. Preparação dos dados (lote a lote)
+            chunks = [df] if isinstance(df, pd.DataFrame) else df
+            loaded_at = datetime.now()
+            children = ChildCollector(table_schema) if table_schema is not None and table_schema.children else None
+            prepared = self._prepare_chunks(chunks, loaded_at, table_schema, children)
+
+            # 4. Staging fora da transação de publicação: o stream (rede, paginação, retries) é
+            # consumido sem lock nas tabelas finais. truncate/history escrevem direto na tabela
+            # final, então os lotes são materializados antes de a transação abrir.
+            staged, staged_children = None, {}
+            if strategy == "merge":
+                staged = self._stage_merge(prepared, table_name, method, unlogged, key_column)
+            elif strategy == "swap":
+                staged = self._load_staging(prepared, table_name, method, unlogged)
+            else:
+                prepared = list(prepared)
+            if strategy in ("swap", "merge"):
+                for child in children.children if children is not None else []:
+                    staged_children[child.name] = self._stage_child(child, children, method, unlogged, loaded_at)
+
+            # 5. Publicação (Merge vs Swap vs Truncate vs History): uma transação curta numa
+            # única conexão do pool, que só lê dados já em memória ou no staging
+            with self.engine.begin() as conn:
+                history = None
+                if strategy == "merge":
+                    mode, rows = self._publish_merge(staged, table_name, unlogged, key_column, tombstone, conn)
+                elif strategy == "history":
+                    mode, rows, batch_timestamp = self._load_history(
+                        prepared, table_name, method, loaded_at, retention_days, con=conn
+                    )
+                    history = (table_name, batch_timestamp, retention_days)
+                elif strategy == "swap":
+                    mode, rows = self._publish_swap(staged, table_name, unlogged, conn)
+                else:
+                    mode, rows = self._load_truncate(prepared, table_name, method, conn)
+
+                # 6. Tabelas ponte, depois do pai e no mesmo COMMIT (nunca publicadas sem ele)
+                for child in children.children if children is not None else []:
+                    self._load_child(child, children, strategy, method, unlogged, loaded_at, conn, history,
+                                     staged_children.get(child.name))
+
+                # 7. Manutenção pós-carga: índices de join/filtro e estatísticas do planner
+                reports = []
+                if maintenance:
+                    suffix = HISTORY_SUFFIX if strategy == "history" else ""
+                    index_columns = table_schema.indexes if table_schema is not None else ()
+                    reports.append(self._maintain(table_name + suffix, index_columns, conn))
+                    for child in children.children if children is not None else []:
+                        reports.append(self._maintain(child.name + suffix, con=conn))
+
+            logger.info(f"Sucesso: raw.{table_name} carregada ({rows} linhas) via {mode}/{method}.")
+            vacuum_hours = float(os.getenv("BRONZE_VACUUM_INTERVAL_HOURS", "0"))
+            if reports and vacuum_hours > 0:
+                self._vacuum(reports, vacuum_hours)
+            for report in reports:
+                logger.info(f"Manutenção de raw.{report.table}: {json.dumps(report.to_dict())}")
 
         except Exception as e:
+            # Rollback desfaz também a DDL já registrada no cache (e pode haver drift externo)
+            self.catalog.invalidate()
             logger.critical(f"Falha no carregamento SQL em {table_name}: {e}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,72 @@
+from sqlalchemy import text
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class IngestionStateStore:
+    """
+    Estado de ingestão por endpoint na tabela raw._ingestion_state.
+    Rigor: Guarda o watermark (maior valor da coluna de data já carregado com sucesso)
+    e o instante da última execução bem-sucedida. O watermark só avança após a carga
+    e nunca regride (GREATEST), então uma execução com janela de sobreposição não
+    desfaz o progresso de outra.
+    """
+
+    TABLE = 'raw."_ingestion_state"'
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._ready = False
+
+    def _ensure_table(self):
+        if self._ready:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE SCHEMA IF NOT EXISTS raw"))
+            conn.execute(text(f"""
+                CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                    endpoint text PRIMARY KEY,
+                    watermark_column text,
+                    watermark timestamptz,
+                    rows_loaded bigint,
+                    last_success_at timestamp NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+                )
+            """))
+        self._ready = True
+
+    def get_watermarks(self) -> dict:
+        """Retorna {endpoint: watermark (datetime UTC)} dos endpoints incrementais."""
+        self._ensure_table()
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text(f"SELECT endpoint, watermark FROM {self.TABLE} WHERE watermark IS NOT NULL")
+            ).all()
+        return {endpoint: watermark for endpoint, watermark in rows}
+
+    def record_success(self, endpoint_name, watermark_column=None, watermark=None, rows_loaded=None):
+        """
+        Registra uma execução bem-sucedida (carga ou origem inalterada).
+        watermark=None mantém o valor anterior.
+        """
+        self._ensure_table()
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(f"""
+                    INSERT INTO {self.TABLE} AS s (endpoint, watermark_column, watermark, rows_loaded, last_success_at)
+                    VALUES (:endpoint, :column, :watermark, :rows, now() AT TIME ZONE 'utc')
+                    ON CONFLICT (endpoint) DO UPDATE SET
+                        watermark_column = COALESCE(EXCLUDED.watermark_column, s.watermark_column),
+                        watermark = GREATEST(s.watermark, EXCLUDED.watermark),
+                        rows_loaded = EXCLUDED.rows_loaded,
+                        last_success_at = EXCLUDED.last_success_at
+                """),
+                {
+                    "endpoint": endpoint_name,
+                    "column": watermark_column,
+                    "watermark": watermark,
+                    "rows": rows_loaded,
+                }
+            )
+        if watermark is not None:
+            logger.info(f"Watermark de {endpoint_name} ({watermark_column}): {watermark}.")
@@ -0,0 +1,323 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from functools import cached_property
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from src.models.schemas import LaunchesSchema
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ERROR = "error"
+WARNING = "warning"
+# Acima deste número de linhas a validação roda sobre uma amostra (0 = sempre no frame inteiro)
+DEFAULT_SAMPLE_ROWS = 0
+
+
+class ColumnView:
+    """
+    Conversões de uma coluna compartilhadas entre as regras de um mesmo passe.
+    Rigor: Cada conversão (numérica, texto, timestamp) é feita uma única vez, de forma
+    vetorizada, e só se alguma regra precisar dela.
+    """
+
+    def __init__(self, series: pd.Series):
+        self.series = series
+
+    @cached_property
+    def isna(self) -> np.ndarray:
+        return self.series.isna().to_numpy(dtype=bool)
+
+    @cached_property
+    def numeric(self) -> np.ndarray:
+        return pd.to_numeric(self.series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+    @cached_property
+    def strings(self) -> pd.Series:
+        # Texto Arrow (backend pyarrow) já serve aos kernels de regex do pyarrow, sem cópia
+        if isinstance(self.series.dtype, pd.ArrowDtype) and pd.api.types.is_string_dtype(self.series.dtype):
+            return self.series
+        return self.series.astype("string")
+
+    @cached_property
+    def timestamps(self) -> pd.Series:
+        if pd.api.types.is_datetime64_any_dtype(self.series.dtype):
+            return self.series
+        return pd.to_datetime(self.series.astype(object), utc=True, errors="coerce", format="ISO8601")
+
+
+class Rule(ABC):
+    """
+    Regra de qualidade sobre uma coluna: violations() devolve a máscara booleana das
+    linhas que a violam. A regra falha quando a fração de violações passa de max_ratio.
+    Valores nulos só contam para NotNull; as demais regras os ignoram.
+    """
+
+    kind = "rule"
+
+    def __init__(self, column, max_ratio=0.0, severity=ERROR, description=None):
+        self.column = column
+        self.max_ratio = max_ratio
+        self.severity = severity
+        self.description = description
+
+    @property
+    def name(self) -> str:
+        return self.description or f"{self.kind}({self.column})"
+
+    @abstractmethod
+    def violations(self, view: ColumnView) -> np.ndarray:
+        pass
+
+
+class NotNull(Rule):
+    kind = "not_null"
+
+    def violations(self, view):
+        return view.isna
+
+
+class Unique(Rule):
+    """
+    Valores repetidos (todas as ocorrências contam). Em modo amostrado, é um limite inferior.
+    No streaming (endpoints "query"/"stream"), o preflight valida só o primeiro lote:
+    repetições entre lotes diferentes não são detectadas aqui — a unicidade da tabela
+    fica a cargo do índice único do modo merge e do teste unique das sources do dbt.
+    """
+
+    kind = "unique"
+
+    def violations(self, view):
+        return view.series.duplicated(keep=False).to_numpy(dtype=bool) & ~view.isna
+
+
+class Range(Rule):
+    kind = "range"
+
+    def __init__(self, column, min=None, max=None, **kwargs):
+        super().__init__(column, **kwargs)
+        self.min = min
+        self.max = max
+
+    def violations(self, view):
+        values = view.numeric
+        # Não numéricos viram NaN e também violam; nulos de origem não
+        mask = np.isnan(values) & ~view.isna
+        with np.errstate(invalid="ignore"):
+            if self.min is not None:
+                mask |= values < self.min
+            if self.max is not None:
+                mask |= values > self.max
+        return mask
+
+
+class Pattern(Rule):
+    kind = "pattern"
+
+    def __init__(self, column, regex, **kwargs):
+        super().__init__(column, **kwargs)
+        self.regex = regex
+
+    def violations(self, view):
+        matched = view.strings.str.fullmatch(self.regex).fillna(True)
+        return ~matched.to_numpy(dtype=bool)
+
+
+class OneOf(Rule):
+    kind = "one_of"
+
+    def __init__(self, column, values, **kwargs):
+        super().__init__(column, **kwargs)
+        self.values = list(values)
+
+    def violations(self, view):
+        return ~view.series.isin(self.values).to_numpy(dtype=bool) & ~view.isna
+
+
+class ParsesAsTimestamp(Rule):
+    """ISO 8601 válido. Colunas já tipadas pelo flattener (datetime64) passam direto."""
+
+    kind = "timestamp"
+
+    def violations(self, view):
+        return view.timestamps.isna().to_numpy(dtype=bool) & ~view.isna
+
+
+class Required:
+    """Contrato de colunas: todas precisam existir no DataFrame (avaliada sem amostragem)."""
+
+    kind = "required"
+
+    def __init__(self, columns, severity=ERROR, description=None):
+        self.columns = list(columns)
+        self.severity = severity
+        self.description = description
+
+    @property
+    def name(self) -> str:
+        return self.description or f"required({', '.join(self.columns)})"
+
+
+class RuleResult(NamedTuple):
+    rule: str
+    kind: str
+    column: str
+    severity: str
+    passed: bool
+    failed: int
+    checked: int
+    seconds: float
+    message: str
+
+    @property
+    def ratio(self) -> float:
+        return self.failed / self.checked if self.checked else 0.0
+
+
+class ValidationReport:
+    """Resultado estruturado de um passe de validação (uma linha por regra, com tempos)."""
+
+    def __init__(self, endpoint, rows, checked_rows, results, seconds):
+        self.endpoint = endpoint
+        self.rows = rows
+        self.checked_rows = checked_rows
+        self.results = results
+        self.seconds = seconds
+
+    @property
+    def sampled(self) -> bool:
+        return self.checked_rows < self.rows
+
+    @property
+    def failures(self) -> list:
+        return [r for r in self.results if not r.passed]
+
+    @property
+    def passed(self) -> bool:
+        return not any(r.severity == ERROR for r in self.failures)
+
+    def to_dict(self) -> dict:
+        return {
+            "endpoint": self.endpoint,
+            "passed": self.passed,
+            "rows": self.rows,
+            "checked_rows": self.checked_rows,
+            "sampled": self.sampled,
+            "seconds": round(self.seconds, 6),
+            "rules": [dict(r._asdict(), ratio=r.ratio) for r in self.results],
+        }
+
+
+class QualityEngine:
+    """
+    Avalia um conjunto de regras sobre um DataFrame num único passe colunar.
+    Rigor: As regras de uma mesma coluna compartilham um ColumnView, então cada coluna é
+    convertida uma vez e cada regra é uma operação vetorizada (NumPy/pandas), sem apply
+    por linha. Com sample_rows > 0, frames maiores são validados sobre uma amostra
+    aleatória de sample_rows linhas: o custo deixa de crescer com o volume da carga e as
+    frações de violação passam a ser estimativas.
+    """
+
+    def __init__(self, rules, sample_rows=None, seed=0):
+        self.rules = list(rules)
+        self.sample_rows = int(sample_rows if sample_rows is not None
+                               else os.getenv("QUALITY_SAMPLE_ROWS", DEFAULT_SAMPLE_ROWS))
+        self.seed = seed
+
+    def _sample(self, df: pd.DataFrame) -> pd.DataFrame:
+        if not self.sample_rows or len(df) <= self.sample_rows:
+            return df
+        rng = np.random.default_rng(self.seed)
+        positions = np.sort(rng.choice(len(df), size=self.sample_rows, replace=False))
+        return df.iloc[positions]
+
+    def validate(self, df: pd.DataFrame, endpoint: str = None) -> ValidationReport:
+        started = time.perf_counter()
+        results = []
+        if df.empty:
+            results.append(RuleResult("not_empty", "not_empty", None, ERROR, False, 0, 0, 0.0, "DataFrame está vazio"))
+            return ValidationReport(endpoint, 0, 0, results, time.perf_counter() - started)
+
+        for rule in self.rules:
+            if isinstance(rule, Required):
+                rule_started = time.perf_counter()
+                missing = [c for c in rule.columns if c not in df.columns]
+                results.append(RuleResult(
+                    rule.name, rule.kind, None, rule.severity, not missing, len(missing), len(rule.columns),
+                    time.perf_counter() - rule_started, f"Colunas ausentes: {missing}" if missing else ""
+                ))
+
+        frame = self._sample(df)
+        checked = len(frame)
+        views = {}
+        for rule in self.rules:
+            if isinstance(rule, Required):
+                continue
+            if rule.column not in frame.columns:
+                logger.debug(f"Regra {rule.name} ignorada em {endpoint}: coluna ausente.")
+                continue
+            rule_started = time.perf_counter()
+            view = views.get(rule.column)
+            if view is None:
+                view = views[rule.column] = ColumnView(frame[rule.column])
+            failed = int(np.count_nonzero(rule.violations(view)))
+            passed = failed <= rule.max_ratio * checked
+            message = "" if not failed else f"{rule.name}: {failed} de {checked} linhas ({failed / checked:.1%})"
+            results.append(RuleResult(
+                rule.name, rule.kind, rule.column, rule.severity, passed, failed, checked,
+                time.perf_counter() - rule_started, message
+            ))
+
+        return ValidationReport(endpoint, len(df), checked, results, time.perf_counter() - started)
+
+
+# Regras aplicadas a endpoints sem conjunto próprio
+DEFAULT_RULES = [
+    NotNull("id", severity=WARNING, description="IDs nulos"),
+]
+
+_OBJECT_ID = r"[0-9a-f]{24}"
+
+# Conjuntos de regras por endpoint. Severidade ERROR aborta a carga (preflight);
+# WARNING só é registrada no relatório.
+QUALITY_RULES = {
+    "spacex_launches": [
+        Required(["id", "flight_number", "date_utc"]),
+        Required([c for c in LaunchesSchema.REQUIRED_COLUMNS if c not in ("flight_number", "date_utc")],
+                 severity=WARNING),
+        NotNull("id", severity=WARNING, description="IDs nulos"),
+        Unique("id"),
+        Pattern("id", _OBJECT_ID, severity=WARNING),
+        Range("flight_number", min=1, severity=WARNING),
+        ParsesAsTimestamp("date_utc", severity=WARNING),
+        OneOf("date_precision", ["half", "quarter", "year", "month", "day", "hour"], severity=WARNING),
+    ],
+    "spacex_rockets": [
+        Required(["id", "name"]),
+        NotNull("id", severity=WARNING, description="IDs nulos"),
+        Unique("id"),
+        Range("cost_per_launch", min=0, severity=WARNING),
+        Range("success_rate_pct", min=0, max=100, severity=WARNING),
+    ],
+    "spacex_payloads": [
+        Required(["id"]),
+        NotNull("id", severity=WARNING, description="IDs nulos"),
+        Unique("id"),
+        Range("mass_kg", min=0, severity=WARNING),
+    ],
+    "spacex_cores": [
+        Required(["id"]),
+        NotNull("id", severity=WARNING, description="IDs nulos"),
+        Unique("id"),
+        Range("reuse_count", min=0, severity=WARNING),
+        OneOf("status", ["active", "inactive", "unknown", "expended", "lost", "retired"], severity=WARNING),
+    ],
+    "nasa_solar_events": [
+        Required(["activityID", "startTime"]),
+        NotNull("activityID", severity=WARNING, description="IDs nulos"),
+        Unique("activityID"),
+        ParsesAsTimestamp("startTime", severity=WARNING),
+    ],
+}
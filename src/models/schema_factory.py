@@ -1,4 +1,5 @@
-from src.models.schemas import LaunchesSchema
+from src.models.quality import DEFAULT_RULES, QUALITY_RULES
+from src.models.schemas import BRONZE_SCHEMAS, LaunchesSchema
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -21,4 +22,18 @@ class SchemaFactory:
         if not validator:
             logger.error(f"Schema '{schema_name}' não está registrado no Factory.")
             raise ValueError(f"Schema Inválido: {schema_name}")
-        return validator
\ No newline at end of file
+        return validator
+
+    @classmethod
+    def get_table_schema(cls, table_name: str):
+        """Schema bronze (colunas, tipos Postgres, nulabilidade) de um endpoint."""
+        schema = BRONZE_SCHEMAS.get(table_name)
+        if not schema:
+            logger.error(f"Schema bronze '{table_name}' não está registrado no Factory.")
+            raise ValueError(f"Schema bronze não registrado: {table_name}")
+        return schema
+
+    @classmethod
+    def get_quality_rules(cls, table_name: str) -> list:
+        """Regras de qualidade do endpoint (preflight); DEFAULT_RULES quando não há conjunto próprio."""
+        return QUALITY_RULES.get(table_name, DEFAULT_RULES)
@@ -1,4 +1,19 @@
+import hashlib
+import json
+import os
+from typing import NamedTuple
 import pandas as pd
+from pandas.api.types import (
+    is_bool_dtype, is_datetime64_any_dtype, is_float_dtype, is_integer_dtype
+)
+from src.utils.logger import get_logger
+
+try:
+    import pyarrow as pa
+except ImportError:  # Backend Arrow opcional: sem ele, os lotes seguem com dtypes NumPy
+    pa = None
+
+logger = get_logger(__name__)
 
 class LaunchesSchema:
     REQUIRED_COLUMNS = ['name', 'date_utc', 'flight_number', 'success'] 
@@ -11,4 +26,357 @@ class LaunchesSchema:
         if df.empty:
             raise ValueError("Schema Inválido! DataFrame vazio.")
         
-        return True
\ No newline at end of file
+        return True
+
+
+# =============================================================================
+# REGISTRO DE SCHEMAS DA CAMADA BRONZE
+# =============================================================================
+
+def _to_string(values):
+    return pd.array([v if v is None or isinstance(v, str) else str(v) for v in values], dtype="string")
+
+
+def _to_int(values):
+    return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").astype("Int64").array
+
+
+def _to_float(values):
+    return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype="float64")
+
+
+def _to_bool(values):
+    return pd.array([v if isinstance(v, bool) else None for v in values], dtype="boolean")
+
+
+def _to_timestamp(values):
+    # ISO 8601 com qualquer offset -> UTC sem fuso (mesma semântica do antigo ::timestamp do dbt)
+    parsed = pd.to_datetime(pd.Series(values, dtype=object), utc=True, errors="coerce", format="ISO8601")
+    return parsed.dt.tz_localize(None).array
+
+
+def _to_date(values):
+    return pd.to_datetime(pd.Series(values, dtype=object), errors="coerce", format="ISO8601").dt.normalize().array
+
+
+def _to_json(values):
+    # Listas/objetos seguem como objetos Python; o loader serializa (coluna jsonb)
+    return pd.array(values, dtype=object)
+
+
+# Tipo lógico -> (tipo Postgres, conversor vetorizado, dtype já adequado?)
+COLUMN_TYPES = {
+    "string": ("text", _to_string, lambda dtype: True),
+    "int": ("bigint", _to_int, is_integer_dtype),
+    "float": ("double precision", _to_float, is_float_dtype),
+    "bool": ("boolean", _to_bool, is_bool_dtype),
+    "timestamp": ("timestamp without time zone", _to_timestamp,
+                  lambda dtype: is_datetime64_any_dtype(dtype) and not isinstance(dtype, pd.DatetimeTZDtype)),
+    "date": ("date", _to_date, is_datetime64_any_dtype),
+    "json": ("jsonb", _to_json, lambda dtype: True),
+}
+
+
+# Representação em memória dos lotes tipados: "numpy" (dtypes NumPy/nullable do pandas)
+# ou "pyarrow" (colunas pd.ArrowDtype). Padrão via DATAFRAME_BACKEND.
+DATAFRAME_BACKENDS = ("numpy", "pyarrow")
+
+# Tipo lógico -> tipo Arrow no backend "pyarrow"; json continua como objetos Python
+ARROW_TYPES = {} if pa is None else {
+    "string": pa.string(),
+    "int": pa.int64(),
+    "float": pa.float64(),
+    "bool": pa.bool_(),
+    "timestamp": pa.timestamp("us"),
+    "date": pa.date32(),
+}
+
+
+def dataframe_backend(backend=None) -> str:
+    """Backend pedido (ou DATAFRAME_BACKEND); "pyarrow" sem o pacote instalado cai para "numpy"."""
+    backend = (backend or os.getenv("DATAFRAME_BACKEND", "numpy")).lower()
+    if backend not in DATAFRAME_BACKENDS:
+        raise ValueError(f"Backend de DataFrame inválido: {backend}. Use um de {list(DATAFRAME_BACKENDS)}.")
+    if backend == "pyarrow" and pa is None:
+        logger.warning("DATAFRAME_BACKEND=pyarrow sem o pacote pyarrow instalado; usando numpy.")
+        return "numpy"
+    return backend
+
+
+def to_arrow(values, type_name):
+    """
+    Converte valores JSON para uma coluna Arrow do tipo lógico `type_name`.
+    Rigor: Valores já no tipo certo são lidos direto pelo conversor C++ do pyarrow, sem
+    objeto intermediário; só lotes com valores fora do tipo (ex.: "3" numa coluna int) ou
+    datas em texto passam pelo conversor do backend numpy, com a mesma semântica.
+    """
+    arrow_type = ARROW_TYPES[type_name]
+    if type_name not in ("timestamp", "date"):
+        try:
+            return pd.arrays.ArrowExtensionArray(pa.array(values, type=arrow_type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    converted = pa.array(COLUMN_TYPES[type_name][1](values), from_pandas=True)
+    return pd.arrays.ArrowExtensionArray(converted.cast(arrow_type, safe=False))
+
+
+class Field(NamedTuple):
+    """
+    Coluna da camada bronze: caminho no JSON, tipo lógico (COLUMN_TYPES), nome da
+    coluna (padrão: o caminho, como no pd.json_normalize, ex.: "links.webcast") e nulabilidade.
+    """
+    path: str
+    type: str
+    column: str = None
+    nullable: bool = True
+
+    @property
+    def name(self) -> str:
+        return self.column or self.path
+
+    @property
+    def pg_type(self) -> str:
+        return COLUMN_TYPES[self.type][0]
+
+
+class TableSchema:
+    """
+    Contrato de uma tabela bronze: colunas, tipos Postgres e nulabilidade.
+    Rigor: É a fonte única de tipos — o CompiledFlattener extrai os campos com ela,
+    o PostgresLoader gera o DDL explícito e o dbt lê colunas já tipadas, sem cast por linha.
+    """
+
+    def __init__(self, name, fields, overflow=None, children=(), indexes=()):
+        self.name = name
+        self.fields = [Field(*field) for field in fields]
+        invalid = [f.path for f in self.fields if f.type not in COLUMN_TYPES]
+        if invalid:
+            raise ValueError(f"Tipo de campo inválido em {name}: {invalid}. Use um de {list(COLUMN_TYPES)}.")
+        self.overflow = overflow
+        self.children = list(children)
+        unknown = [c for c in indexes if c not in self.column_types]
+        if unknown:
+            raise ValueError(f"Índice em coluna não declarada em {name}: {unknown}.")
+        self.indexes = list(indexes)
+
+    @property
+    def column_types(self) -> dict:
+        """{coluna: tipo Postgres}, incluindo a coluna de overflow (jsonb)."""
+        types = {f.name: f.pg_type for f in self.fields}
+        if self.overflow:
+            types[self.overflow] = "jsonb"
+        return types
+
+    @property
+    def not_null(self) -> list:
+        return [f.name for f in self.fields if not f.nullable]
+
+    @property
+    def version(self) -> str:
+        """Hash do contrato (campos, overflow, índices e tabelas ponte): muda com qualquer alteração."""
+        contract = {
+            "name": self.name,
+            "fields": [list(f) for f in self.fields],
+            "overflow": self.overflow,
+            "indexes": self.indexes,
+            "children": [
+                [c.name, c.array, c.parent_key, c.schema.version] for c in self.children
+            ],
+        }
+        payload = json.dumps(contract, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Ajusta um lote ao contrato: converte (vetorizado) as colunas fora do dtype
+        declarado, descarta linhas sem valor em colunas NOT NULL e anota em
+        df.attrs os tipos Postgres e as restrições usados pelo loader.
+        Lotes vindos do CompiledFlattener já estão tipados e passam sem cópia.
+        """
+        converted = {}
+        for field in self.fields:
+            if field.name not in df.columns:
+                continue
+            _, convert, is_typed = COLUMN_TYPES[field.type]
+            if not is_typed(df[field.name].dtype):
+                converted[field.name] = convert(df[field.name].to_numpy(dtype=object))
+        if converted:
+            df = df.copy(deep=False)
+            for column, values in converted.items():
+                df[column] = values
+
+        required = [c for c in self.not_null if c in df.columns]
+        if required:
+            missing = df[required].isna().any(axis=1)
+            if missing.any():
+                logger.warning(f"{self.name}: {int(missing.sum())} linhas sem {required} descartadas.")
+                df = df[~missing]
+
+        df.attrs["column_types"] = {c: t for c, t in self.column_types.items() if c in df.columns}
+        df.attrs["not_null"] = required
+        return df
+
+
+class ChildTable:
+    """
+    Tabela ponte da camada bronze: cada elemento de um array do registro pai vira uma
+    linha, com a chave do pai (key_column) e a posição no array (position, a partir de 0).
+    Arrays de objetos declaram `fields` (caminhos relativos ao elemento); arrays de
+    escalares declaram `value` = (coluna, tipo).
+    """
+
+    def __init__(self, name, array, key_column, fields=None, value=None, parent_key="id"):
+        if (fields is None) == (value is None):
+            raise ValueError(f"Tabela ponte {name}: declare fields (objetos) ou value (escalares).")
+        self.name = name
+        self.array = array
+        self.key_column = key_column
+        self.parent_key = parent_key
+        self.value = value
+        element_fields = list(fields) if fields is not None else [value]
+        self.schema = TableSchema(name, [
+            (key_column, "string", None, False),
+            ("position", "int", None, False),
+            *element_fields,
+        ])
+        # Campos do elemento (sem chave e posição), na forma aceita pelo CompiledFlattener
+        self.fields = self.schema.fields[2:]
+
+
+# Colunas por endpoint. Cada campo: (caminho no JSON, tipo[, nome da coluna[, nullable]]).
+# "overflow": coluna jsonb que recebe as chaves de topo não declaradas.
+# "children": arrays explodidos em tabelas ponte na ingestão (ex.: raw.spacex_launch_payloads).
+# "indexes": colunas de join/filtro dos modelos dbt, indexadas na manutenção pós-carga.
+BRONZE_SCHEMAS = {
+    "spacex_launches": TableSchema("spacex_launches", [
+        ("id", "string", None, False),
+        ("flight_number", "int"),
+        ("name", "string"),
+        ("date_utc", "timestamp"),
+        ("date_unix", "int"),
+        ("date_local", "string"),  # hora local com offset: mantida como texto
+        ("date_precision", "string"),
+        ("upcoming", "bool"),
+        ("success", "bool"),
+        ("details", "string"),
+        ("rocket", "string"),
+        ("launchpad", "string"),
+        ("payloads", "json"),
+        ("cores", "json"),
+        ("failures", "json"),
+        ("crew", "json"),
+        ("ships", "json"),
+        ("capsules", "json"),
+        ("window", "int"),
+        ("static_fire_date_utc", "timestamp"),
+        ("fairings.reused", "bool"),
+        ("fairings.recovered", "bool"),
+        ("links.webcast", "string"),
+        ("links.wikipedia", "string"),
+        ("links.patch.small", "string"),
+    ], overflow="_extra", children=[
+        ChildTable("spacex_launch_payloads", "payloads", "launch_id", value=("payload_id", "string")),
+        ChildTable("spacex_launch_cores", "cores", "launch_id", fields=[
+            ("core", "string", "core_id"),
+            ("flight", "int"),
+            ("gridfins", "bool"),
+            ("legs", "bool"),
+            ("reused", "bool"),
+            ("landing_attempt", "bool"),
+            ("landing_success", "bool"),
+            ("landing_type", "string"),
+            ("landpad", "string", "landpad_id"),
+        ]),
+        ChildTable("spacex_launch_failures", "failures", "launch_id", fields=[
+            ("time", "int"),
+            ("altitude", "int"),
+            ("reason", "string"),
+        ]),
+    ], indexes=["id", "date_utc", "rocket"]),
+
+    "spacex_rockets": TableSchema("spacex_rockets", [
+        ("id", "string", None, False),
+        ("name", "string"),
+        ("type", "string"),
+        ("active", "bool"),
+        ("stages", "int"),
+        ("boosters", "int"),
+        ("cost_per_launch", "int"),
+        ("success_rate_pct", "int"),
+        ("first_flight", "date"),
+        ("country", "string"),
+        ("company", "string"),
+        ("description", "string"),
+        ("payload_weights", "json"),
+        ("height.meters", "float"),
+        ("diameter.meters", "float"),
+        ("mass.kg", "float"),
+        ("engines.number", "int"),
+        ("engines.type", "string"),
+    ], overflow="_extra", children=[
+        ChildTable("spacex_rocket_payload_weights", "payload_weights", "rocket_id", fields=[
+            ("id", "string", "orbit"),
+            ("name", "string"),
+            ("kg", "float"),
+            ("lb", "float"),
+        ]),
+    ], indexes=["id"]),
+
+    "spacex_payloads": TableSchema("spacex_payloads", [
+        ("id", "string", None, False),
+        ("name", "string"),
+        ("type", "string"),
+        ("reused", "bool"),
+        ("launch", "string"),
+        ("customers", "json"),
+        ("norad_ids", "json"),
+        ("nationalities", "json"),
+        ("manufacturers", "json"),
+        ("mass_kg", "float"),
+        ("mass_lbs", "float"),
+        ("orbit", "string"),
+        ("reference_system", "string"),
+        ("regime", "string"),
+    ], overflow="_extra", indexes=["id"]),
+
+    "spacex_cores": TableSchema("spacex_cores", [
+        ("id", "string", None, False),
+        ("serial", "string"),
+        ("block", "int"),
+        ("status", "string"),
+        ("reuse_count", "int"),
+        ("rtls_attempts", "int"),
+        ("rtls_landings", "int"),
+        ("asds_attempts", "int"),
+        ("asds_landings", "int"),
+        ("last_update", "string"),  # texto livre (não é data)
+        ("launches", "json"),
+    ], overflow="_extra", indexes=["id"]),
+
+    "nasa_solar_events": TableSchema("nasa_solar_events", [
+        ("activityID", "string", None, False),
+        ("catalog", "string"),
+        ("startTime", "timestamp"),
+        ("sourceLocation", "string"),
+        ("activeRegionNum", "int"),
+        ("note", "string"),
+        ("link", "string"),
+        ("instruments", "json"),
+        ("cmeAnalyses", "json"),
+        ("linkedEvents", "json"),
+    ], overflow="_extra", children=[
+        ChildTable("nasa_cme_analyses", "cmeAnalyses", "activity_id", parent_key="activityID", fields=[
+            ("time21_5", "timestamp"),
+            ("latitude", "float"),
+            ("longitude", "float"),
+            ("halfAngle", "float"),
+            ("speed", "float"),
+            ("type", "string"),
+            ("isMostAccurate", "bool"),
+            ("levelOfData", "int"),
+            ("note", "string"),
+            ("link", "string"),
+            ("enlilList", "json"),
+        ]),
+    ], indexes=["activityID", "startTime"]),
+}
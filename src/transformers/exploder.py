@@ -0,0 +1,98 @@
+from itertools import chain
+import numpy as np
+import pandas as pd
+from src.models.schemas import COLUMN_TYPES, ChildTable, TableSchema, dataframe_backend, to_arrow
+from src.transformers.flattener import CompiledFlattener
+
+
+def explode_array(arrays):
+    """
+    Explode uma coluna de listas: (linha do pai, posição no array, elementos) por elemento.
+    Rigor: Uma única passada sobre os arrays mede os comprimentos; linhas e posições
+    saem de np.repeat/cumsum e os elementos são concatenados por itertools.chain,
+    sem DataFrame.explode nem laço Python por elemento. Valores que não são listas
+    (None, texto) contam como arrays vazios.
+    """
+    arrays = np.asarray(arrays, dtype=object)
+    lengths = np.fromiter(
+        (len(value) if isinstance(value, list) else 0 for value in arrays),
+        dtype=np.int64, count=len(arrays)
+    )
+    rows = np.repeat(np.arange(len(arrays), dtype=np.int64), lengths)
+    positions = np.arange(lengths.sum(), dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    elements = list(chain.from_iterable(value for value in arrays if isinstance(value, list)))
+    return rows, positions, elements
+
+
+class ChildExploder:
+    """
+    Monta o lote de uma tabela ponte (ChildTable) a partir de um lote do registro pai.
+    Elementos-objeto são achatados pelo CompiledFlattener com os campos declarados;
+    elementos escalares passam pelo conversor do tipo declarado.
+    """
+
+    def __init__(self, child: ChildTable, backend=None):
+        self.child = child
+        self.backend = dataframe_backend(backend)
+        self.flattener = None if child.value is not None else CompiledFlattener(child.fields, backend=self.backend)
+
+    def __call__(self, parent: pd.DataFrame) -> pd.DataFrame:
+        child = self.child
+        if child.parent_key not in parent.columns or child.array not in parent.columns:
+            keys, positions, elements = pd.array([], dtype="string"), np.array([], dtype=np.int64), []
+        else:
+            rows, positions, elements = explode_array(parent[child.array].to_numpy(dtype=object))
+            # Chave já tipada pelo schema do pai: um take vetorizado, sem reconverter por valor
+            keys = parent[child.parent_key].array.take(rows)
+            if not (keys.dtype == "string" or isinstance(keys.dtype, pd.ArrowDtype)):
+                keys = COLUMN_TYPES["string"][1](keys)
+
+        columns = {
+            child.key_column: keys,
+            "position": pd.array(positions, dtype="Int64"),
+        }
+        if self.flattener is None:
+            value = child.fields[0]
+            if self.backend == "pyarrow" and value.type != "json":
+                columns[value.name] = to_arrow(elements, value.type)
+            else:
+                columns[value.name] = COLUMN_TYPES[value.type][1](elements)
+        else:
+            # Elementos que não são objetos viram linhas só com chave e posição
+            flat = self.flattener([e if isinstance(e, dict) else {} for e in elements])
+            columns.update({column: flat[column].array for column in flat.columns})
+
+        frame = child.schema.apply(pd.DataFrame(columns, copy=False))
+        if self.flattener is not None:
+            frame.attrs["json_columns"] = list(self.flattener.json_columns)
+        return frame
+
+
+class ChildCollector:
+    """
+    Acumula, lote a lote, as tabelas ponte de um TableSchema e as chaves de pai vistas.
+    Rigor: Tabelas ponte são pequenas (ids e poucos campos); ficam em memória até a
+    carga do pai terminar, para que uma falha no pai não publique filhos órfãos.
+    """
+
+    def __init__(self, table_schema: TableSchema, backend=None):
+        self.children = list(table_schema.children)
+        self._exploders = [ChildExploder(child, backend) for child in self.children]
+        self._frames = {child.name: [] for child in self.children}
+        self._parent_keys = {child.name: [] for child in self.children}
+
+    def collect(self, parent: pd.DataFrame):
+        for child, explode in zip(self.children, self._exploders):
+            self._frames[child.name].append(explode(parent))
+            if child.parent_key in parent.columns:
+                self._parent_keys[child.name].extend(parent[child.parent_key].dropna().astype(str))
+
+    def frame(self, child: ChildTable) -> pd.DataFrame:
+        """Lote único da tabela ponte (vazio, mas tipado, se nenhum pai tinha elementos)."""
+        frames = self._frames[child.name] or [ChildExploder(child, "numpy")(pd.DataFrame())]
+        frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        frame.attrs = dict(frames[0].attrs)
+        return frame
+
+    def parent_keys(self, child: ChildTable) -> list:
+        return list(dict.fromkeys(self._parent_keys[child.name]))
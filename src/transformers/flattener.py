@@ -0,0 +1,92 @@
+from functools import partial
+import pandas as pd
+from src.models.schema_factory import SchemaFactory
+from src.models.schemas import COLUMN_TYPES, Field, TableSchema, dataframe_backend, to_arrow
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _nested_getter(keys):
+    """Acessor de caminho aninhado; None se algum nível faltar ou não for objeto."""
+    def get(value):
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+    return get
+
+
+class CompiledFlattener:
+    """
+    Achatamento de registros JSON guiado por especificação, substituto do pd.json_normalize.
+    Rigor: Os campos do schema (caminho, tipo[, coluna]) são compilados uma vez em acessores;
+    cada coluna declarada é extraída numa única passada sobre os registros (raízes
+    compartilhadas como links.* são lidas uma vez) e convertida direto para o dtype
+    explícito. O DataFrame é montado uma única vez, só com as colunas declaradas —
+    sem inferência de tipos nem uma coluna para cada chave aninhada encontrada.
+    Chaves de topo não declaradas podem ir para uma coluna JSON de overflow.
+    Com backend "pyarrow" (DATAFRAME_BACKEND), as colunas escalares já nascem como
+    pd.ArrowDtype: texto em buffers Arrow contíguos em vez de um objeto Python por célula,
+    lidos sem cópia pela validação e pelo COPY do loader.
+    """
+
+    def __init__(self, fields, overflow_column=None, backend=None):
+        self.backend = dataframe_backend(backend)
+        self.fields = []
+        for spec in fields:
+            field = Field(*spec)
+            if field.type not in COLUMN_TYPES:
+                raise ValueError(
+                    f"Tipo de campo inválido em '{field.path}': {field.type}. Use um de {list(COLUMN_TYPES)}."
+                )
+            keys = field.path.split(".")
+            getter = _nested_getter(keys[1:]) if len(keys) > 1 else None
+            if self.backend == "pyarrow" and field.type != "json":
+                convert = partial(to_arrow, type_name=field.type)
+            else:
+                convert = COLUMN_TYPES[field.type][1]
+            self.fields.append((field.name, keys[0], getter, convert, field.type))
+        self.overflow_column = overflow_column
+        self.known_roots = frozenset(root for _, root, _, _, _ in self.fields)
+        self.json_columns = [c for c, _, _, _, dtype in self.fields if dtype == "json"]
+        if overflow_column:
+            self.json_columns.append(overflow_column)
+
+    @classmethod
+    def from_schema(cls, schema: TableSchema, backend=None):
+        return cls(schema.fields, overflow_column=schema.overflow, backend=backend)
+
+    def __call__(self, records) -> pd.DataFrame:
+        return self.flatten(records)
+
+    def flatten(self, records) -> pd.DataFrame:
+        if records is None:
+            records = []
+        elif isinstance(records, dict):
+            records = [records]
+
+        roots = {}
+        columns = {}
+        for column, root, getter, convert, _ in self.fields:
+            if root not in roots:
+                roots[root] = [record.get(root) for record in records]
+            values = roots[root] if getter is None else [getter(v) for v in roots[root]]
+            columns[column] = convert(values)
+
+        if self.overflow_column:
+            known = self.known_roots
+            columns[self.overflow_column] = pd.array([
+                {k: v for k, v in record.items() if k not in known} or None for record in records
+            ], dtype=object)
+
+        df = pd.DataFrame(columns, copy=False)
+        # Contrato com o loader: colunas que contêm listas/objetos (serialização JSON)
+        df.attrs["json_columns"] = list(self.json_columns)
+        return df
+
+
+def build_flattener(name):
+    """Flattener do schema bronze registrado (src/models/schemas.BRONZE_SCHEMAS)."""
+    return CompiledFlattener.from_schema(SchemaFactory.get_table_schema(name))
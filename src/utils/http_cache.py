@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class HttpCache:
+    """
+    Cache de validadores HTTP (ETag / Last-Modified / hash do corpo) por endpoint.
+    Rigor: Cada entrada guarda a impressão digital (URL + params + contrato de carga) da
+    requisição que a gerou; se a janela de datas, a URL ou o contrato (schema bronze,
+    versão do loader) mudar, a entrada é ignorada e a carga é completa.
+
+    Backend padrão: arquivo JSON local. Subclasses sobrescrevem _load_entry/_save_entry.
+    """
+
+    def __init__(self, path='data/http_cache.json'):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(url, params=None, contract=None) -> str:
+        """
+        Identifica a requisição: mesma URL, mesmos params e mesmo contrato -> mesmo fingerprint.
+        contract: versão do contrato de carga do endpoint (main.endpoint_contract); mudar o
+        schema ou o loader força um GET completo e a recarga, mesmo com a origem inalterada.
+        """
+        request = {"url": url, "params": params or {}}
+        if contract:
+            request["contract"] = contract
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def body_hash(content: bytes) -> str:
+        """Fallback quando a API não envia validadores: hash do corpo da resposta."""
+        return hashlib.sha256(content or b"").hexdigest()
+
+    def get(self, endpoint_name, fingerprint):
+        """Retorna a entrada do endpoint se ela pertencer à mesma requisição; senão None."""
+        with self._lock:
+            entry = self._load_entry(endpoint_name)
+        if entry and entry.get("fingerprint") == fingerprint:
+            return entry
+        return None
+
+    def set(self, endpoint_name, entry: dict):
+        """Persiste a entrada; chamado somente após a carga do endpoint ter sucesso."""
+        entry = dict(entry, updated_at=datetime.utcnow().isoformat())
+        with self._lock:
+            self._save_entry(endpoint_name, entry)
+        logger.info(f"Cache HTTP atualizado para {endpoint_name}.")
+
+    # -- Backend em arquivo ---------------------------------------------------
+
+    def _read_file(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cache HTTP ilegível em {self.path}, ignorando: {e}")
+            return {}
+
+    def _load_entry(self, endpoint_name):
+        return self._read_file().get(endpoint_name)
+
+    def _save_entry(self, endpoint_name, entry):
+        data = self._read_file()
+        data[endpoint_name] = entry
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)  # Escrita atômica
@@ -0,0 +1,103 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Conexões mantidas por host (>= threads simultâneas no mesmo host: workers + páginas)
+DEFAULT_POOL_MAXSIZE = 10
+# Quantos hosts distintos mantêm pool aberto ao mesmo tempo
+DEFAULT_POOL_CONNECTIONS = 10
+
+
+def build_retry_policy() -> Retry:
+    """
+    Política única de retry para http e https.
+    Rigor: allowed_methods=None inclui POST — os POST /query da SpaceX são somente leitura.
+    """
+    return Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504], allowed_methods=None)
+
+
+def parse_pool_sizes(value) -> dict:
+    """'api.nasa.gov=2,api.spacexdata.com=8' -> {'api.nasa.gov': 2, 'api.spacexdata.com': 8}"""
+    sizes = {}
+    for item in (value or "").split(","):
+        host, _, size = item.strip().partition("=")
+        if host and size.strip().isdigit():
+            sizes[host.strip().lower()] = int(size)
+    return sizes
+
+
+class ConnectionManager:
+    """
+    Sessão HTTP única e compartilhada entre os extratores.
+    Rigor: Um pool keep-alive por host evita um handshake TCP+TLS por endpoint; os
+    quatro endpoints de api.spacexdata.com reaproveitam os mesmos sockets. O pool
+    do urllib3 é thread-safe, então a sessão pode ser usada pelos workers em paralelo.
+    """
+
+    def __init__(self, pool_maxsize=None, host_pool_sizes=None):
+        self.pool_maxsize = int(pool_maxsize or os.getenv("HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE))
+        if host_pool_sizes is None:
+            host_pool_sizes = parse_pool_sizes(os.getenv("HTTP_POOL_SIZES"))
+        self.host_pool_sizes = host_pool_sizes
+        self.retry = build_retry_policy()
+
+        self.session = requests.Session()
+        self.session.headers["Connection"] = "keep-alive"
+        self._adapters = []
+
+        default_adapter = self._new_adapter(self.pool_maxsize)
+        for scheme in ("https://", "http://"):
+            self.session.mount(scheme, default_adapter)
+        # Prefixo mais longo vence: pools dedicados por host
+        for host, size in host_pool_sizes.items():
+            adapter = self._new_adapter(size)
+            for scheme in ("https://", "http://"):
+                self.session.mount(f"{scheme}{host}/", adapter)
+
+    def _new_adapter(self, pool_maxsize) -> HTTPAdapter:
+        adapter = HTTPAdapter(
+            pool_connections=DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize,
+            max_retries=self.retry
+        )
+        self._adapters.append(adapter)
+        return adapter
+
+    def stats(self) -> dict:
+        """
+        {host: {"requests", "connections", "reused"}} a partir dos pools do urllib3.
+        reused = requisições atendidas por um socket já aberto.
+        """
+        stats = {}
+        for adapter in self._adapters:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                entry = stats.setdefault(pool.host, {"requests": 0, "connections": 0, "reused": 0})
+                entry["requests"] += pool.num_requests
+                entry["connections"] += pool.num_connections
+                entry["reused"] += max(0, pool.num_requests - pool.num_connections)
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_connection_manager() -> ConnectionManager:
+    """Gerenciador de conexões do processo (criado no primeiro uso)."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ConnectionManager()
+        return _manager
@@ -0,0 +1,143 @@
+import codecs
+import json
+import re
+from itertools import islice
+
+# Descarta o prefixo já consumido do buffer a partir deste tamanho (caracteres)
+_COMPACT_THRESHOLD = 1 << 16
+_WHITESPACE = " \t\n\r"
+# Caracteres que ainda podem continuar um número já decodificado ("0." | "1", "1e" | "5")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*\Z")
+
+
+class JsonPathNotFound(Exception):
+    """O json_path não existe no documento (ou atravessa um valor que não é objeto)."""
+
+
+class _StreamReader:
+    """
+    Buffer de texto sobre um iterável de blocos de bytes (ex.: response.iter_content).
+    Rigor: Cada valor é decodificado pelo scanner C do módulo json (raw_decode);
+    só o elemento corrente e o bloco em leitura ficam em memória.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Lê o próximo bloco; False quando o stream terminou."""
+        if self.eof:
+            return False
+        if self.pos > _COMPACT_THRESHOLD:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        for block in self._chunks:
+            text = self._decoder.decode(block)
+            if text:
+                self.buf += text
+                return True
+        self.buf += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self):
+        """Próximo caractere não branco (sem consumi-lo); None no fim do stream."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON inválido: esperado '{char}', encontrado {found!r} na posição {self.pos}.")
+        self.pos += 1
+
+    def value(self):
+        """Decodifica o próximo valor completo, lendo mais blocos se ele estiver cortado."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._json.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # Número no fim do buffer pode continuar no próximo bloco: "12" | "3", e também
+            # "0." | "1" ou "1e" | "5", em que raw_decode para antes do "." ou do expoente
+            may_continue = end == len(self.buf) or (
+                isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                and _NUMBER_TAIL.match(self.buf, end) is not None
+            )
+            if may_continue and self.fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def _descend(reader, key):
+    """Posiciona o leitor no valor de `key` do objeto corrente."""
+    if reader.peek() != "{":
+        raise JsonPathNotFound(key)
+    reader.pos += 1
+    while True:
+        char = reader.peek()
+        if char == "}":
+            raise JsonPathNotFound(key)
+        if char == ",":
+            reader.pos += 1
+            continue
+        name = reader.value()
+        reader.expect(":")
+        if name == key:
+            return
+        # Irmãos fora do caminho são decodificados e descartados
+        reader.value()
+
+
+def iter_json_array(chunks, path=None):
+    """
+    Itera os elementos do array JSON em `path` (chaves separadas por ponto; None = raiz)
+    sem materializar o documento inteiro.
+    Se o valor no caminho não for um array, ele é emitido como um único registro.
+    """
+    reader = _StreamReader(chunks)
+    for key in path.split(".") if path else []:
+        _descend(reader, key)
+
+    if reader.peek() != "[":
+        if reader.peek() is None:
+            return
+        yield reader.value()
+        return
+
+    reader.pos += 1
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        char = reader.peek()
+        if char == ",":
+            reader.pos += 1
+        elif char == "]":
+            return
+        else:
+            raise ValueError(f"JSON inválido: esperado ',' ou ']', encontrado {char!r}.")
+
+
+def batched(iterable, size):
+    """Agrupa um iterável em listas de até `size` itens."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -1,5 +1,6 @@
 import os 
 import datetime
+import threading
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -7,6 +8,9 @@ logger = get_logger(__name__)
 
 
 class AlertSystem:
+    # Rigor: endpoints podem falhar em paralelo; a escrita no audit log é serializada
+    _write_lock = threading.Lock()
+
     def __init__(self, audit_log_path='logs/pipeline_audit.log'):
         self.audit_log_path = audit_log_path
         os.makedirs(os.path.dirname(audit_log_path), exist_ok=True)
@@ -14,7 +18,8 @@ class AlertSystem:
     def notify_critical_failure(self, endpoint, error_msg, serverity='CRITICAL'):
         timestamp = datetime.datetime.now().isoformat()
         alert_msg = f"[{timestamp}] [{serverity}] Endpoint '{endpoint}': Message {error_msg}\n"
-        with open(self.audit_log_path, 'a') as f:
-            f.write(alert_msg)
+        with self._write_lock:
+            with open(self.audit_log_path, 'a') as f:
+                f.write(alert_msg)
         logger.error(alert_msg.strip())
         
\ No newline at end of file
@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Janela das cotas X-RateLimit-* (api.data.gov/NASA: cota por hora)
+DEFAULT_WINDOW_SECONDS = 3600
+# Ritmo e rajada enquanto o host ainda não informou sua cota
+DEFAULT_RATE_PER_SECOND = 10.0
+DEFAULT_BURST = 10
+# Espera máxima por um token antes de desistir da requisição
+DEFAULT_MAX_WAIT_SECONDS = 600
+# Novas tentativas após 429 Too Many Requests (respeitando Retry-After)
+DEFAULT_RETRIES_ON_429 = 3
+
+
+class RateLimitExceeded(Exception):
+    """A espera por cota ultrapassaria o limite configurado (RATE_LIMIT_MAX_WAIT)."""
+
+
+def _parse_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After em segundos ou como data HTTP; None se ausente/inválido."""
+    if value is None:
+        return None
+    seconds = _parse_int(value)
+    if seconds is not None:
+        return max(0, seconds)
+    try:
+        moment = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (moment - now).total_seconds())
+
+
+class TokenBucket:
+    """
+    Token bucket por host, calibrado pelos cabeçalhos da própria API.
+    Rigor: Antes de conhecer a cota, limita a rate_per_second com rajada burst.
+    Ao ver X-RateLimit-Limit, passa a reabastecer limit/window tokens por segundo
+    com capacidade limit; X-RateLimit-Remaining sincroniza o saldo (descontando
+    requisições em voo). Retry-After bloqueia todas as threads até o prazo.
+    Assim a extração desacelera gradualmente conforme a cota acaba, em vez de
+    disparar até receber 429.
+    """
+
+    def __init__(self, host, rate_per_second=None, burst=None, window_seconds=None,
+                 max_wait=None, clock=time.monotonic, sleep=time.sleep):
+        self.host = host
+        self.window_seconds = float(window_seconds or os.getenv("RATE_LIMIT_WINDOW_SECONDS", DEFAULT_WINDOW_SECONDS))
+        self.max_wait = float(max_wait or os.getenv("RATE_LIMIT_MAX_WAIT", DEFAULT_MAX_WAIT_SECONDS))
+        self._rate = float(rate_per_second or os.getenv("RATE_LIMIT_DEFAULT_RPS", DEFAULT_RATE_PER_SECOND))
+        self._capacity = float(burst or os.getenv("RATE_LIMIT_BURST", DEFAULT_BURST))
+        self._tokens = self._capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        # Observabilidade
+        self.acquired = 0
+        self.waited_seconds = 0.0
+        self.max_waited_seconds = 0.0
+        self.throttled = 0
+
+    def _refill(self, now):
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Reserva um token, dormindo o necessário. Retorna os segundos esperados."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            wait = max(0.0, self._blocked_until - now)
+            if self._tokens < 1:
+                wait = max(wait, (1 - self._tokens) / self._rate)
+            if wait > self.max_wait:
+                raise RateLimitExceeded(
+                    f"Cota de {self.host} esgotada: espera de {wait:.0f}s excede {self.max_wait:.0f}s."
+                )
+            self._tokens -= 1
+            self._in_flight += 1
+            self.acquired += 1
+            if wait > 0:
+                self.throttled += 1
+                self.waited_seconds += wait
+                self.max_waited_seconds = max(self.max_waited_seconds, wait)
+        if wait > 0:
+            logger.info(f"Rate limit {self.host}: aguardando {wait:.2f}s por cota.")
+            self._sleep(wait)
+        return wait
+
+    def observe(self, response=None):
+        """Atualiza a cota a partir da resposta (ou só libera o slot se ela não veio)."""
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            if response is None:
+                return
+            headers = getattr(response, "headers", None) or {}
+            now = self._clock()
+            self._refill(now)
+
+            limit = _parse_int(headers.get("X-RateLimit-Limit"))
+            if limit and limit > 0:
+                self._rate = limit / self.window_seconds
+                self._capacity = float(limit)
+            remaining = _parse_int(headers.get("X-RateLimit-Remaining"))
+            if remaining is not None:
+                self._tokens = min(self._capacity, float(remaining - self._in_flight))
+
+            retry_after = parse_retry_after(headers.get("Retry-After"))
+            if retry_after is None and getattr(response, "status_code", None) == 429:
+                retry_after = 1 / self._rate
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+                self._tokens = min(self._tokens, 0.0)
+
+    def call(self, send, retries=None):
+        """
+        Executa send() sob o limitador; em 429 espera (Retry-After) e tenta de novo.
+        Retorna a última resposta — quem chama decide (raise_for_status).
+        """
+        retries = DEFAULT_RETRIES_ON_429 if retries is None else retries
+        for attempt in range(retries + 1):
+            self.acquire()
+            response = None
+            try:
+                response = send()
+            finally:
+                self.observe(response)
+            if getattr(response, "status_code", None) != 429 or attempt == retries:
+                return response
+            logger.warning(f"429 em {self.host}; nova tentativa {attempt + 1}/{retries} após a espera.")
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.acquired,
+                "throttled": self.throttled,
+                "waited_seconds": round(self.waited_seconds, 3),
+                "max_wait_seconds": round(self.max_waited_seconds, 3),
+                "rate_per_second": round(self._rate, 4),
+            }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(url) -> TokenBucket:
+    """Limitador compartilhado (processo inteiro) do host da URL."""
+    host = urlparse(url).netloc or url
+    with _limiters_lock:
+        if host not in _limiters:
+            _limiters[host] = TokenBucket(host)
+        return _limiters[host]
+
+
+def rate_limit_stats() -> dict:
+    """{host: estatísticas} de todos os limitadores usados neste processo."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {host: limiter.stats() for host, limiter in limiters.items()}